@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Pengu ASN Lookup Module - Offline IP to ASN/prefix lookups
+Routing table dumps are imported once into sorted integer arrays; lookups are a binary search
+with no network calls, so hops, scan targets and intel results can be annotated for free
+"""
+
+import os
+import sys
+import gzip
+import json
+import struct
+import socket
+import bisect
+import ipaddress
+import threading
+from array import array
+
+MAGIC = b'PENGUASN\x01'
+FAMILY_BITS = {4: 32, 6: 128}
+
+def default_database_path():
+    """Database location inside pengu_output"""
+    try:
+        from pengu import get_output_path
+        return get_output_path("asn", "asn_db.bin")
+    except Exception:
+        return "asn_db.bin"
+
+def parse_address(address):
+    """(version, integer) for an IP literal, None for anything else (hostnames are not resolved)"""
+    try:
+        if ':' in address:
+            return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, address.split('%', 1)[0]), 'big')
+        return 4, struct.unpack('!I', socket.inet_pton(socket.AF_INET, address))[0]
+    except (OSError, TypeError, ValueError, AttributeError):
+        return None
+
+def flatten_prefixes(prefixes):
+    """Turn nested (start, end, prefixlen, asn) prefixes into non-overlapping ranges where the
+    most specific prefix wins, so a single bisect finds the longest match"""
+    flat = []
+    stack = []
+    cursor = 0
+    for prefix in sorted(prefixes, key=lambda p: (p[0], -p[1])):
+        start = prefix[0]
+        # Close the enclosing prefixes that end before this one starts
+        while stack and stack[-1][1] < start:
+            top = stack.pop()
+            if cursor <= top[1]:
+                flat.append((cursor, top[1], top[2], top[3]))
+            cursor = top[1] + 1
+        if stack and cursor < start:
+            top = stack[-1]
+            flat.append((cursor, start - 1, top[2], top[3]))
+        cursor = start
+        stack.append(prefix)
+    while stack:
+        top = stack.pop()
+        if cursor <= top[1]:
+            flat.append((cursor, top[1], top[2], top[3]))
+        cursor = top[1] + 1
+    return flat
+
+class AsnTable:
+    """Sorted, non-overlapping ranges of one address family held in parallel arrays"""
+    def __init__(self, version, ranges=()):
+        self.version = version
+        self.bits = FAMILY_BITS[version]
+        # IPv4 fits in unsigned 32-bit arrays; IPv6 values are Python ints in lists
+        self.starts = array('I') if version == 4 else []
+        self.ends = array('I') if version == 4 else []
+        self.asns = array('I')
+        self.lengths = array('B')
+        for start, end, length, asn in ranges:
+            self.starts.append(start)
+            self.ends.append(end)
+            self.lengths.append(length)
+            self.asns.append(asn)
+
+    def __len__(self):
+        return len(self.asns)
+
+    def lookup(self, value):
+        """(asn, prefix network int, prefixlen) for an address integer, or None"""
+        index = bisect.bisect_right(self.starts, value) - 1
+        if index < 0 or value > self.ends[index]:
+            return None
+        length = self.lengths[index]
+        host_bits = self.bits - length
+        return self.asns[index], (value >> host_bits) << host_bits, length
+
+    def to_bytes(self):
+        asns, lengths = array('I', self.asns), array('B', self.lengths)
+        if self.version == 4:
+            starts, ends = array('I', self.starts), array('I', self.ends)
+            columns = [starts, ends, asns]
+            if sys.byteorder == 'big':
+                for column in columns:
+                    column.byteswap()  # Files are always little-endian
+            body = b''.join(column.tobytes() for column in columns)
+        else:
+            if sys.byteorder == 'big':
+                asns.byteswap()
+            body = (b''.join(value.to_bytes(16, 'big') for value in self.starts) +
+                    b''.join(value.to_bytes(16, 'big') for value in self.ends) + asns.tobytes())
+        return struct.pack('<I', len(self)) + body + lengths.tobytes()
+
+    @classmethod
+    def from_bytes(cls, version, data, offset):
+        """Returns (table, offset after the table)"""
+        table = cls(version)
+        count, = struct.unpack_from('<I', data, offset)
+        offset += 4
+        if version == 4:
+            columns = []
+            for _ in range(3):
+                column = array('I')
+                column.frombytes(data[offset:offset + count * 4])
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns.append(column)
+                offset += count * 4
+            table.starts, table.ends, table.asns = columns
+        else:
+            for column in (table.starts, table.ends):
+                column.extend(int.from_bytes(data[i:i + 16], 'big') for i in range(offset, offset + count * 16, 16))
+                offset += count * 16
+            table.asns.frombytes(data[offset:offset + count * 4])
+            if sys.byteorder == 'big':
+                table.asns.byteswap()
+            offset += count * 4
+        table.lengths.frombytes(data[offset:offset + count])
+        offset += count
+        if len(table.starts) != count or len(table.lengths) != count:
+            raise ValueError("Truncated ASN database")
+        return table, offset
+
+class AsnDatabase:
+    """Offline prefix to ASN/organisation table for IPv4 and IPv6"""
+    def __init__(self, tables=None, orgs=None, source=None, built_at=None):
+        self.tables = tables or {4: AsnTable(4), 6: AsnTable(6)}
+        self.orgs = orgs or {}  # asn -> organisation name
+        self.source = source
+        self.built_at = built_at
+
+    def __len__(self):
+        return sum(len(table) for table in self.tables.values())
+
+    @classmethod
+    def build(cls, prefixes, orgs=None, source=None):
+        """prefixes maps (version, network int, prefixlen) to an origin ASN"""
+        import time
+
+        by_family = {4: [], 6: []}
+        for (version, network, length), asn in prefixes.items():
+            end = network | ((1 << (FAMILY_BITS[version] - length)) - 1)
+            by_family[version].append((network, end, length, asn))
+        tables = {version: AsnTable(version, flatten_prefixes(ranges)) for version, ranges in by_family.items()}
+        return cls(tables, orgs, source, time.time())
+
+    def lookup(self, address):
+        """{'asn', 'prefix', 'org'} for an IP literal, or None when it is not covered"""
+        parsed = parse_address(address)
+        if parsed is None:
+            return None
+        version, value = parsed
+        match = self.tables[version].lookup(value)
+        if match is None:
+            return None
+        asn, network, length = match
+        network = ipaddress.IPv4Address(network) if version == 4 else ipaddress.IPv6Address(network)
+        return {'asn': asn, 'prefix': f"{network}/{length}", 'org': self.orgs.get(asn)}
+
+    def save(self, path=None):
+        """Write the database (atomically) as a compact binary file"""
+        path = path or default_database_path()
+        meta = json.dumps({'source': self.source, 'built_at': self.built_at,
+                           'orgs': {str(asn): name for asn, name in self.orgs.items()}}).encode('utf-8')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(MAGIC)
+            f.write(self.tables[4].to_bytes())
+            f.write(self.tables[6].to_bytes())
+            f.write(struct.pack('<I', len(meta)))
+            f.write(meta)
+        os.replace(temporary, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or default_database_path()
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a Pengu ASN database")
+        offset = len(MAGIC)
+        table4, offset = AsnTable.from_bytes(4, data, offset)
+        table6, offset = AsnTable.from_bytes(6, data, offset)
+        size, = struct.unpack_from('<I', data, offset)
+        meta = json.loads(data[offset + 4:offset + 4 + size].decode('utf-8'))
+        orgs = {int(asn): name for asn, name in meta.get('orgs', {}).items()}
+        return cls({4: table4, 6: table6}, orgs, meta.get('source'), meta.get('built_at'))
+
+def _parse_asn(text):
+    """Origin ASN from 'AS13335', '13335', '{64512,64513}' (first AS of a set) or '13335.0'"""
+    text = text.strip().strip('{}').split(',')[0].upper()
+    if text.startswith('AS'):
+        text = text[2:]
+    if '.' in text:  # asdot notation
+        high, low = text.split('.', 1)
+        return int(high) * 65536 + int(low)
+    return int(text)
+
+def _network_key(prefix):
+    network = ipaddress.ip_network(prefix.strip(), strict=False)
+    return network.version, int(network.network_address), network.prefixlen
+
+def parse_dump_line(line):
+    """One line of a supported dump. Returns ([(network key, asn)], org or None), or None to skip.
+
+    Supported formats:
+      bgpdump -m / -M output  TABLE_DUMP2|time|B|peer|peer_as|prefix|as_path|...
+      iptoasn.com ranges      start<TAB>end<TAB>asn<TAB>country<TAB>description
+      prefix lists            prefix,asn[,org]  (also tab/space separated, e.g. pyasn ipasn files)
+    """
+    line = line.strip()
+    if not line or line[0] in '#;':
+        return None
+    if '|' in line:
+        fields = line.split('|')
+        if len(fields) < 7 or fields[2] not in ('B', 'A') or not fields[6].strip():
+            return None  # Withdrawals and state changes carry no origin
+        return [(_network_key(fields[5]), _parse_asn(fields[6].split()[-1]))], None
+
+    fields = line.split('\t')
+    if len(fields) >= 3 and '/' not in fields[0] and parse_address(fields[0].strip()) and parse_address(fields[1].strip()):
+        asn = int(fields[2])
+        if asn == 0:
+            return None  # iptoasn marks unrouted space with AS0
+        first, last = ipaddress.ip_address(fields[0].strip()), ipaddress.ip_address(fields[1].strip())
+        keys = [(_network_key(str(network)), asn) for network in ipaddress.summarize_address_range(first, last)]
+        org = fields[4].strip() if len(fields) > 4 and fields[4].strip() not in ('', 'Not routed', 'None') else None
+        return keys, org
+
+    fields = line.split(',') if ',' in line else line.split(None, 2)
+    if len(fields) < 2 or '/' not in fields[0]:
+        return None
+    org = fields[2].strip().strip('"') if len(fields) > 2 else None
+    return [(_network_key(fields[0]), _parse_asn(fields[1]))], org or None
+
+def open_dump(path):
+    """Text handle for a dump file, gzip-compressed or not"""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == b'\x1f\x8b'
+    if compressed:
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+def import_dumps(paths, on_progress=None):
+    """Build an AsnDatabase from dump files. Returns (database, stats)"""
+    prefixes = {}
+    orgs = {}
+    stats = {'lines': 0, 'skipped': 0, 'prefixes': 0}
+    for path in paths:
+        with open_dump(path) as f:
+            for line in f:
+                stats['lines'] += 1
+                try:
+                    parsed = parse_dump_line(line)
+                except ValueError:
+                    parsed = None
+                if parsed is None:
+                    stats['skipped'] += 1
+                    continue
+                keys, org = parsed
+                for key, asn in keys:
+                    # A RIB lists each prefix once per peer - the first origin seen is kept
+                    prefixes.setdefault(key, asn)
+                    if org and asn not in orgs:
+                        orgs[asn] = org
+                if on_progress and stats['lines'] % 100000 == 0:
+                    on_progress(stats['lines'], len(prefixes))
+    stats['prefixes'] = len(prefixes)
+    source = ', '.join(os.path.basename(path) for path in paths)
+    return AsnDatabase.build(prefixes, orgs, source), stats
+
+# Global database instance
+asn_database = None
+asn_database_loaded = False
+asn_database_lock = threading.Lock()
+
+def get_asn_database():
+    """Get the imported ASN database, or None when nothing has been imported yet"""
+    global asn_database, asn_database_loaded
+    with asn_database_lock:
+        if not asn_database_loaded:
+            asn_database_loaded = True
+            try:
+                asn_database = AsnDatabase.load()
+            except (OSError, ValueError, struct.error):
+                asn_database = None
+        return asn_database
+
+def set_asn_database(database):
+    """Replace the global database (after an import)"""
+    global asn_database, asn_database_loaded
+    with asn_database_lock:
+        asn_database = database
+        asn_database_loaded = True
+
+def lookup_asn(address):
+    """Offline lookup with the global database, None when there is no match or no database"""
+    database = get_asn_database()
+    return database.lookup(address) if database and address else None
+
+def describe_address(address):
+    """Short 'AS13335 CLOUDFLARENET' label for an address, or None"""
+    info = lookup_asn(address)
+    if not info:
+        return None
+    return f"AS{info['asn']} {info['org']}" if info['org'] else f"AS{info['asn']}"
+
+def main():
+    """Interactive import and lookup"""
+    import time
+    from colorama import init, Fore
+
+    # Initialize colorama
+    init(autoreset=True)
+
+    while True:
+        database = get_asn_database()
+        if database:
+            built = time.strftime('%Y-%m-%d %H:%M', time.localtime(database.built_at)) if database.built_at else "unknown"
+            status = (f"{Fore.GREEN}{len(database.tables[4])} IPv4 / {len(database.tables[6])} IPv6 ranges, "
+                      f"{len(database.orgs)} organisations (from {database.source}, built {built})")
+        else:
+            status = f"{Fore.YELLOW}No database imported"
+        print(f"""
+{Fore.CYAN}Offline ASN Database: {status}
+
+{Fore.GREEN}1. {Fore.WHITE}Import routing/prefix dump (bgpdump -m text, iptoasn TSV, prefix,asn CSV; .gz ok)
+{Fore.GREEN}2. {Fore.WHITE}Look up addresses
+{Fore.GREEN}3. {Fore.WHITE}Back
+""")
+        choice = input(f"{Fore.YELLOW}Select option (1-3): ").strip()
+
+        if choice == '1':
+            paths = [path.strip().strip('"') for path in input(f"{Fore.YELLOW}Dump file(s), comma-separated: ").split(',') if path.strip()]
+            missing = [path for path in paths if not os.path.isfile(path)]
+            if not paths or missing:
+                print(f"{Fore.RED}File not found: {', '.join(missing) or '(none given)'}")
+                continue
+            start_time = time.time()
+            try:
+                database, stats = import_dumps(paths, lambda lines, prefixes: print(
+                    f"\r{Fore.CYAN}{lines:,} lines, {prefixes:,} prefixes...", end="", flush=True))
+                path = database.save()
+            except (OSError, ValueError) as e:
+                print(f"\n{Fore.RED}Import failed: {e}")
+                continue
+            set_asn_database(database)
+            print(f"\r{Fore.GREEN}✓ Imported {stats['prefixes']:,} prefixes from {stats['lines']:,} lines "
+                  f"({stats['skipped']:,} skipped) in {time.time() - start_time:.1f}s")
+            print(f"{Fore.GREEN}✓ Saved to: {path}")
+
+        elif choice == '2':
+            if not database:
+                print(f"{Fore.RED}Import a dump first")
+                continue
+            for address in input(f"{Fore.YELLOW}IP address(es), comma-separated: ").split(','):
+                address = address.strip()
+                if not address:
+                    continue
+                if parse_address(address) is None:
+                    print(f"{Fore.RED}{address}: not an IP address")
+                    continue
+                info = database.lookup(address)
+                if info:
+                    print(f"{Fore.CYAN}{address:<40}{Fore.WHITE}AS{info['asn']:<10} {info['prefix']:<20} {info['org'] or ''}")
+                else:
+                    print(f"{Fore.YELLOW}{address:<40}not announced in the imported table")
+
+        elif choice == '3':
+            break
+        else:
+            print(f"{Fore.RED}Invalid option. Please select 1-3.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Pengu Async Proxy Checker - High-concurrency proxy validation on a single event loop
+Speaks HTTP (forward and CONNECT), SOCKS4/4a and SOCKS5 natively instead of building
+a requests session per proxy
+"""
+
+import os
+import json
+import base64
+import time
+import socket
+import struct
+import asyncio
+from urllib.parse import urlsplit
+from colorama import init, Fore, Style
+
+from proxy_checker import classify_anonymity, DEFAULT_JUDGE_URL
+
+# Initialize colorama
+init(autoreset=True)
+
+DEFAULT_TEST_URL = DEFAULT_JUDGE_URL
+
+# Maximum response body accepted from the judge
+MAX_BODY_SIZE = 64 * 1024
+
+class ProxyHandshakeError(Exception):
+    """Raised when a proxy rejects or garbles a protocol handshake"""
+    pass
+
+SOCKS5_ERRORS = {
+    1: 'General SOCKS server failure',
+    2: 'Connection not allowed by ruleset',
+    3: 'Network unreachable',
+    4: 'Host unreachable',
+    5: 'Connection refused',
+    6: 'TTL expired',
+    7: 'Command not supported',
+    8: 'Address type not supported'
+}
+
+def raise_fd_limit(wanted):
+    """Raise the soft open-file limit so thousands of sockets can be open at once"""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        target = wanted if hard == resource.RLIM_INFINITY else min(wanted, hard)
+        if soft < target:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            return target
+        return soft
+    except (ImportError, ValueError, OSError):
+        return None
+
+def normalize_proxy_type(proxy_type):
+    """Map proxy scheme aliases onto the handshakes we implement"""
+    proxy_type = (proxy_type or 'http').lower()
+    if proxy_type in ('socks5', 'socks5h'):
+        return 'socks5'
+    if proxy_type in ('socks4', 'socks4a'):
+        return 'socks4'
+    return proxy_type
+
+async def socks5_handshake(reader, writer, host, port, username=None, password=None):
+    """Perform the SOCKS5 greeting, optional user/pass auth and CONNECT"""
+    methods = b'\x00\x02' if username else b'\x00'
+    writer.write(b'\x05' + bytes([len(methods)]) + methods)
+    await writer.drain()
+
+    version, method = await reader.readexactly(2)
+    if version != 5:
+        raise ProxyHandshakeError('Not a SOCKS5 proxy')
+    if method == 0x02:
+        if not username:
+            raise ProxyHandshakeError('SOCKS5 proxy requires authentication')
+        user = username.encode('utf-8')
+        pwd = (password or '').encode('utf-8')
+        writer.write(b'\x01' + bytes([len(user)]) + user + bytes([len(pwd)]) + pwd)
+        await writer.drain()
+        _, status = await reader.readexactly(2)
+        if status != 0:
+            raise ProxyHandshakeError('SOCKS5 authentication failed')
+    elif method != 0x00:
+        raise ProxyHandshakeError('No acceptable SOCKS5 auth method')
+
+    host_bytes = host.encode('idna')
+    writer.write(b'\x05\x01\x00\x03' + bytes([len(host_bytes)]) + host_bytes + struct.pack('>H', port))
+    await writer.drain()
+
+    version, reply, _, address_type = await reader.readexactly(4)
+    if version != 5:
+        raise ProxyHandshakeError('Invalid SOCKS5 reply')
+    if reply != 0:
+        raise ProxyHandshakeError(SOCKS5_ERRORS.get(reply, f'SOCKS5 error {reply}'))
+
+    # Drain the bound address
+    if address_type == 1:
+        await reader.readexactly(4 + 2)
+    elif address_type == 4:
+        await reader.readexactly(16 + 2)
+    elif address_type == 3:
+        length = (await reader.readexactly(1))[0]
+        await reader.readexactly(length + 2)
+    else:
+        raise ProxyHandshakeError('Invalid SOCKS5 address type')
+
+async def socks4_handshake(reader, writer, host, port, username=None):
+    """Perform a SOCKS4a CONNECT (the proxy resolves the hostname)"""
+    user = (username or '').encode('utf-8')
+    try:
+        address = socket.inet_aton(host)
+        suffix = b''
+    except OSError:
+        address = b'\x00\x00\x00\x01'
+        suffix = host.encode('idna') + b'\x00'
+
+    writer.write(b'\x04\x01' + struct.pack('>H', port) + address + user + b'\x00' + suffix)
+    await writer.drain()
+
+    reply = await reader.readexactly(8)
+    if reply[1] != 0x5A:
+        raise ProxyHandshakeError(f'SOCKS4 request rejected (code {reply[1]})')
+
+async def http_connect_handshake(reader, writer, host, port, username=None, password=None):
+    """Open a tunnel through an HTTP proxy with the CONNECT method"""
+    request = f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+    if username:
+        request += f"Proxy-Authorization: Basic {basic_auth(username, password)}\r\n"
+    writer.write((request + "\r\n").encode('latin-1'))
+    await writer.drain()
+
+    status, _ = await read_response_head(reader)
+    if status != 200:
+        raise ProxyHandshakeError(f'CONNECT rejected: HTTP {status}')
+
+def basic_auth(username, password):
+    """Encode Basic credentials"""
+    return base64.b64encode(f"{username}:{password or ''}".encode('utf-8')).decode('ascii')
+
+async def read_response_head(reader):
+    """Read an HTTP status line and headers, returns (status, headers)"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split(' ', 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise ProxyHandshakeError('Invalid HTTP response')
+
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return int(parts[1]), headers
+
+async def read_response_body(reader, headers):
+    """Read a response body honouring Content-Length and chunked encoding"""
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = b''
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                await reader.readuntil(b'\r\n')
+                return body
+            chunk = await reader.readexactly(size + 2)
+            body += chunk[:-2]
+            if len(body) > MAX_BODY_SIZE:
+                raise ProxyHandshakeError('Response too large')
+
+    if 'content-length' in headers:
+        length = int(headers['content-length'])
+        if length > MAX_BODY_SIZE:
+            raise ProxyHandshakeError('Response too large')
+        return await reader.readexactly(length)
+
+    # No length given - the body ends when the server closes the connection
+    body = b''
+    while len(body) < MAX_BODY_SIZE:
+        chunk = await reader.read(MAX_BODY_SIZE - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return body
+
+class AsyncProxyChecker:
+    """Checks proxies concurrently on one asyncio event loop"""
+    def __init__(self, test_url=DEFAULT_TEST_URL, timeout=10, concurrency=500, real_ip=None):
+        self.test_url = test_url
+        self.real_ip = real_ip
+        self.timeout = timeout
+        self.concurrency = concurrency
+
+        parsed = urlsplit(test_url)
+        self.target_scheme = parsed.scheme or 'http'
+        self.target_host = parsed.hostname
+        self.target_port = parsed.port or (443 if self.target_scheme == 'https' else 80)
+        self.target_path = parsed.path or '/'
+        if parsed.query:
+            self.target_path += '?' + parsed.query
+        host_header = self.target_host if parsed.port is None else f"{self.target_host}:{parsed.port}"
+
+        # Requests are built once and reused for every proxy
+        self.origin_request = (f"GET {self.target_path} HTTP/1.1\r\nHost: {host_header}\r\n"
+                               f"Accept: application/json\r\nConnection: close\r\n\r\n").encode('latin-1')
+        self.absolute_request_head = (f"GET {self.test_url} HTTP/1.1\r\nHost: {host_header}\r\n"
+                                      f"Accept: application/json\r\nConnection: close\r\n")
+
+    async def _open_stream(self, proxy_info):
+        """Connect to the proxy and return a stream ready for the judge request"""
+        proxy_type = normalize_proxy_type(proxy_info['type'])
+        reader, writer = await asyncio.open_connection(proxy_info['ip'], proxy_info['port'])
+
+        try:
+            username = proxy_info.get('username')
+            password = proxy_info.get('password')
+
+            if proxy_type == 'socks5':
+                await socks5_handshake(reader, writer, self.target_host, self.target_port, username, password)
+            elif proxy_type == 'socks4':
+                await socks4_handshake(reader, writer, self.target_host, self.target_port, username)
+            elif proxy_type == 'https' or self.target_scheme == 'https':
+                await http_connect_handshake(reader, writer, self.target_host, self.target_port, username, password)
+            else:
+                # Plain HTTP forward proxy - send the absolute-form request directly
+                head = self.absolute_request_head
+                if username:
+                    head += f"Proxy-Authorization: Basic {basic_auth(username, password)}\r\n"
+                return reader, writer, (head + "\r\n").encode('latin-1')
+
+            if self.target_scheme == 'https':
+                await self._start_tls(reader, writer)
+            return reader, writer, self.origin_request
+        except Exception:
+            writer.close()
+            raise
+
+    async def _start_tls(self, reader, writer):
+        """Upgrade an established tunnel to TLS for https judges"""
+        import ssl
+        if not hasattr(writer, 'start_tls'):
+            raise ProxyHandshakeError('HTTPS judge URLs require Python 3.11+')
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        await writer.start_tls(context, server_hostname=self.target_host)
+
+    async def _fetch(self, proxy_info):
+        """Run the judge request through the proxy, returns (status, body)"""
+        reader, writer, request = await self._open_stream(proxy_info)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status, headers = await read_response_head(reader)
+            body = await read_response_body(reader, headers)
+            return status, body
+        finally:
+            writer.close()
+
+    async def check_proxy(self, proxy_info):
+        """Test a single proxy, returns the same result dict as ProxyChecker.test_proxy"""
+        start_time = time.perf_counter()
+        try:
+            status, body = await asyncio.wait_for(self._fetch(proxy_info), self.timeout)
+        except asyncio.TimeoutError:
+            return self._failed(proxy_info, 'Connection timeout')
+        except ProxyHandshakeError as e:
+            return self._failed(proxy_info, f'Proxy error: {e}')
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return self._failed(proxy_info, 'Proxy error')
+        except Exception as e:
+            return self._failed(proxy_info, str(e) or e.__class__.__name__)
+
+        connection_time = (time.perf_counter() - start_time) * 1000
+
+        if status != 200:
+            return self._failed(proxy_info, f"HTTP {status}")
+
+        try:
+            response_data = json.loads(body.decode('utf-8', errors='replace'))
+            proxy_ip = response_data.get('origin', '')
+            anonymity, anonymity_color = classify_anonymity(proxy_info, response_data, self.real_ip)
+        except Exception:
+            proxy_ip = 'N/A'
+            anonymity = "Unknown"
+            anonymity_color = Fore.WHITE
+
+        print(f"{Fore.GREEN}[✓] {proxy_info['ip']}:{proxy_info['port']} ({proxy_info['type'].upper()}) - "
+              f"{connection_time:.0f}ms - {anonymity_color}{anonymity}")
+
+        return {
+            'proxy': proxy_info,
+            'status': 'working',
+            'connection_time': connection_time,
+            'anonymity': anonymity,
+            'anonymity_color': anonymity_color,
+            'response_ip': proxy_ip
+        }
+
+    def _failed(self, proxy_info, error):
+        return {
+            'proxy': proxy_info,
+            'status': 'failed',
+            'error': error,
+            'connection_time': None,
+            'anonymity': None
+        }
+
+    async def run(self, proxies, on_result=None):
+        """Check every proxy from an iterable with bounded concurrency"""
+        results = []
+        proxy_iter = iter(proxies)
+
+        async def worker():
+            for proxy_info in proxy_iter:
+                result = await self.check_proxy(proxy_info)
+                if on_result:
+                    on_result(result)
+                else:
+                    results.append(result)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, self.concurrency))]
+        await asyncio.gather(*workers)
+        return results
+
+    def check_all(self, proxies, on_result=None):
+        """Synchronous entry point - runs the event loop until all proxies are checked"""
+        raise_fd_limit(self.concurrency + 256)
+        return asyncio.run(self.run(proxies, on_result))
+
+async def probe_reachable(proxy_info, timeout=2.0):
+    """Cheap liveness probe: TCP connect, plus a greeting for SOCKS5 proxies.
+    Returns None when the endpoint looks alive, otherwise an error string."""
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(proxy_info['ip'], proxy_info['port']), timeout)
+
+        if normalize_proxy_type(proxy_info['type']) == 'socks5':
+            writer.write(b'\x05\x02\x00\x02')
+            await writer.drain()
+            reply = await asyncio.wait_for(reader.readexactly(2), timeout)
+            if reply[0] != 5:
+                return 'Unreachable (not a SOCKS5 proxy)'
+        return None
+    except asyncio.TimeoutError:
+        return 'Unreachable (connect timeout)'
+    except ConnectionRefusedError:
+        return 'Unreachable (connection refused)'
+    except (OSError, asyncio.IncompleteReadError) as e:
+        return f'Unreachable ({e.__class__.__name__})'
+    finally:
+        if writer:
+            writer.close()
+
+def prefilter_proxies(proxies, timeout=2.0, concurrency=2000, on_dead=None):
+    """Stage 1 of validation: massively concurrent short-timeout reachability check.
+    Returns (alive, dead_count); each failed result dict goes to on_dead instead of being kept."""
+    alive = []
+    dead = 0
+
+    async def run():
+        proxy_iter = iter(proxies)
+
+        async def worker():
+            nonlocal dead
+            for proxy_info in proxy_iter:
+                error = await probe_reachable(proxy_info, timeout)
+                if error is None:
+                    alive.append(proxy_info)
+                    continue
+                dead += 1
+                if on_dead:
+                    on_dead({
+                        'proxy': proxy_info,
+                        'status': 'failed',
+                        'error': error,
+                        'connection_time': None,
+                        'anonymity': None
+                    })
+
+        await asyncio.gather(*[worker() for _ in range(max(1, concurrency))])
+
+    raise_fd_limit(concurrency + 256)
+    asyncio.run(run())
+    return alive, dead
+
+def main():
+    """Standalone async check of a proxy file"""
+    from proxy_checker import ProxyChecker
+
+    checker = ProxyChecker()
+    checker.print_banner()
+
+    file_path = input(f"{Fore.YELLOW}Enter proxy file path (default: proxies.txt): ").strip() or "proxies.txt"
+    if not os.path.exists(file_path):
+        print(f"{Fore.RED}File '{file_path}' not found.")
+        return
+
+    proxies = checker.parse_proxy_file(file_path)
+    if not proxies:
+        print(f"{Fore.RED}No valid proxies found in file.")
+        return
+
+    try:
+        concurrency = int(input(f"{Fore.CYAN}Enter max concurrent checks (default: 500): ").strip() or 500)
+    except ValueError:
+        concurrency = 500
+
+    checker.check_proxies_async(proxies, concurrency)
+    checker.show_summary()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Pengu DNS Stub Server - In-process authoritative DNS stand-in for offline testing
+Serves a synthetic zone with configurable latency, packet loss and wildcard behaviour
+"""
+
+import heapq
+import random
+import socket
+import threading
+import time
+import zlib
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+class SyntheticZone:
+    """Synthetic authoritative zone answering A queries for a fixed set of names"""
+    def __init__(self, origin, names=None, wildcard=False, ttl=60):
+        self.origin = dns.name.from_text(origin)
+        self.wildcard = wildcard
+        self.ttl = ttl
+        self.names = set()
+        for name in names or []:
+            self.add_name(name)
+
+    @classmethod
+    def from_wordlist(cls, origin, wordlist, hit_ratio=0.05, wildcard=False, ttl=60, seed=None):
+        """Build a zone where a random fraction of the wordlist exists as subdomains"""
+        rng = random.Random(seed)
+        names = [word for word in wordlist if rng.random() < hit_ratio]
+        return cls(origin, names, wildcard=wildcard, ttl=ttl)
+
+    def add_name(self, label):
+        """Add a name (relative to the origin or fully qualified) to the zone"""
+        name = dns.name.from_text(label, origin=self.origin)
+        self.names.add(name.to_text().lower())
+
+    def address_for(self, qname):
+        """Deterministic 10.0.0.0/8 address for a name so results are reproducible"""
+        value = zlib.crc32(qname.lower().encode('utf-8')) & 0xFFFFFF
+        return f"10.{(value >> 16) & 0xFF}.{(value >> 8) & 0xFF}.{(value & 0xFF) or 1}"
+
+    def lookup(self, qname):
+        """Return (rcode, addresses) for a query name"""
+        name = dns.name.from_text(qname) if isinstance(qname, str) else qname
+        if not name.is_subdomain(self.origin):
+            return dns.rcode.REFUSED, []
+
+        text = name.to_text().lower()
+        if text in self.names or name == self.origin:
+            return dns.rcode.NOERROR, [self.address_for(text)]
+        if self.wildcard:
+            return dns.rcode.NOERROR, [self.address_for('*.' + self.origin.to_text())]
+        return dns.rcode.NXDOMAIN, []
+
+class DNSStubServer:
+    """UDP DNS server running on a background thread, serving a SyntheticZone"""
+    def __init__(self, zone, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0,
+                 loss_rate=0.0, seed=None):
+        self.zone = zone
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss_rate = loss_rate
+        self.random = random.Random(seed)
+
+        self.sock = None
+        self.running = False
+        self.threads = []
+
+        # Pending delayed replies: (send_at, sequence, payload, address)
+        self.pending = []
+        self.pending_lock = threading.Condition()
+        self.sequence = 0
+
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            'queries': 0,
+            'answered': 0,
+            'nxdomain': 0,
+            'dropped': 0,
+            'malformed': 0
+        }
+
+    def start(self):
+        """Bind the socket and start the receive and send threads"""
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.host, self.port))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.running = True
+
+        self.threads = [
+            threading.Thread(target=self._receive_loop, daemon=True),
+            threading.Thread(target=self._send_loop, daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self.host, self.port
+
+    def stop(self):
+        """Stop the server and release the socket"""
+        self.running = False
+        with self.pending_lock:
+            self.pending_lock.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=2)
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def make_resolver(self, timeout=2.0, lifetime=5.0):
+        """Create a dnspython resolver pointed at this server"""
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = [self.host]
+        resolver.port = self.port
+        resolver.timeout = timeout
+        resolver.lifetime = lifetime
+        resolver.cache = None
+        return resolver
+
+    def get_stats(self):
+        """Get a snapshot of server counters"""
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def _count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def build_response(self, wire):
+        """Build the wire-format response for a query, or None if it is malformed"""
+        try:
+            query = dns.message.from_wire(wire)
+        except Exception:
+            self._count('malformed')
+            return None
+
+        response = dns.message.make_response(query)
+        response.flags |= dns.flags.AA
+
+        if not query.question:
+            response.set_rcode(dns.rcode.FORMERR)
+            return response.to_wire()
+
+        question = query.question[0]
+        rcode, addresses = self.zone.lookup(question.name)
+        response.set_rcode(rcode)
+
+        if rcode == dns.rcode.NXDOMAIN:
+            self._count('nxdomain')
+        elif rcode == dns.rcode.NOERROR and question.rdtype == dns.rdatatype.A:
+            rrset = dns.rrset.from_text_list(question.name, self.zone.ttl, dns.rdataclass.IN,
+                                             dns.rdatatype.A, addresses)
+            response.answer.append(rrset)
+
+        return response.to_wire()
+
+    def _receive_loop(self):
+        """Read queries and schedule (or drop) their responses"""
+        while self.running:
+            try:
+                wire, address = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self._count('queries')
+            if self.loss_rate and self.random.random() < self.loss_rate:
+                self._count('dropped')
+                continue
+
+            payload = self.build_response(wire)
+            if payload is None:
+                continue
+
+            delay = self.latency_ms
+            if self.jitter_ms:
+                delay = max(0.0, delay + self.random.uniform(-self.jitter_ms, self.jitter_ms))
+
+            if delay <= 0:
+                self._send(payload, address)
+                continue
+
+            with self.pending_lock:
+                self.sequence += 1
+                heapq.heappush(self.pending, (time.monotonic() + delay / 1000.0, self.sequence, payload, address))
+                self.pending_lock.notify()
+
+    def _send_loop(self):
+        """Send delayed responses when they become due"""
+        while self.running:
+            with self.pending_lock:
+                while self.running and not self.pending:
+                    self.pending_lock.wait(0.2)
+                if not self.running:
+                    break
+
+                send_at = self.pending[0][0]
+                wait = send_at - time.monotonic()
+                if wait > 0:
+                    self.pending_lock.wait(wait)
+                    continue
+                _, _, payload, address = heapq.heappop(self.pending)
+
+            self._send(payload, address)
+
+    def _send(self, payload, address):
+        try:
+            self.sock.sendto(payload, address)
+            self._count('answered')
+        except OSError:
+            pass
+
+def main():
+    """Run a standalone stub server for manual testing"""
+    print(f"""
+{Fore.CYAN}╔════════════════════════════════════════════════╗
+{Fore.CYAN}║             {Fore.MAGENTA}Pengu DNS Stub Server{Fore.CYAN}              ║
+{Fore.CYAN}╚════════════════════════════════════════════════╝
+""")
+    origin = input(f"{Fore.YELLOW}Zone origin (default: bench.test): ").strip() or "bench.test"
+    names = input(f"{Fore.YELLOW}Existing labels (comma-separated, default: www,mail,api): ").strip() or "www,mail,api"
+    wildcard = input(f"{Fore.YELLOW}Enable wildcard answers? (y/N): ").strip().lower() == 'y'
+
+    try:
+        latency = float(input(f"{Fore.YELLOW}Response latency in ms (default: 0): ").strip() or 0)
+        loss = float(input(f"{Fore.YELLOW}Packet loss percentage (default: 0): ").strip() or 0) / 100.0
+        port = int(input(f"{Fore.YELLOW}UDP port (default: 5353): ").strip() or 5353)
+    except ValueError:
+        print(f"{Fore.RED}Invalid number entered")
+        return
+
+    zone = SyntheticZone(origin, [n.strip() for n in names.split(',') if n.strip()], wildcard=wildcard)
+    server = DNSStubServer(zone, port=port, latency_ms=latency, loss_rate=loss)
+
+    try:
+        host, port = server.start()
+        print(f"{Fore.GREEN}Serving {origin} on {host}:{port} - press Ctrl+C to stop")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"{Fore.RED}Could not start server: {e}")
+    finally:
+        server.stop()
+        print(f"{Fore.CYAN}Server stats: {server.get_stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ import time
 import socket
 import threading
 import subprocess
-import statistics
 from colorama import init, Fore, Style
+from latency_stats import StreamingLatencyStats
 
 # Initialize colorama
 init(autoreset=True)
@@ -23,45 +23,43 @@ if os.name == 'nt':
 stop_ping = False
 
 class PingStats:
-    """Class to track ping statistics"""
+    """Class to track ping statistics (bounded memory, O(1) per probe)"""
     def __init__(self):
         self.packets_sent = 0
         self.packets_received = 0
-        self.response_times = []
         self.timeouts = 0
+        self.latency = StreamingLatencyStats()
         
     def add_response(self, response_time):
         """Add a successful response"""
         self.packets_sent += 1
         self.packets_received += 1
-        self.response_times.append(response_time)
+        self.latency.add_sample(response_time)
         
     def add_timeout(self):
         """Add a timeout"""
         self.packets_sent += 1
         self.timeouts += 1
+        self.latency.add_loss()
         
     def get_summary(self):
         """Get statistics summary"""
-        if not self.response_times:
-            return {
-                'packets_sent': self.packets_sent,
-                'packets_received': self.packets_received,
-                'packet_loss': 100.0,
-                'avg_time': 0,
-                'min_time': 0,
-                'max_time': 0,
-                'timeouts': self.timeouts
-            }
-            
+        latency = self.latency.summary()
         return {
             'packets_sent': self.packets_sent,
             'packets_received': self.packets_received,
-            'packet_loss': ((self.packets_sent - self.packets_received) / self.packets_sent * 100) if self.packets_sent > 0 else 0,
-            'avg_time': statistics.mean(self.response_times),
-            'min_time': min(self.response_times),
-            'max_time': max(self.response_times),
-            'timeouts': self.timeouts
+            'packet_loss': ((self.packets_sent - self.packets_received) / self.packets_sent * 100) if self.packets_sent > 0 else 100.0,
+            'avg_time': latency['mean'],
+            'min_time': latency['min'],
+            'max_time': latency['max'],
+            'timeouts': self.timeouts,
+            'stdev': latency['stdev'],
+            'p50': latency['p50'],
+            'p95': latency['p95'],
+            'p99': latency['p99'],
+            'jitter': latency['jitter'],
+            'loss_bursts': latency['loss_bursts'],
+            'max_loss_burst': latency['max_loss_burst']
         }
 
 def check_for_q_key():
@@ -228,10 +226,12 @@ def show_ping_statistics(stats, hostname):
 {Fore.CYAN}  Lost:         {Fore.WHITE}{summary['timeouts']} ({summary['packet_loss']:.1f}% loss)
 
 {Fore.GREEN}Response Times:
-{Fore.CYAN}  Average:      {Fore.WHITE}{summary['avg_time']:.2f}ms
+{Fore.CYAN}  Average:      {Fore.WHITE}{summary['avg_time']:.2f}ms {Fore.CYAN}(std dev {Fore.WHITE}{summary['stdev']:.2f}ms{Fore.CYAN})
 {Fore.CYAN}  Minimum:      {Fore.WHITE}{summary['min_time']:.2f}ms
 {Fore.CYAN}  Maximum:      {Fore.WHITE}{summary['max_time']:.2f}ms
-{Fore.CYAN}  Timeouts:     {Fore.WHITE}{summary['timeouts']}
+{Fore.CYAN}  Percentiles:  {Fore.WHITE}p50 {summary['p50']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p95 {summary['p95']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p99 {summary['p99']:.2f}ms
+{Fore.CYAN}  Jitter:       {Fore.WHITE}{summary['jitter']:.2f}ms
+{Fore.CYAN}  Timeouts:     {Fore.WHITE}{summary['timeouts']} {Fore.CYAN}(longest loss burst: {Fore.WHITE}{summary['max_loss_burst']}{Fore.CYAN})
 """)
 
 def export_ping_results(stats, hostname, ping_type="ICMP"):
@@ -275,9 +275,15 @@ Packet Loss:         {summary['packet_loss']:.1f}%
 RESPONSE TIME STATISTICS
 {'-' * 30}
 Average:             {summary['avg_time']:.2f}ms
+Std Deviation:       {summary['stdev']:.2f}ms
 Minimum:             {summary['min_time']:.2f}ms
 Maximum:             {summary['max_time']:.2f}ms
+50th Percentile:     {summary['p50']:.2f}ms
+95th Percentile:     {summary['p95']:.2f}ms
+99th Percentile:     {summary['p99']:.2f}ms
+Jitter (RFC 3550):   {summary['jitter']:.2f}ms
 Timeouts:            {summary['timeouts']}
+Loss Bursts:         {summary['loss_bursts']} (longest: {summary['max_loss_burst']})
 
 Report generated by Pengu v2.1
 """
@@ -333,7 +339,9 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
   Average Time: {summary['avg_time']:.2f}ms
   Minimum Time: {summary['min_time']:.2f}ms
   Maximum Time: {summary['max_time']:.2f}ms
-  Timeouts: {summary['timeouts']}
+  p50/p95/p99: {summary['p50']:.2f}/{summary['p95']:.2f}/{summary['p99']:.2f}ms
+  Jitter: {summary['jitter']:.2f}ms
+  Timeouts: {summary['timeouts']} (longest loss burst: {summary['max_loss_burst']})
 
 """
         
@@ -441,30 +449,64 @@ def show_mass_ping_exit_options(host_stats=None):
         except:
             return 'home'
 
-def enhanced_icmp_ping(hostname):
-    """Enhanced ICMP ping with color coding, stats, and Q to quit"""
+def format_icmp_result(result, hostname):
+    """Format a native ICMP engine result like parse_ping_output_with_stats, returns (text, response_time)"""
+    if result['status'] == 'reply':
+        response_time = result['rtt_ms']
+        if response_time <= 400:
+            color, status = Fore.GREEN, "✓"
+        else:
+            color, status = Fore.YELLOW, "⚠"
+        ttl = f" TTL={result['ttl']}" if result['ttl'] is not None else ""
+        return (f"{color}{status} Reply from {hostname}: bytes={result['bytes']} seq={result['seq']} "
+                f"time={response_time:.2f}ms{ttl}"), response_time
+    elif result['status'] == 'timeout':
+        return f"{Fore.RED}✗ Request timed out (seq={result['seq']})", None
+    elif result['status'] == 'ttl_exceeded':
+        return f"{Fore.RED}✗ TTL expired (from {result['from']})", None
+    else:
+        return f"{Fore.RED}✗ {result['detail'] or 'Destination unreachable'} (from {result['from']})", None
+
+def native_icmp_ping(pinger, hostname, stats):
+    """Run the in-process ICMP engine until Q is pressed or the probe count is reached"""
     global stop_ping
-    stop_ping = False
     
-    print_ping_header(hostname)
-    
-    # Start countdown
-    countdown_timer(3)
+    def on_result(result):
+        formatted_output, response_time = format_icmp_result(result, hostname)
+        timestamp = time.strftime("%H:%M:%S")
+        print(f"[{Fore.CYAN}{timestamp}{Fore.WHITE}] {formatted_output}")
+        
+        # Update statistics
+        if response_time is not None:
+            stats.add_response(response_time)
+        else:
+            stats.add_timeout()
     
-    # Initialize statistics
-    stats = PingStats()
+    with pinger:
+        try:
+            pinger.run(on_result, should_stop=lambda: stop_ping)
+        finally:
+            stop_ping = True  # Release the key monitoring thread
+
+def subprocess_icmp_ping(hostname, stats, interval=1.0, payload_size=56, count=None, timeout=2.0):
+    """Fallback: drive the OS ping binary and parse its output"""
+    global stop_ping
     
-    # Start key monitoring thread
-    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
-    key_thread.start()
+    # Prepare ping command with the same probe options as the native engine
+    if os.name == 'nt':  # Windows
+        if interval != 1.0:
+            print(f"{Fore.YELLOW}Windows ping has no interval option - probing every 1s")
+        cmd = ['ping', '-n', str(count)] if count else ['ping', '-t']
+        cmd += ['-l', str(payload_size), '-w', str(int(timeout * 1000)), hostname]
+    else:  # Linux/Unix
+        # macOS takes -W in milliseconds, Linux in whole seconds
+        wait = str(int(timeout * 1000)) if sys.platform == 'darwin' else str(max(1, round(timeout)))
+        cmd = ['ping', '-i', str(interval), '-s', str(payload_size), '-W', wait]
+        if count:
+            cmd += ['-c', str(count)]
+        cmd.append(hostname)
     
     try:
-        # Prepare ping command
-        if os.name == 'nt':  # Windows
-            cmd = ['ping', '-t', hostname]
-        else:  # Linux/Unix
-            cmd = ['ping', hostname]
-        
         # Start ping process
         process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
                                  text=True, bufsize=1, universal_newlines=True)
@@ -493,29 +535,260 @@ def enhanced_icmp_ping(hostname):
             except Exception as e:
                 print(f"{Fore.RED}Error reading ping output: {e}")
                 break
-        
-        # Clean shutdown
-        process.terminate()
-        try:
-            process.wait(timeout=2)
-        except subprocess.TimeoutExpired:
-            process.kill()
+    finally:
+        stop_ping = True  # Release the key monitoring thread (also when ping is missing or exits)
+    
+    # Clean shutdown
+    process.terminate()
+    try:
+        process.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def enhanced_icmp_ping(hostname, interval=1.0, payload_size=56, count=None, timeout=2.0):
+    """Enhanced ICMP ping with color coding, stats, and Q to quit"""
+    global stop_ping
+    stop_ping = False
+    
+    print_ping_header(hostname)
+    
+    # Prefer the in-process engine; without ICMP socket permission fall back to the ping binary
+    pinger = None
+    try:
+        from icmp_engine import IcmpPinger
+        pinger = IcmpPinger(hostname, interval, payload_size, count, timeout)
+    except socket.gaierror:
+        print(f"{Fore.RED}Error: Could not resolve {hostname}")
+        return show_ping_exit_options()
+    except (ImportError, OSError):
+        print(f"{Fore.YELLOW}ICMP sockets not permitted - using the system ping command "
+              f"(run as admin for the native engine)")
+    
+    if pinger:
+        print(f"{Fore.CYAN}Native ICMP engine ({pinger.mode} socket) - {pinger.address}, "
+              f"{payload_size} byte payload, every {interval}s, timeout {timeout}s")
+    
+    # Start countdown
+    countdown_timer(3)
+    
+    # Initialize statistics
+    stats = PingStats()
+    
+    # Start key monitoring thread
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+    
+    try:
+        if pinger:
+            native_icmp_ping(pinger, hostname, stats)
+        else:
+            subprocess_icmp_ping(hostname, stats, interval, payload_size, count, timeout)
         
         # Show statistics
         show_ping_statistics(stats, hostname)
         
         # Exit options
-        show_ping_exit_options(stats, hostname, "ICMP")
+        return show_ping_exit_options(stats, hostname, "ICMP")
         
     except FileNotFoundError:
         print(f"{Fore.RED}Error: ping command not found on this system")
-        show_ping_exit_options()
+        return show_ping_exit_options()
+    except KeyboardInterrupt:
+        show_ping_statistics(stats, hostname)
+        return show_ping_exit_options(stats, hostname, "ICMP")
     except Exception as e:
         print(f"{Fore.RED}Error during ping: {e}")
-        show_ping_exit_options()
+        return show_ping_exit_options()
+
+def load_target_list(text):
+    """Split a comma-separated target list; '@path' entries read one target per line from a file"""
+    targets = []
+    for item in text.split(','):
+        item = item.strip()
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8', errors='ignore') as f:
+                targets.extend(line.split('#', 1)[0].strip() for line in f)
+        else:
+            targets.append(item)
+    return list(dict.fromkeys(t for t in targets if t))
+
+class MassPingTable:
+    """Fixed-size live table of per-host ping state, redrawn in place instead of scrolling"""
+    STATUS_ORDER = {'lossy': 1, 'waiting': 2, 'up': 3}  # Anything else (down, unreachable, ...) sorts first
+
+    def __init__(self, host_stats, rows=None):
+        self.host_stats = host_stats
+        self.state = {hostname: {'status': 'waiting', 'last': None} for hostname in host_stats}
+        self.lock = threading.Lock()
+        if rows is None:
+            import shutil
+            rows = shutil.get_terminal_size((100, 30)).lines - 14
+        self.rows = max(5, min(rows, len(host_stats)))
+        self.drawn_lines = 0
+
+    def update(self, hostname, response_time, status=None):
+        """Record one probe outcome for a host"""
+        with self.lock:
+            stats = self.host_stats[hostname]
+            state = self.state[hostname]
+            if response_time is not None:
+                stats.add_response(response_time)
+                state['last'] = response_time
+                state['status'] = 'up' if stats.packets_received == stats.packets_sent else 'lossy'
+            else:
+                stats.add_timeout()
+                state['last'] = None
+                state['status'] = status or ('down' if stats.packets_received == 0 else 'lossy')
+
+    def mark(self, hostname, status):
+        with self.lock:
+            self.state[hostname]['status'] = status
+
+    def _sort_key(self, hostname):
+        # Problem hosts first, then the highest loss and latency
+        stats = self.host_stats[hostname]
+        state = self.state[hostname]
+        loss = (stats.packets_sent - stats.packets_received) / stats.packets_sent if stats.packets_sent else 0
+        return (self.STATUS_ORDER.get(state['status'], 0), -loss, -(state['last'] or 0))
+
+    def render(self, footer=""):
+        """Redraw the table over its previous frame"""
+        with self.lock:
+            counts = {}
+            for state in self.state.values():
+                counts[state['status']] = counts.get(state['status'], 0) + 1
+            shown = sorted(self.host_stats, key=self._sort_key)[:self.rows]
+
+            lines = [
+                f"{Fore.GREEN}Up: {Fore.WHITE}{counts.get('up', 0)}  {Fore.YELLOW}Lossy: {Fore.WHITE}{counts.get('lossy', 0)}  "
+                f"{Fore.RED}Down: {Fore.WHITE}{len(self.state) - counts.get('up', 0) - counts.get('lossy', 0) - counts.get('waiting', 0)}  "
+                f"{Fore.CYAN}Waiting: {Fore.WHITE}{counts.get('waiting', 0)}  {Fore.CYAN}Hosts: {Fore.WHITE}{len(self.host_stats)}  "
+                f"{Fore.CYAN}{time.strftime('%H:%M:%S')}",
+                f"{Fore.CYAN}{'Host':<28} {'Status':<12} {'Sent':>6} {'Recv':>6} {'Loss':>7} {'Last':>10} {'Avg':>10} {'Min':>10} {'Max':>10}"
+            ]
+            for hostname in shown:
+                stats = self.host_stats[hostname]
+                state = self.state[hostname]
+                summary = stats.get_summary()
+                color = {'up': Fore.GREEN, 'lossy': Fore.YELLOW, 'waiting': Fore.WHITE}.get(state['status'], Fore.RED)
+                last = f"{state['last']:.2f}ms" if state['last'] is not None else "-"
+                timing = (f"{summary['avg_time']:>8.2f}ms {summary['min_time']:>8.2f}ms {summary['max_time']:>8.2f}ms"
+                          if stats.packets_received else f"{'-':>10} {'-':>10} {'-':>10}")
+                loss = f"{summary['packet_loss']:.1f}%" if stats.packets_sent else "-"
+                lines.append(f"{Fore.MAGENTA}{hostname[:28]:<28} {color}{state['status']:<12}{Fore.WHITE} "
+                             f"{stats.packets_sent:>6} {stats.packets_received:>6} {loss:>7} {last:>10} {timing}")
+            hidden = len(self.host_stats) - len(shown)
+            lines.append(f"{Fore.CYAN}... {hidden} more hosts" if hidden > 0 else "")
+            lines.extend(footer.split("\n"))
+
+        # Move back to the top of the previous frame and overwrite it line by line;
+        # explicit \r keeps the layout intact while the Q key thread has the terminal in raw mode
+        frame = f"\033[{self.drawn_lines}A" if self.drawn_lines else ""
+        frame += "".join(f"\r{line}{Style.RESET_ALL}\033[K\r\n" for line in lines)
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        self.drawn_lines = len(lines)
+
+class MonitorTable(MassPingTable):
+    """Live table that also streams every probe to a PingMonitor time series"""
+    def __init__(self, host_stats, monitor, rows=None):
+        super().__init__(host_stats, rows)
+        self.monitor = monitor
+        self.last_rollup = "waiting for the first minute to finish"
+        monitor.on_rollup = self.on_rollup
+        
+    def update(self, hostname, response_time, status=None):
+        super().update(hostname, response_time, status)
+        with self.lock:
+            self.monitor.record(hostname, response_time,
+                                'reply' if response_time is not None else (status or 'timeout'))
+    
+    def on_rollup(self, rows):
+        # Called with the table lock held, from update() or from render() via tick()
+        if not rows or rows[0][0]['period'] != 'minute':
+            return
+        sent = sum(row['sent'] for row, _ in rows)
+        received = sum(row['received'] for row, _ in rows)
+        means = [row['mean_ms'] for row, _ in rows if row['mean_ms'] is not None]
+        loss = (sent - received) / sent * 100 if sent else 0
+        avg = f"{sum(means) / len(means):.2f}ms" if means else "-"
+        self.last_rollup = f"{rows[0][0]['period_start'][11:16]} - {len(rows)} targets, {loss:.1f}% loss, avg {avg}"
+    
+    def render(self, footer=""):
+        with self.lock:
+            self.monitor.tick()
+            footer = (f"{footer}\n{Fore.CYAN}Samples: {Fore.WHITE}{self.monitor.sample_count} "
+                      f"{Fore.CYAN}| Last minute: {Fore.WHITE}{self.last_rollup}")
+        super().render(footer)
+
+def native_mass_ping(multi_pinger, table):
+    """Drive every host from one ICMP socket and one select loop"""
+    for hostname in multi_pinger.unresolved:
+        table.mark(hostname, 'unresolved')
+    
+    def on_result(hostname, result):
+        table.update(hostname, result['rtt_ms'] if result['status'] == 'reply' else None,
+                     'unreachable' if result['status'] in ('unreachable', 'ttl_exceeded') else None)
+    
+    footer = f"{Fore.YELLOW}Native ICMP engine ({multi_pinger.mode} socket) - press Q to stop"
+    with multi_pinger:
+        multi_pinger.run(on_result, should_stop=lambda: stop_ping,
+                         on_tick=lambda: table.render(footer), tick_interval=0.5)
+
+def subprocess_mass_ping(hostnames, table):
+    """Fallback: one ping process per host, read by background threads into a single queue"""
+    import queue
+    results = queue.Queue()
+    processes = {}
+    
+    def reader(hostname, process):
+        for line in process.stdout:
+            if line.strip():
+                results.put((hostname, line.strip()))
+        results.put((hostname, None))
+    
+    for hostname in hostnames:
+        if os.name == 'nt':  # Windows
+            cmd = ['ping', '-t', hostname]
+        else:  # Linux/Unix
+            cmd = ['ping', hostname]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                 text=True, bufsize=1, universal_newlines=True)
+        processes[hostname] = process
+        threading.Thread(target=reader, args=(hostname, process), daemon=True).start()
+    
+    footer = f"{Fore.YELLOW}System ping command ({len(processes)} processes) - press Q to stop"
+    running = len(processes)
+    next_render = 0
+    try:
+        while not stop_ping and running:
+            try:
+                hostname, line = results.get(timeout=0.1)
+                if line is None:
+                    running -= 1
+                    continue
+                formatted_output, response_time = parse_ping_output_with_stats(line, hostname)
+                if formatted_output:
+                    table.update(hostname, response_time)
+            except queue.Empty:
+                pass
+            
+            if time.monotonic() >= next_render:
+                table.render(footer)
+                next_render = time.monotonic() + 0.5
+        table.render(footer)
+    finally:
+        # Clean shutdown of all processes
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
 
-def enhanced_mass_ping(hostnames):
-    """Enhanced mass ping with same features as single ping"""
+def enhanced_mass_ping(hostnames, interval=1.0, payload_size=56, timeout=2.0):
+    """Enhanced mass ping with a live per-host table, Q to quit"""
     global stop_ping
     stop_ping = False
     
@@ -526,86 +799,223 @@ def enhanced_mass_ping(hostnames):
     # Clear screen and show header
     os.system('cls' if os.name == 'nt' else 'clear')
     
+    targets_text = ', '.join(hostnames[:5]) + (f" (+{len(hostnames) - 5} more)" if len(hostnames) > 5 else "")
     print(f"""
 {Fore.CYAN}╔════════════════════════════════════════════════╗
 {Fore.CYAN}║               {Fore.MAGENTA}Pengu Mass Pinger{Fore.CYAN}                ║
 {Fore.CYAN}║              {Fore.YELLOW}Press Q to stop{Fore.CYAN}                   ║
 {Fore.CYAN}╚════════════════════════════════════════════════╝
-{Fore.GREEN}Targets: {Fore.WHITE}{', '.join(hostnames)}
+{Fore.GREEN}Targets: {Fore.WHITE}{targets_text}
 {Fore.YELLOW}═══════════════════════════════════════════════════
 """)
     
+    # One socket for every host; without ICMP socket permission fall back to ping processes
+    multi_pinger = None
+    try:
+        from icmp_engine import IcmpMultiPinger
+        if len(hostnames) > 20:
+            print(f"{Fore.CYAN}Resolving {len(hostnames)} targets...")
+        multi_pinger = IcmpMultiPinger(hostnames, interval, payload_size, timeout=timeout)
+    except (ImportError, OSError):
+        print(f"{Fore.YELLOW}ICMP sockets not permitted - using the system ping command "
+              f"(run as admin for the native engine)")
+        if len(hostnames) > 64:
+            print(f"{Fore.YELLOW}Warning: {len(hostnames)} ping processes will be started")
+    
     # Start countdown
     countdown_timer(3)
     
     # Initialize statistics for each host
     host_stats = {hostname: PingStats() for hostname in hostnames}
+    table = MassPingTable(host_stats)
     
     # Start key monitoring thread
     key_thread = threading.Thread(target=check_for_q_key, daemon=True)
     key_thread.start()
     
-    # Start ping processes for each hostname
-    processes = {}
-    
     try:
-        for hostname in hostnames:
-            if os.name == 'nt':  # Windows
-                cmd = ['ping', '-t', hostname]
-            else:  # Linux/Unix
-                cmd = ['ping', hostname]
-            
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                     text=True, bufsize=1, universal_newlines=True)
-            processes[hostname] = process
-        
-        # Monitor all processes
-        while not stop_ping and processes:
-            for hostname in list(processes.keys()):
-                process = processes[hostname]
-                
-                try:
-                    line = process.stdout.readline()
-                    if line and line.strip():
-                        formatted_output, response_time = parse_ping_output_with_stats(line.strip(), hostname)
-                        if formatted_output:
-                            timestamp = time.strftime("%H:%M:%S")
-                            print(f"[{Fore.CYAN}{timestamp}{Fore.WHITE}] {Fore.MAGENTA}{hostname[:15]:<15}{Fore.WHITE} {formatted_output}")
-                            
-                            # Update statistics
-                            if response_time is not None:
-                                host_stats[hostname].add_response(response_time)
-                            else:
-                                host_stats[hostname].add_timeout()
-                    
-                    # Check if process ended
-                    if process.poll() is not None:
-                        del processes[hostname]
-                        
-                except Exception as e:
-                    print(f"{Fore.RED}Error reading from {hostname}: {e}")
-                    if hostname in processes:
-                        del processes[hostname]
-            
-            time.sleep(0.1)
-        
-        # Clean shutdown of all processes
-        for hostname, process in processes.items():
-            process.terminate()
-            try:
-                process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                process.kill()
-        
-        # Show statistics for all hosts
-        show_mass_ping_statistics(host_stats)
-        
-        # Exit options
-        return show_mass_ping_exit_options(host_stats)  # Pass statistics for export
-        
+        if multi_pinger:
+            native_mass_ping(multi_pinger, table)
+        else:
+            subprocess_mass_ping(hostnames, table)
+    except FileNotFoundError:
+        print(f"{Fore.RED}Error: ping command not found on this system")
+        host_stats = None
+    except KeyboardInterrupt:
+        pass
     except Exception as e:
         print(f"{Fore.RED}Error during mass ping: {e}")
+        host_stats = None
+    finally:
+        # The engines also return by themselves (every target unresolved, ping processes exited)
+        stop_ping = True  # Release the key monitoring thread before the exit menu reads input
+    
+    if host_stats is None:
         return show_mass_ping_exit_options()
+    
+    # Show statistics for all hosts
+    show_mass_ping_statistics(host_stats)
+    
+    # Exit options
+    return show_mass_ping_exit_options(host_stats)  # Pass statistics for export
+
+def ping_monitor_mode(hostnames, interval=1.0, timeout=2.0, fmt='csv', max_mb=10):
+    """Continuous latency monitor: live table plus rotating time-series files with rollups"""
+    global stop_ping
+    stop_ping = False
+    
+    if not hostnames:
+        print(f"{Fore.RED}No hostnames provided for monitoring")
+        return show_ping_exit_options()
+    
+    from ping_monitor import PingMonitor
+    try:
+        monitor = PingMonitor(fmt=fmt, max_bytes=int(max_mb * 1024 * 1024))
+    except (OSError, ValueError) as e:
+        print(f"{Fore.RED}Could not create monitor output: {e}")
+        return show_ping_exit_options()
+    
+    os.system('cls' if os.name == 'nt' else 'clear')
+    targets_text = ', '.join(hostnames[:5]) + (f" (+{len(hostnames) - 5} more)" if len(hostnames) > 5 else "")
+    print(f"""
+{Fore.CYAN}╔════════════════════════════════════════════════╗
+{Fore.CYAN}║               {Fore.MAGENTA}Pengu Ping Monitor{Fore.CYAN}               ║
+{Fore.CYAN}║              {Fore.YELLOW}Press Q to stop{Fore.CYAN}                   ║
+{Fore.CYAN}╚════════════════════════════════════════════════╝
+{Fore.GREEN}Targets: {Fore.WHITE}{targets_text}
+{Fore.GREEN}Output:  {Fore.WHITE}{monitor.directory} {Fore.CYAN}({fmt.upper()}, rotated every {max_mb}MB)
+{Fore.YELLOW}═══════════════════════════════════════════════════
+""")
+    
+    multi_pinger = None
+    try:
+        from icmp_engine import IcmpMultiPinger
+        multi_pinger = IcmpMultiPinger(hostnames, interval, timeout=timeout)
+    except (ImportError, OSError):
+        print(f"{Fore.YELLOW}ICMP sockets not permitted - using the system ping command "
+              f"(run as admin for the native engine)")
+    
+    host_stats = {hostname: PingStats() for hostname in hostnames}
+    table = MonitorTable(host_stats, monitor)
+    
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+    
+    try:
+        if multi_pinger:
+            native_mass_ping(multi_pinger, table)
+        else:
+            subprocess_mass_ping(hostnames, table)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"{Fore.RED}Error during monitoring: {e}")
+    finally:
+        stop_ping = True  # Release the key monitoring thread - the engine may also return by itself
+        with table.lock:
+            monitor.close()
+    
+    print(f"{Fore.GREEN}✓ {monitor.sample_count} samples recorded in: {Fore.WHITE}{monitor.directory}")
+    show_mass_ping_statistics(host_stats)
+    return show_mass_ping_exit_options(host_stats)
+
+def export_live_hosts(hosts, networks):
+    """Write the live hosts of a sweep one address per line (port scanner input via @file)"""
+    from datetime import datetime
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"live_hosts_{timestamp}.txt"
+    try:
+        from pengu import get_output_path
+        full_path = get_output_path("exports", filename)
+    except:
+        # Fallback if import fails
+        full_path = filename
+    
+    os.makedirs(os.path.dirname(full_path) or '.', exist_ok=True)
+    with open(full_path, 'w', encoding='utf-8') as f:
+        f.write(f"# Pengu ping sweep of {', '.join(networks)} - {len(hosts)} live hosts\n")
+        for host in hosts:
+            f.write(f"{host['address']}\n")
+    return full_path
+
+def host_discovery_sweep(networks, rate=500, timeout=1.5, retries=1):
+    """ICMP ping sweep over CIDR ranges, returns the live hosts"""
+    global stop_ping
+    stop_ping = False
+    
+    try:
+        from icmp_engine import IcmpSweeper
+        sweeper = IcmpSweeper(networks, rate=rate, timeout=timeout, retries=retries)
+    except ValueError as e:
+        print(f"{Fore.RED}Invalid range: {e}")
+        return []
+    except (ImportError, OSError):
+        print(f"{Fore.RED}ICMP sockets not permitted - run as admin to use the ping sweep")
+        return []
+    
+    total = len(sweeper.addresses)
+    print(f"""
+{Fore.CYAN}╔════════════════════════════════════════════════╗
+{Fore.CYAN}║             {Fore.MAGENTA}Pengu Host Discovery{Fore.CYAN}               ║
+{Fore.CYAN}║              {Fore.YELLOW}Press Q to stop{Fore.CYAN}                   ║
+{Fore.CYAN}╚════════════════════════════════════════════════╝
+{Fore.GREEN}Ranges: {Fore.WHITE}{', '.join(networks)} {Fore.CYAN}({total} addresses, {sweeper.mode} socket)
+{Fore.GREEN}Rate: {Fore.WHITE}{rate} packets/s {Fore.CYAN}| {Fore.GREEN}Timeout: {Fore.WHITE}{timeout}s {Fore.CYAN}| {Fore.GREEN}Retries: {Fore.WHITE}{retries}
+{Fore.YELLOW}═══════════════════════════════════════════════════
+""")
+    
+    print_lock = threading.Lock()
+    
+    def on_alive(host):
+        ttl = f" TTL={host['ttl']}" if host['ttl'] is not None else ""
+        with print_lock:
+            print(f"\r\033[K{Fore.GREEN}✓ {host['address']:<16}{Fore.WHITE} time={host['rtt_ms']:.2f}ms{ttl}\r")
+    
+    def on_progress(attempt, done, pending, alive):
+        label = "Sweeping" if attempt == 1 else f"Retry {attempt - 1}"
+        with print_lock:
+            print(f"\r{Fore.CYAN}{label}: {done}/{pending} probes sent, {alive} live hosts", end='', flush=True)
+    
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+    
+    started = time.perf_counter()
+    with sweeper:
+        hosts = sweeper.run(on_alive, should_stop=lambda: stop_ping, on_progress=on_progress)
+        sent = sweeper.sent
+    elapsed = time.perf_counter() - started
+    stop_ping = True  # Release the key monitoring thread
+    
+    print(f"\r\033[K\n{Fore.GREEN}Sweep complete: {Fore.WHITE}{len(hosts)}{Fore.GREEN} of {total} hosts alive "
+          f"{Fore.CYAN}({sent} probes in {elapsed:.1f}s)")
+    
+    if hosts:
+        try:
+            path = export_live_hosts(hosts, networks)
+            print(f"{Fore.GREEN}✓ Live host list saved to: {path}")
+            print(f"{Fore.CYAN}  Use it in the port scanner as @{path}")
+        except Exception as e:
+            print(f"{Fore.RED}Error exporting live hosts: {e}")
+        
+        if input(f"\n{Fore.YELLOW}Port scan the live hosts now? (y/N): ").strip().lower() == 'y':
+            try:
+                import port_scanner
+                start_port = int(input(f"{Fore.CYAN}Start port (default: 1): ").strip() or 1)
+                end_port = int(input(f"{Fore.CYAN}End port (default: 1024): ").strip() or 1024)
+                num_threads = min(int(input(f"{Fore.CYAN}Threads (default: 100): ").strip() or 100), 200)
+                targets = [host['address'] for host in hosts]
+                host_stats = port_scanner.run_port_scan(targets, start_port, end_port, num_threads)
+                summaries = [stats.get_summary() for stats in host_stats.values()]
+                port_scanner.show_multi_scan_summary(summaries)
+                with_open = [summary for summary in summaries if summary['open_ports']]
+                if with_open:
+                    port_scanner.show_report_options(with_open)
+            except ValueError:
+                print(f"{Fore.RED}Invalid number - port scan skipped")
+            except ImportError as e:
+                print(f"{Fore.RED}Port scanner not available: {e}")
+    return hosts
 
 def show_mass_ping_statistics(host_stats):
     """Display mass ping statistics"""
@@ -634,15 +1044,28 @@ def main():
 
 {Fore.GREEN}1. {Fore.WHITE}Single Host Ping
 {Fore.GREEN}2. {Fore.WHITE}Mass Ping (Multiple Hosts)
-{Fore.GREEN}3. {Fore.WHITE}Return to Main Menu
+{Fore.GREEN}3. {Fore.WHITE}Host Discovery Sweep (CIDR)
+{Fore.GREEN}4. {Fore.WHITE}Continuous Monitor (time-series logging)
+{Fore.GREEN}5. {Fore.WHITE}Return to Main Menu
 """)
             
-            choice = input(f"{Fore.YELLOW}Select option (1-3): ").strip()
+            choice = input(f"{Fore.YELLOW}Select option (1-5): ").strip()
             
             if choice == '1':
                 hostname = input(f"{Fore.YELLOW}Enter hostname/IP to ping: ").strip()
                 if hostname:
-                    result = enhanced_icmp_ping(hostname)
+                    probe_options = {}
+                    if input(f"{Fore.YELLOW}Custom probe settings (interval/size/count/timeout)? (y/N): ").strip().lower() == 'y':
+                        try:
+                            probe_options['interval'] = float(input(f"{Fore.CYAN}Interval in seconds (default: 1): ").strip() or 1)
+                            probe_options['payload_size'] = int(input(f"{Fore.CYAN}Payload size in bytes (default: 56): ").strip() or 56)
+                            count_input = input(f"{Fore.CYAN}Probe count (default: until Q): ").strip()
+                            probe_options['count'] = int(count_input) if count_input else None
+                            probe_options['timeout'] = float(input(f"{Fore.CYAN}Timeout in seconds (default: 2): ").strip() or 2)
+                        except ValueError:
+                            print(f"{Fore.YELLOW}Invalid value - using defaults")
+                            probe_options = {}
+                    result = enhanced_icmp_ping(hostname, **probe_options)
                     if result == 'home':
                         # Import and run home command
                         try:
@@ -656,9 +1079,13 @@ def main():
                     print(f"{Fore.RED}Please enter a valid hostname/IP")
                     
             elif choice == '2':
-                hostnames_input = input(f"{Fore.YELLOW}Enter hostnames/IPs (comma-separated): ").strip()
+                hostnames_input = input(f"{Fore.YELLOW}Enter hostnames/IPs (comma-separated, @file for a list): ").strip()
                 if hostnames_input:
-                    hostnames = [h.strip() for h in hostnames_input.split(',') if h.strip()]
+                    try:
+                        hostnames = load_target_list(hostnames_input)
+                    except OSError as e:
+                        print(f"{Fore.RED}Could not read target list: {e}")
+                        hostnames = []
                     if hostnames:
                         result = enhanced_mass_ping(hostnames)
                         if result == 'home':
@@ -676,9 +1103,53 @@ def main():
                     print(f"{Fore.RED}Please enter hostnames/IPs")
                     
             elif choice == '3':
+                ranges_input = input(f"{Fore.YELLOW}Enter CIDR ranges (comma-separated, up to a /16 in total): ").strip()
+                networks = [r.strip() for r in ranges_input.split(',') if r.strip()]
+                if networks:
+                    try:
+                        rate = int(input(f"{Fore.CYAN}Packets per second (default: 500): ").strip() or 500)
+                        timeout = float(input(f"{Fore.CYAN}Reply timeout in seconds (default: 1.5): ").strip() or 1.5)
+                    except ValueError:
+                        print(f"{Fore.YELLOW}Invalid value - using defaults")
+                        rate, timeout = 500, 1.5
+                    host_discovery_sweep(networks, rate, timeout)
+                else:
+                    print(f"{Fore.RED}Please enter at least one range")
+                    
+            elif choice == '4':
+                hostnames_input = input(f"{Fore.YELLOW}Enter hostnames/IPs to monitor (comma-separated, @file for a list): ").strip()
+                try:
+                    hostnames = load_target_list(hostnames_input) if hostnames_input else []
+                except OSError as e:
+                    print(f"{Fore.RED}Could not read target list: {e}")
+                    hostnames = []
+                if hostnames:
+                    try:
+                        interval = float(input(f"{Fore.CYAN}Interval in seconds (default: 1): ").strip() or 1)
+                        fmt = input(f"{Fore.CYAN}Output format csv/jsonl (default: csv): ").strip().lower() or 'csv'
+                        max_mb = float(input(f"{Fore.CYAN}Rotate files every N MB (default: 10): ").strip() or 10)
+                    except ValueError:
+                        print(f"{Fore.YELLOW}Invalid value - using defaults")
+                        interval, fmt, max_mb = 1.0, 'csv', 10
+                    if fmt not in ('csv', 'jsonl'):
+                        print(f"{Fore.YELLOW}Unknown format - using csv")
+                        fmt = 'csv'
+                    result = ping_monitor_mode(hostnames, interval, fmt=fmt, max_mb=max_mb)
+                    if result == 'home':
+                        try:
+                            import pengu
+                            pengu.return_to_home()
+                        except:
+                            break
+                    elif result == 'ping_tools':
+                        continue  # Stay in ping tools menu
+                else:
+                    print(f"{Fore.RED}Please enter hostnames/IPs")
+                    
+            elif choice == '5':
                 break
             else:
-                print(f"{Fore.RED}Invalid option. Please select 1-3.")
+                print(f"{Fore.RED}Invalid option. Please select 1-5.")
                 
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Returning to main menu...")
@@ -687,7 +1158,7 @@ def main():
             print(f"{Fore.RED}Error: {e}")
         
         # Only show "Press Enter" if staying in ping tools
-        if choice not in ['1', '2'] or choice == '3':
+        if choice not in ['1', '2', '4'] or choice == '5':
             input(f"\n{Fore.YELLOW}Press Enter to continue...")
 
 if __name__ == "__main__":
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Pengu HTTP Load Module - Load generation for HTTP(S) endpoints
+Open model (fixed request rate) or closed model (fixed concurrency) on an asyncio keep-alive
+connection pool, with latency histograms corrected for coordinated omission
+"""
+
+import os
+import ssl
+import json
+import time
+import asyncio
+from urllib.parse import urlsplit
+from colorama import init, Fore, Style
+from latency_stats import StreamingLatencyStats
+
+# Initialize colorama
+init(autoreset=True)
+
+USER_AGENT = 'Pengu-HTTP-Load/2.1'
+
+# Open model: requests waiting for a connection beyond this are dropped (the client is the bottleneck)
+MAX_BACKLOG = 10000
+
+class HttpError(Exception):
+    """Malformed or unexpected HTTP response"""
+    pass
+
+class ConnectionClosed(ConnectionResetError):
+    """The server closed the connection before sending a status line"""
+    pass
+
+class AsyncHttpPool:
+    """Minimal HTTP/1.1 client with a bounded keep-alive connection pool"""
+    def __init__(self, url, max_connections=50, timeout=10.0, verify=True, method='GET'):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.method = method
+        self.timeout = timeout
+        self.ssl_context = None
+        if parts.scheme == 'https':
+            self.ssl_context = ssl.create_default_context()
+            if not verify:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.request_bytes = (f"{method} {path} HTTP/1.1\r\n"
+                              f"Host: {parts.netloc.rsplit('@', 1)[-1]}\r\n"
+                              f"User-Agent: {USER_AGENT}\r\n"
+                              f"Accept: */*\r\n"
+                              f"Connection: keep-alive\r\n\r\n").encode('ascii')
+        self.max_connections = max_connections
+        self.slots = None
+        self.idle = []
+        self.opened = 0
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl_context,
+                                                       server_hostname=self.host if self.ssl_context else None)
+        self.opened += 1
+        return reader, writer
+
+    async def _read_response(self, reader):
+        """Read one response, returns (status, body_size, keep_alive)"""
+        try:
+            status_line = await reader.readline()
+        except ConnectionResetError:
+            status_line = b''
+        if not status_line:
+            raise ConnectionClosed('Connection closed by server')
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise HttpError('Malformed status line')
+        version, status = parts[0], int(parts[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+
+        size = 0
+        if self.method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                chunk_size = int((await reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+                if chunk_size == 0:
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass  # Trailers
+                    break
+                size += len(await reader.readexactly(chunk_size))
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            size = len(await reader.readexactly(int(headers['content-length'])))
+        else:
+            size = len(await reader.read())  # Body ends when the server closes
+            keep_alive = False
+        return status, size, keep_alive
+
+    async def request(self):
+        """One request on a pooled connection, returns (status, body_size, reused)"""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.max_connections)
+        async with self.slots:
+            reused = bool(self.idle)
+            while True:
+                reader, writer = self.idle.pop() if reused else await asyncio.wait_for(self._open(), self.timeout)
+                try:
+                    writer.write(self.request_bytes)
+                    status, size, keep_alive = await asyncio.wait_for(self._read_response(reader), self.timeout)
+                    break
+                except ConnectionClosed:
+                    writer.close()
+                    if not reused:
+                        raise
+                    reused = False  # Idle connection timed out on the server - retry once on a fresh one
+                except BaseException:
+                    writer.close()
+                    raise
+            if keep_alive:
+                self.idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, size, reused
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+def record_corrected(stats, value_ms, expected_interval_ms):
+    """Record a latency plus the samples a stalled sender would have produced (HdrHistogram style).
+    A response that took N expected intervals hid N-1 requests that would have waited too."""
+    stats.add_sample(value_ms)
+    if expected_interval_ms and expected_interval_ms > 0:
+        missing = value_ms - expected_interval_ms
+        while missing >= expected_interval_ms:
+            stats.add_sample(missing)
+            missing -= expected_interval_ms
+
+class LoadTest:
+    """HTTP load generator.
+
+    model='open'   sends `rate` requests per second on a fixed schedule whether or not earlier
+                   requests finished; latency is measured from the scheduled send time, so
+                   queueing behind slow responses is included (no coordinated omission).
+    model='closed' keeps `concurrency` requests in flight; each worker sends the next request
+                   when the previous one finished, and stalls are back-filled in the corrected
+                   histogram using the running mean latency as the expected interval.
+    """
+    def __init__(self, url, model='open', rate=50, concurrency=10, duration=10, timeout=10.0,
+                 max_connections=None, verify=True):
+        if model not in ('open', 'closed'):
+            raise ValueError(f"Unknown load model: {model}")
+        self.url = url
+        self.model = model
+        self.rate = max(0.1, rate)
+        self.concurrency = max(1, concurrency)
+        self.duration = duration
+        self.timeout = timeout
+        self.pool = AsyncHttpPool(url, max_connections or (self.concurrency if model == 'closed' else 100),
+                                  timeout, verify)
+        self.corrected = StreamingLatencyStats()   # Latency as users would see it
+        self.service = StreamingLatencyStats()     # Time on the wire only
+        self.status_codes = {}
+        self.errors = {}
+        self.sent = 0
+        self.completed = 0
+        self.dropped = 0
+        self.bytes = 0
+        self.in_flight = 0
+        self.started_at = None
+        self.elapsed = 0.0
+
+    async def _one(self, intended_start):
+        """Send one request; intended_start is when the schedule wanted it sent"""
+        self.sent += 1
+        self.in_flight += 1
+        actual_start = time.perf_counter()
+        try:
+            status, size, _ = await self.pool.request()
+            finished = time.perf_counter()
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+            self.bytes += size
+            self.completed += 1
+            self.service.add_sample((finished - actual_start) * 1000)
+            if self.model == 'open':
+                self.corrected.add_sample((finished - intended_start) * 1000)
+            else:
+                record_corrected(self.corrected, (finished - actual_start) * 1000, self.service.mean)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            name = 'Timeout' if isinstance(e, asyncio.TimeoutError) else e.__class__.__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+            self.service.add_loss()
+            self.corrected.add_loss()
+        finally:
+            self.in_flight -= 1
+
+    async def _run_open(self, deadline, should_stop):
+        interval = 1.0 / self.rate
+        start = time.perf_counter()
+        tasks = set()
+        index = 0
+        while not (should_stop and should_stop()):
+            intended = start + index * interval
+            if intended >= deadline:
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            index += 1
+            if self.in_flight >= MAX_BACKLOG:
+                self.dropped += 1
+                self.errors['Client backlog full'] = self.errors.get('Client backlog full', 0) + 1
+                continue
+            task = asyncio.ensure_future(self._one(intended))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks, timeout=self.timeout + 1)
+
+    async def _run_closed(self, deadline, should_stop):
+        async def worker():
+            while time.perf_counter() < deadline and not (should_stop and should_stop()):
+                await self._one(time.perf_counter())
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+    async def run_async(self, should_stop=None, on_progress=None):
+        self.started_at = time.perf_counter()
+        deadline = self.started_at + self.duration
+        runner = self._run_open if self.model == 'open' else self._run_closed
+        task = asyncio.ensure_future(runner(deadline, should_stop))
+        while not task.done():
+            await asyncio.wait([task], timeout=1.0)
+            self.elapsed = time.perf_counter() - self.started_at
+            if on_progress:
+                on_progress(self)
+        task.result()
+        self.pool.close()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def run(self, should_stop=None, on_progress=None):
+        """Blocking entry point; on_progress(load_test) is called about once a second"""
+        try:
+            from async_proxy_checker import raise_fd_limit
+            raise_fd_limit(max(self.pool.max_connections, self.concurrency) + 256)
+        except ImportError:
+            pass
+        asyncio.run(self.run_async(should_stop, on_progress))
+        return self.get_results()
+
+    def get_results(self):
+        """Results as a dict (times in ms)"""
+        return {
+            'url': self.url,
+            'model': self.model,
+            'target_rate': self.rate if self.model == 'open' else None,
+            'concurrency': self.concurrency if self.model == 'closed' else None,
+            'duration': self.elapsed,
+            'sent': self.sent,
+            'completed': self.completed,
+            'dropped': self.dropped,
+            'errors': dict(self.errors),
+            'status_codes': {str(code): count for code, count in sorted(self.status_codes.items())},
+            'throughput': self.completed / self.elapsed if self.elapsed else 0.0,
+            'bytes': self.bytes,
+            'connections_opened': self.pool.opened,
+            'latency': self.corrected.summary(),
+            'service_time': self.service.summary()
+        }
+
+def print_progress(load_test):
+    """One-line live progress"""
+    latency = load_test.corrected
+    errors = sum(load_test.errors.values())
+    rps = load_test.completed / load_test.elapsed if load_test.elapsed else 0
+    print(f"\r{Fore.CYAN}[{load_test.elapsed:5.1f}s] {Fore.WHITE}sent {load_test.sent} | done {load_test.completed} | "
+          f"{rps:.1f} req/s | in flight {load_test.in_flight} | p50 {latency.percentile(50):.1f}ms "
+          f"p99 {latency.percentile(99):.1f}ms | {Fore.RED if errors else Fore.WHITE}errors {errors}{Style.RESET_ALL}   ",
+          end='', flush=True)
+
+def show_load_results(results):
+    """Summary of a load test"""
+    latency = results['latency']
+    service = results['service_time']
+    mode = (f"open model, {results['target_rate']:.1f} req/s target" if results['model'] == 'open'
+            else f"closed model, {results['concurrency']} concurrent")
+    print(f"""
+
+{Fore.CYAN}╔══════════════════════════════════════════════════════╗
+{Fore.CYAN}║                {Fore.MAGENTA}HTTP Load Test Results{Fore.CYAN}                ║
+{Fore.CYAN}╚══════════════════════════════════════════════════════╝
+
+{Fore.GREEN}Test:
+{Fore.CYAN}  Target:           {Fore.WHITE}{results['url']}
+{Fore.CYAN}  Mode:             {Fore.WHITE}{mode}
+{Fore.CYAN}  Duration:         {Fore.WHITE}{results['duration']:.1f}s
+{Fore.CYAN}  Requests:         {Fore.WHITE}{results['sent']} sent, {results['completed']} completed, {results['dropped']} dropped
+{Fore.CYAN}  Throughput:       {Fore.WHITE}{results['throughput']:.1f} req/s ({results['bytes'] / 1024:.1f} KB received)
+{Fore.CYAN}  Connections:      {Fore.WHITE}{results['connections_opened']} opened
+
+{Fore.GREEN}Latency (corrected for coordinated omission):
+{Fore.CYAN}  p50 / p95 / p99:  {Fore.WHITE}{latency['p50']:.2f} / {latency['p95']:.2f} / {latency['p99']:.2f}ms
+{Fore.CYAN}  Mean / Max:       {Fore.WHITE}{latency['mean']:.2f} / {latency['max']:.2f}ms
+
+{Fore.GREEN}Service Time (request on the wire only):
+{Fore.CYAN}  p50 / p95 / p99:  {Fore.WHITE}{service['p50']:.2f} / {service['p95']:.2f} / {service['p99']:.2f}ms
+{Fore.CYAN}  Mean / Max:       {Fore.WHITE}{service['mean']:.2f} / {service['max']:.2f}ms
+
+{Fore.GREEN}Status Codes:""")
+    for code, count in results['status_codes'].items():
+        color = Fore.GREEN if code.startswith('2') else (Fore.YELLOW if code.startswith(('3', '4')) else Fore.RED)
+        print(f"{color}  {code}: {Fore.WHITE}{count}")
+    if results['errors']:
+        print(f"{Fore.GREEN}Errors:")
+        for name, count in results['errors'].items():
+            print(f"{Fore.RED}  {name}: {Fore.WHITE}{count}")
+
+def export_load_results(results):
+    """Write the results as JSON and text, returns the JSON path"""
+    from datetime import datetime
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    url_safe = results['url'].replace('://', '_').replace('/', '_').replace('.', '_').replace(':', '_')[:60]
+    base = f"http_load_{url_safe}_{timestamp}"
+    try:
+        from pengu import get_output_path
+        json_path = get_output_path("reports", base + ".json")
+    except:
+        # Fallback if import fails
+        json_path = base + ".json"
+    os.makedirs(os.path.dirname(json_path) or '.', exist_ok=True)
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(results, generated=datetime.now().isoformat()), f, indent=2)
+
+    latency = results['latency']
+    text = f"""PENGU HTTP LOAD TEST REPORT
+{'=' * 50}
+
+Target:              {results['url']}
+Test Date:           {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Model:               {results['model']}
+Duration:            {results['duration']:.1f}s
+Sent / Completed:    {results['sent']} / {results['completed']}
+Dropped:             {results['dropped']}
+Throughput:          {results['throughput']:.1f} req/s
+
+LATENCY (corrected for coordinated omission)
+{'-' * 30}
+50th Percentile:     {latency['p50']:.2f}ms
+95th Percentile:     {latency['p95']:.2f}ms
+99th Percentile:     {latency['p99']:.2f}ms
+Maximum:             {latency['max']:.2f}ms
+
+STATUS CODES
+{'-' * 15}
+"""
+    for code, count in results['status_codes'].items():
+        text += f"{code}: {count}\n"
+    for name, count in results['errors'].items():
+        text += f"{name}: {count}\n"
+    text += "\nReport generated by Pengu v2.1\n"
+    with open(json_path[:-5] + ".txt", 'w', encoding='utf-8') as f:
+        f.write(text)
+    return json_path
+
+def run_load_test_interactive(url):
+    """Prompt for load settings, run the test and offer an export"""
+    print(f"""
+{Fore.GREEN}1. {Fore.WHITE}Open model - fixed request rate (how the service handles real traffic)
+{Fore.GREEN}2. {Fore.WHITE}Closed model - fixed concurrency (maximum throughput)""")
+    try:
+        model = 'closed' if input(f"{Fore.YELLOW}Load model (default: 1): ").strip() == '2' else 'open'
+        rate = concurrency = None
+        if model == 'open':
+            rate = float(input(f"{Fore.CYAN}Requests per second (default: 50): ").strip() or 50)
+        else:
+            concurrency = int(input(f"{Fore.CYAN}Concurrent requests (default: 10): ").strip() or 10)
+        duration = float(input(f"{Fore.CYAN}Duration in seconds (default: 10): ").strip() or 10)
+    except ValueError:
+        print(f"{Fore.RED}Invalid number")
+        return None
+
+    print(f"{Fore.YELLOW}Only load test systems you own or are authorized to test. Press Ctrl+C to stop early.")
+    load_test = LoadTest(url, model, rate=rate or 50, concurrency=concurrency or 10, duration=duration)
+    try:
+        results = load_test.run(on_progress=print_progress)
+    except KeyboardInterrupt:
+        results = load_test.get_results()
+    show_load_results(results)
+
+    if input(f"\n{Fore.YELLOW}Export results (JSON + text)? (y/N): ").strip().lower() == 'y':
+        try:
+            path = export_load_results(results)
+            print(f"{Fore.GREEN}✓ Load test results exported to: {path}")
+        except Exception as e:
+            print(f"{Fore.RED}Error exporting load test results: {e}")
+    return results
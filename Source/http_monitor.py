@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pengu HTTP Monitor Module - Concurrent multi-URL HTTP monitoring
+Hundreds of URLs are checked on one event loop, each at its own interval, with a compact live dashboard
+"""
+
+import sys
+import time
+import asyncio
+import threading
+from colorama import init, Fore, Style
+from latency_stats import StreamingLatencyStats
+from http_load import AsyncHttpPool
+
+# Initialize colorama
+init(autoreset=True)
+
+def parse_url_list(text, default_interval=5.0):
+    """Parse URLs (comma-separated, '@file' for one per line as 'url [interval]').
+    Returns a list of (url, interval) with https:// added where no scheme is given."""
+    entries = []
+    for item in text.split(','):
+        item = item.strip()
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8', errors='ignore') as f:
+                entries.extend(line.split('#', 1)[0].strip() for line in f)
+        else:
+            entries.append(item)
+
+    targets = {}
+    for entry in entries:
+        if not entry:
+            continue
+        parts = entry.split()
+        url = parts[0]
+        if '://' not in url:
+            url = 'https://' + url
+        interval = float(parts[1]) if len(parts) > 1 else default_interval
+        if interval <= 0:
+            raise ValueError(f"{entry}: interval must be positive")
+        targets[url] = interval
+    return list(targets.items())
+
+class HttpMonitor:
+    """Checks many URLs concurrently, each on its own fixed schedule.
+
+    Every URL gets a small keep-alive pool, so steady-state checks measure the request itself
+    rather than connection setup. A check is timed from send to the end of the body.
+    """
+    def __init__(self, targets, timeout=10.0, verify=True):
+        self.targets = dict(targets)  # url -> interval
+        self.timeout = timeout
+        self.pools = {}
+        self.invalid = {}  # url -> error
+        for url in self.targets:
+            try:
+                self.pools[url] = AsyncHttpPool(url, max_connections=2, timeout=timeout, verify=verify)
+            except ValueError as e:
+                self.invalid[url] = str(e)
+
+    async def check(self, url):
+        """One request, returns a result dict"""
+        started = time.perf_counter()
+        try:
+            status_code, size, reused = await self.pools[url].request()
+            return {
+                'status': 'ok' if status_code < 400 else 'http_error',
+                'status_code': status_code,
+                'response_ms': (time.perf_counter() - started) * 1000,
+                'bytes': size,
+                'reused': reused,
+                'error': None if status_code < 400 else f"HTTP {status_code}"
+            }
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return {
+                'status': 'error',
+                'status_code': None,
+                'response_ms': None,
+                'bytes': 0,
+                'reused': False,
+                'error': 'Timeout' if isinstance(e, asyncio.TimeoutError) else (str(e) or e.__class__.__name__)
+            }
+
+    async def _schedule(self, loop, url, offset, on_result, stop_event):
+        """Check one URL every interval, starting at offset"""
+        interval = self.targets[url]
+        start = loop.time() + offset
+        sent = 0
+        pending = set()
+        while not stop_event.is_set():
+            due = start + sent * interval
+            delay = due - loop.time()
+            if delay < -interval:
+                start -= delay  # Fell behind - resume the schedule instead of bursting
+                delay = 0
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            sent += 1
+
+            task = asyncio.ensure_future(self.check(url))
+            task.add_done_callback(lambda t: on_result(url, dict(t.result(), timestamp=time.time()))
+                                   if not t.cancelled() else None)
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending, timeout=self.timeout + 1)
+
+    async def run_async(self, on_result, should_stop=None, on_tick=None, tick_interval=1.0):
+        loop = asyncio.get_running_loop()
+        stop_event = asyncio.Event()
+        urls = list(self.pools)
+        # Stagger the first checks over the shortest interval so they do not go out in one burst
+        spread = min(self.targets.values()) if urls else 0
+        schedules = [asyncio.ensure_future(self._schedule(loop, url, i * spread / max(1, len(urls)),
+                                                          on_result, stop_event))
+                     for i, url in enumerate(urls)]
+
+        done = asyncio.ensure_future(asyncio.gather(*schedules))
+        while not done.done():
+            if should_stop and should_stop():
+                stop_event.set()
+            if on_tick:
+                on_tick()
+            await asyncio.wait([done], timeout=tick_interval if on_tick else 0.1)
+        for pool in self.pools.values():
+            pool.close()
+        if on_tick:
+            on_tick()
+
+    def run(self, on_result, should_stop=None, on_tick=None, tick_interval=1.0):
+        """Blocking entry point. on_result(url, result) gets every check outcome;
+        should_stop() is polled to end the run, on_tick() is called every tick_interval."""
+        try:
+            from async_proxy_checker import raise_fd_limit
+            raise_fd_limit(len(self.pools) * 2 + 256)
+        except ImportError:
+            pass
+        asyncio.run(self.run_async(on_result, should_stop, on_tick, tick_interval))
+
+class UrlDashboard:
+    """Fixed-size live table of per-URL state, redrawn in place at a fixed rate"""
+    STATUS_ORDER = {'degraded': 1, 'waiting': 2, 'up': 3}  # failing/invalid sort first
+
+    def __init__(self, urls, rows=None):
+        self.state = {url: {'status': 'waiting', 'code': None, 'last': None, 'checks': 0, 'errors': 0,
+                            'last_error': None, 'latency': StreamingLatencyStats()} for url in urls}
+        self.lock = threading.Lock()
+        if rows is None:
+            import shutil
+            rows = shutil.get_terminal_size((100, 30)).lines - 8
+        self.rows = max(5, min(rows, len(self.state)))
+        self.drawn_lines = 0
+
+    def update(self, url, result):
+        """Record one check outcome"""
+        with self.lock:
+            state = self.state[url]
+            state['checks'] += 1
+            state['code'] = result['status_code']
+            state['last'] = result['response_ms']
+            if result['response_ms'] is not None:
+                state['latency'].add_sample(result['response_ms'])
+            if result['status'] == 'ok':
+                state['status'] = 'up' if not state['errors'] else 'degraded'
+            else:
+                state['errors'] += 1
+                state['last_error'] = result['error']
+                state['status'] = 'failing'
+
+    def mark(self, url, status, error=None):
+        with self.lock:
+            self.state[url]['status'] = status
+            self.state[url]['last_error'] = error
+
+    def _sort_key(self, url):
+        state = self.state[url]
+        error_rate = state['errors'] / state['checks'] if state['checks'] else 0
+        return (self.STATUS_ORDER.get(state['status'], 0), -error_rate, -(state['last'] or 0))
+
+    def render(self, footer=""):
+        """Redraw the dashboard over its previous frame"""
+        with self.lock:
+            counts = {}
+            for state in self.state.values():
+                counts[state['status']] = counts.get(state['status'], 0) + 1
+            shown = sorted(self.state, key=self._sort_key)[:self.rows]
+
+            lines = [
+                f"{Fore.GREEN}Up: {Fore.WHITE}{counts.get('up', 0)}  {Fore.YELLOW}Degraded: {Fore.WHITE}{counts.get('degraded', 0)}  "
+                f"{Fore.RED}Failing: {Fore.WHITE}{len(self.state) - counts.get('up', 0) - counts.get('degraded', 0) - counts.get('waiting', 0)}  "
+                f"{Fore.CYAN}Waiting: {Fore.WHITE}{counts.get('waiting', 0)}  {Fore.CYAN}URLs: {Fore.WHITE}{len(self.state)}  "
+                f"{Fore.CYAN}{time.strftime('%H:%M:%S')}",
+                f"{Fore.CYAN}{'URL':<40} {'Status':<9} {'Code':>5} {'Checks':>7} {'Errors':>7} {'Last':>10} "
+                f"{'p50':>10} {'p95':>10} {'p99':>10}"
+            ]
+            for url in shown:
+                state = self.state[url]
+                latency = state['latency']
+                color = {'up': Fore.GREEN, 'degraded': Fore.YELLOW, 'waiting': Fore.WHITE}.get(state['status'], Fore.RED)
+                last = f"{state['last']:.1f}ms" if state['last'] is not None else "-"
+                code = str(state['code']) if state['code'] else "-"
+                timing = (f"{latency.percentile(50):>8.1f}ms {latency.percentile(95):>8.1f}ms {latency.percentile(99):>8.1f}ms"
+                          if latency.count else f"{'-':>10} {'-':>10} {'-':>10}")
+                lines.append(f"{Fore.MAGENTA}{url[:40]:<40} {color}{state['status']:<9}{Fore.WHITE} {code:>5} "
+                             f"{state['checks']:>7} {state['errors']:>7} {last:>10} {timing}")
+            hidden = len(self.state) - len(shown)
+            lines.append(f"{Fore.CYAN}... {hidden} more URLs" if hidden > 0 else "")
+            lines.extend(footer.split("\n"))
+
+        # Same in-place redraw as the mass ping table (the Q key thread keeps the terminal in raw mode)
+        frame = f"\033[{self.drawn_lines}A" if self.drawn_lines else ""
+        frame += "".join(f"\r{line}{Style.RESET_ALL}\033[K\r\n" for line in lines)
+        sys.stdout.write(frame)
+        sys.stdout.flush()
+        self.drawn_lines = len(lines)
+
+def show_url_statistics(dashboard):
+    """Final per-URL summary, problem URLs first"""
+    print(f"""
+{Fore.CYAN}╔══════════════════════════════════════════════════════╗
+{Fore.CYAN}║              {Fore.MAGENTA}Multi-URL HTTP Monitor Summary{Fore.CYAN}          ║
+{Fore.CYAN}╚══════════════════════════════════════════════════════╝
+""")
+    print(f"{Fore.CYAN}{'URL':<40} {'Checks':>7} {'Errors':>7} {'Mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}  Last error")
+    for url in sorted(dashboard.state, key=dashboard._sort_key):
+        state = dashboard.state[url]
+        summary = state['latency'].summary()
+        color = Fore.GREEN if not state['errors'] and state['checks'] else (Fore.YELLOW if summary['samples'] else Fore.RED)
+        timing = (f"{summary['mean']:>8.1f}ms {summary['p50']:>8.1f}ms {summary['p95']:>8.1f}ms {summary['p99']:>8.1f}ms"
+                  if summary['samples'] else f"{'-':>10} {'-':>10} {'-':>10} {'-':>10}")
+        print(f"{color}{url[:40]:<40}{Fore.WHITE} {state['checks']:>7} {state['errors']:>7} {timing}  "
+              f"{Fore.RED}{(state['last_error'] or '')[:40]}")
+
+def multi_url_monitor(targets, timeout=10.0, refresh=1.0):
+    """Interactive multi-URL monitor with a live dashboard; targets is a list of (url, interval)"""
+    import enhanced_ping
+    from enhanced_ping import check_for_q_key
+
+    monitor = HttpMonitor(targets, timeout)
+    dashboard = UrlDashboard([url for url, _ in targets])
+    for url, error in monitor.invalid.items():
+        dashboard.mark(url, 'invalid', error)
+
+    intervals = sorted(set(interval for _, interval in targets))
+    interval_text = f"{intervals[0]}s" if len(intervals) == 1 else f"{intervals[0]}-{intervals[-1]}s"
+    print(f"{Fore.CYAN}Monitoring {len(targets)} URLs every {interval_text} (timeout {timeout}s)")
+    print(f"{Fore.GREEN}Press 'q' to stop\n")
+
+    enhanced_ping.stop_ping = False
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+
+    footer = f"{Fore.YELLOW}Refreshed every {refresh}s - response time = request sent to body received - press Q to stop"
+    try:
+        monitor.run(dashboard.update, should_stop=lambda: enhanced_ping.stop_ping,
+                    on_tick=lambda: dashboard.render(footer), tick_interval=refresh)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        enhanced_ping.stop_ping = True  # Release the key monitoring thread
+
+    show_url_statistics(dashboard)
+    return dashboard
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Pengu HTTP Probe Module - HTTP(S) requests timed phase by phase
+Splits every request into DNS, TCP connect, TLS handshake, time to first byte and body transfer,
+over a fresh connection each time (cold) or a reused keep-alive connection (warm)
+"""
+
+import io
+import ssl
+import time
+import socket
+import http.client
+from urllib.parse import urlsplit
+from latency_stats import StreamingLatencyStats
+
+PHASES = ['dns', 'connect', 'tls', 'ttfb', 'transfer', 'total']
+
+PHASE_LABELS = {
+    'dns': 'DNS Lookup',
+    'connect': 'TCP Connect',
+    'tls': 'TLS Handshake',
+    'ttfb': 'Time To First Byte',
+    'transfer': 'Body Transfer',
+    'total': 'Total'
+}
+
+USER_AGENT = 'Pengu-HTTP-Ping/2.1'
+
+class FirstByteReader(io.RawIOBase):
+    """Raw socket reader that records when the first response byte arrives.
+    Reading through ssl means TLS-only records (e.g. session tickets) do not count."""
+    def __init__(self, sock):
+        self.sock = sock
+        self.first_byte_at = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = self.sock.recv_into(buffer)
+        if count and self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+        return count
+
+class TimedHTTPResponse(http.client.HTTPResponse):
+    """HTTPResponse reading through a FirstByteReader"""
+    def __init__(self, sock, *args, **kwargs):
+        super().__init__(sock, *args, **kwargs)
+        # Keep the plain makefile() reader open while we read: it holds the socket's only file
+        # reference, and HTTPConnection really closes the socket when a will_close reply drops it
+        self.socket_file = self.fp
+        self.reader = FirstByteReader(sock)
+        self.fp = io.BufferedReader(self.reader)
+
+    def _close_conn(self):
+        super()._close_conn()
+        self.socket_file.close()
+
+class HttpProber:
+    """Times HTTP(S) requests phase by phase with plain sockets, ssl and http.client.
+
+    keep_alive=True reuses one connection (warm: only TTFB and transfer are paid per request),
+    keep_alive=False opens a new connection for every request (cold: DNS, connect and TLS too).
+    """
+    def __init__(self, url, keep_alive=True, timeout=5.0, method='GET', verify=True):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        self.url = url
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.host_header = parts.netloc.rsplit('@', 1)[-1]
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.method = method
+        self.ssl_context = ssl.create_default_context() if verify else ssl._create_unverified_context()
+        self.connection = None
+        self.tls_version = None
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connect(self, timings):
+        """Open a new connection, timing DNS, TCP connect and TLS separately"""
+        started = time.perf_counter()
+        infos = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+        resolved = time.perf_counter()
+        timings['dns'] = (resolved - started) * 1000
+
+        family, socktype, proto, _, sockaddr = infos[0]
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(self.timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.connect(sockaddr)
+            connected = time.perf_counter()
+            timings['connect'] = (connected - resolved) * 1000
+
+            if self.https:
+                sock = self.ssl_context.wrap_socket(sock, server_hostname=self.host)  # Handshakes here
+                timings['tls'] = (time.perf_counter() - connected) * 1000
+                self.tls_version = sock.version()
+        except Exception:
+            sock.close()
+            raise
+
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        connection = connection_class(self.host, self.port, timeout=self.timeout)
+        connection.sock = sock  # http.client uses an already connected socket as is
+        connection.response_class = TimedHTTPResponse
+        self.connection = connection
+        self.remote_address = sockaddr[0]
+
+    def probe(self):
+        """Perform one request, returns a result dict with per-phase timings in ms"""
+        timings = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0, 'ttfb': None, 'transfer': None}
+        started = time.perf_counter()
+        reused = self.connection is not None and self.connection.sock is not None
+
+        try:
+            # A kept-alive connection may have been closed by the server since the last request
+            for attempt in range(2):
+                if not reused:
+                    self.close()
+                    self._connect(timings)
+                try:
+                    request_sent = time.perf_counter()
+                    self.connection.putrequest(self.method, self.path, skip_host=True, skip_accept_encoding=True)
+                    self.connection.putheader('Host', self.host_header)
+                    self.connection.putheader('User-Agent', USER_AGENT)
+                    self.connection.putheader('Accept', '*/*')
+                    self.connection.putheader('Connection', 'keep-alive' if self.keep_alive else 'close')
+                    self.connection.endheaders()
+
+                    response = self.connection.getresponse()
+                    body = response.read()
+                    finished = time.perf_counter()
+                    first_byte = response.reader.first_byte_at or finished
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused or attempt:
+                        raise
+                    reused = False  # Stale keep-alive connection - retry once on a fresh one
+                    started = time.perf_counter()  # Time only the retry, so the phases add up to the total
+
+            timings['ttfb'] = (first_byte - request_sent) * 1000
+            timings['transfer'] = (finished - first_byte) * 1000
+            timings['total'] = (finished - started) * 1000
+
+            if not self.keep_alive or response.will_close:
+                self.close()
+
+            return {
+                'status': 'ok',
+                'status_code': response.status,
+                'reason': response.reason,
+                'bytes': len(body),
+                'reused': reused,
+                'timings': timings,
+                'error': None,
+                'timestamp': time.time()
+            }
+        except (OSError, http.client.HTTPException, ssl.SSLError) as e:
+            self.close()
+            timings['total'] = (time.perf_counter() - started) * 1000
+            return {
+                'status': 'error',
+                'status_code': None,
+                'reason': None,
+                'bytes': 0,
+                'reused': reused,
+                'timings': timings,
+                'error': str(e) or e.__class__.__name__,
+                'timestamp': time.time()
+            }
+
+class PhaseStats:
+    """Streaming statistics for every request phase"""
+    def __init__(self):
+        self.phases = {phase: StreamingLatencyStats() for phase in PHASES}
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def add(self, result):
+        """Record a successful probe's phase timings"""
+        timings = result['timings']
+        if result['reused']:
+            self.reused_connections += 1
+        else:
+            self.new_connections += 1
+            for phase in ('dns', 'connect', 'tls'):
+                if phase != 'tls' or timings['tls']:  # No TLS phase for plain HTTP
+                    self.phases[phase].add_sample(timings[phase])
+        for phase in ('ttfb', 'transfer', 'total'):
+            if timings.get(phase) is not None:
+                self.phases[phase].add_sample(timings[phase])
+
+    def summary(self):
+        return {phase: stats.summary() for phase, stats in self.phases.items()}
+
+def format_phases(result):
+    """Compact one-line phase breakdown"""
+    timings = result['timings']
+    if result['reused']:
+        prefix = "reused"
+    else:
+        prefix = f"dns {timings['dns']:.1f} | connect {timings['connect']:.1f}"
+        if timings['tls']:
+            prefix += f" | tls {timings['tls']:.1f}"
+    return f"{prefix} | ttfb {timings['ttfb']:.1f} | body {timings['transfer']:.1f} ms"
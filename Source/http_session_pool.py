@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Pengu HTTP Session Pool - Shared keep-alive requests sessions keyed by proxy
+Reuses TCP/TLS connections across calls instead of building a new pool per request
+"""
+
+import time
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+
+DIRECT = 'direct'
+
+def session_key(proxies):
+    """Pool key for a requests-style proxies dict (None means a direct connection)"""
+    if not proxies:
+        return DIRECT
+    return tuple(sorted((scheme, url) for scheme, url in proxies.items() if url)) or DIRECT
+
+class SessionPool:
+    """LRU pool of requests.Session objects, one per proxy route, with idle eviction.
+    Sessions with a request in flight are never evicted, so the pool can briefly hold more than
+    max_sessions while that many routes are busy at once."""
+    def __init__(self, max_sessions=64, idle_timeout=120.0, pool_connections=10, pool_maxsize=20):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.pool_connections = pool_connections  # Hosts cached per session
+        self.pool_maxsize = pool_maxsize          # Keep-alive connections kept per host
+        self.sessions = OrderedDict()             # key -> [session, last_used, in_use], least recently used first
+        self.lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'evicted': 0}
+        self.observers = []                       # observer(proxies, latency_ms, error) after proxied requests
+
+    def _create_session(self, proxies):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize,
+                              max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if proxies:
+            session.proxies.update(proxies)
+        return session
+
+    def _evict(self, now):
+        """Close sessions idle too long, then the least recently used beyond max_sessions;
+        sessions another thread is using are skipped (lock held)"""
+        excess = len(self.sessions) - self.max_sessions
+        keys = []
+        for key, (_, last_used, in_use) in self.sessions.items():
+            if in_use:
+                continue
+            if excess <= 0 and now - last_used < self.idle_timeout:
+                break  # The rest were used more recently
+            keys.append(key)
+            excess -= 1
+        self.stats['evicted'] += len(keys)
+        return [self.sessions.pop(key)[0] for key in keys]
+
+    def _acquire(self, proxies, hold):
+        """Pool entry for a proxy route (or direct), created on first use; hold marks it in use"""
+        key = session_key(proxies)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.sessions.get(key)
+            if entry:
+                entry[1] = now
+                self.sessions.move_to_end(key)
+                self.stats['reused'] += 1
+            else:
+                entry = self.sessions[key] = [self._create_session(proxies), now, 0]
+                self.stats['created'] += 1
+            if hold:
+                entry[2] += 1
+            evicted = self._evict(now)
+
+        for old in evicted:
+            old.close()
+        return entry
+
+    def _release(self, entry):
+        with self.lock:
+            entry[1] = time.monotonic()
+            entry[2] -= 1
+
+    def get_session(self, proxies=None):
+        """Session for a proxy route (or direct), created on first use.
+        It is not marked in use - prefer request()/get(), which protect it from eviction."""
+        return self._acquire(proxies, False)[0]
+
+    def add_observer(self, observer):
+        """Have observer(proxies, latency_ms, error) called after every proxied request"""
+        with self.lock:
+            if observer not in self.observers:
+                self.observers.append(observer)
+
+    def request(self, method, url, proxies=None, **kwargs):
+        """requests.request equivalent that draws its session from the pool"""
+        entry = self._acquire(proxies, True)
+        started = time.perf_counter()
+        try:
+            response = entry[0].request(method, url, **kwargs)
+        except requests.RequestException as e:
+            if proxies and self.observers:
+                self._notify(proxies, None, e)
+            raise
+        finally:
+            self._release(entry)
+        if proxies and self.observers:
+            self._notify(proxies, (time.perf_counter() - started) * 1000, None)
+        return response
+
+    def _notify(self, proxies, latency_ms, error):
+        for observer in list(self.observers):
+            try:
+                observer(proxies, latency_ms, error)
+            except Exception:
+                pass  # Bookkeeping must never fail the request itself
+
+    def get(self, url, proxies=None, **kwargs):
+        """requests.get equivalent that draws its session from the pool"""
+        return self.request('GET', url, proxies=proxies, **kwargs)
+
+    def discard(self, proxies=None):
+        """Drop the session of a route (e.g. after the proxy failed) unless another thread is using it"""
+        key = session_key(proxies)
+        with self.lock:
+            entry = self.sessions.get(key)
+            if entry and entry[2]:
+                return  # Still in use - eviction closes it once idle
+            self.sessions.pop(key, None)
+        if entry:
+            entry[0].close()
+
+    def close_all(self):
+        """Close every pooled session"""
+        with self.lock:
+            sessions = [entry[0] for entry in self.sessions.values()]
+            self.sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def get_stats(self):
+        """Pool counters"""
+        with self.lock:
+            return dict(self.stats, sessions=len(self.sessions))
+
+# Global session pool instance
+session_pool = None
+session_pool_lock = threading.Lock()
+
+def get_session_pool():
+    """Get or create the global session pool"""
+    global session_pool
+    with session_pool_lock:
+        if session_pool is None:
+            session_pool = SessionPool()
+        return session_pool
+
+def get(url, proxies=None, **kwargs):
+    """GET through the global session pool"""
+    return get_session_pool().get(url, proxies=proxies, **kwargs)
+
+def request(method, url, proxies=None, **kwargs):
+    """Any HTTP method through the global session pool"""
+    return get_session_pool().request(method, url, proxies=proxies, **kwargs)
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Pengu ICMP Engine - In-process ICMP echo (ping) without the OS ping binary
+Uses unprivileged ICMP datagram sockets on Linux, raw sockets when running as admin
+"""
+
+import os
+import sys
+import time
+import struct
+import socket
+import select
+import itertools
+
+ICMP_ECHO_REPLY = 0
+ICMP_DEST_UNREACHABLE = 3
+ICMP_ECHO_REQUEST = 8
+ICMP_TIME_EXCEEDED = 11
+
+IP_RECVTTL = getattr(socket, 'IP_RECVTTL', 12)  # Linux value, missing from some Python builds
+IP_TTL = getattr(socket, 'IP_TTL', 2)
+
+UNREACHABLE_CODES = {
+    0: 'Network unreachable',
+    1: 'Host unreachable',
+    2: 'Protocol unreachable',
+    3: 'Port unreachable',
+    4: 'Fragmentation needed',
+    9: 'Network prohibited',
+    10: 'Host prohibited',
+    13: 'Communication prohibited'
+}
+
+# Raw sockets see every ICMP packet on the host, so each raw socket gets its own identifier
+_identifiers = itertools.count((os.getpid() & 0xFFFF) or 1)
+
+def icmp_checksum(data):
+    """RFC 1071 internet checksum"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def build_echo_request(ident, seq, payload):
+    """ICMP echo request packet"""
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+def make_payload(size):
+    """Deterministic payload of the requested size"""
+    pattern = bytes(range(0x20, 0x7F))
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+def resolve_ipv4(host):
+    """Resolve a hostname to an IPv4 address"""
+    return socket.gethostbyname(host)
+
+class IcmpSocket:
+    """ICMP echo socket: unprivileged SOCK_DGRAM where the OS allows it, raw otherwise"""
+    def __init__(self, ttl=None, prefer_raw=False):
+        self.sock = None
+        self.raw = False
+
+        if not prefer_raw and sys.platform.startswith('linux'):
+            try:
+                # Allowed for groups in net.ipv4.ping_group_range; the kernel owns the identifier
+                self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+                self.sock.bind(('0.0.0.0', 0))
+                self.ident = self.sock.getsockname()[1]
+                try:
+                    self.sock.setsockopt(socket.IPPROTO_IP, IP_RECVTTL, 1)
+                except OSError:
+                    pass
+            except OSError:
+                self.sock = None
+
+        if self.sock is None:
+            # Raises PermissionError when not running as admin
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self.raw = True
+            self.ident = next(_identifiers) & 0xFFFF
+
+        if ttl:
+            self.sock.setsockopt(socket.IPPROTO_IP, IP_TTL, ttl)
+        self.sock.setblocking(False)
+        try:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        except OSError:
+            pass
+
+    @property
+    def mode(self):
+        return 'raw' if self.raw else 'datagram'
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def send(self, dest_ip, seq, payload, ttl=None):
+        """Send one echo request (optionally with its own TTL), returns the monotonic send time"""
+        packet = build_echo_request(self.ident, seq & 0xFFFF, payload)
+        if ttl:
+            self.sock.setsockopt(socket.IPPROTO_IP, IP_TTL, ttl)
+        sent_at = time.perf_counter()
+        self.sock.sendto(packet, (dest_ip, 0))
+        return sent_at
+
+    def receive(self):
+        """Read one pending packet addressed to this socket.
+
+        Returns a dict with kind ('reply', 'unreachable', 'ttl_exceeded'), seq, source,
+        ttl, size and the monotonic receive time - or None for foreign/garbage packets.
+        Raises BlockingIOError when nothing is queued.
+        """
+        ttl = None
+        if self.raw:
+            data, address = self.sock.recvfrom(65535)
+            received_at = time.perf_counter()
+            ihl = (data[0] & 0x0F) * 4
+            ttl = data[8]
+            icmp = data[ihl:]
+        else:
+            data, ancillary, _, address = self.sock.recvmsg(65535, socket.CMSG_SPACE(4))
+            received_at = time.perf_counter()
+            icmp = data
+            for level, kind, value in ancillary:
+                if level == socket.IPPROTO_IP and kind == IP_TTL and len(value) >= 4:
+                    ttl = struct.unpack('i', value[:4])[0]
+
+        if len(icmp) < 8:
+            return None
+        icmp_type, code, _, ident, seq = struct.unpack('!BBHHH', icmp[:8])
+
+        if icmp_type == ICMP_ECHO_REPLY:
+            # Datagram sockets only ever see their own replies (the kernel rewrites the id)
+            if self.raw and ident != self.ident:
+                return None
+            return {'kind': 'reply', 'seq': seq, 'source': address[0], 'ttl': ttl,
+                    'size': len(icmp) - 8, 'received_at': received_at}
+
+        if icmp_type in (ICMP_DEST_UNREACHABLE, ICMP_TIME_EXCEEDED):
+            # The error quotes our original IP header + first 8 bytes of the echo request
+            quoted = icmp[8:]
+            if len(quoted) < 28:
+                return None
+            quoted_ihl = (quoted[0] & 0x0F) * 4
+            inner = quoted[quoted_ihl:quoted_ihl + 8]
+            if len(inner) < 8:
+                return None
+            inner_type, _, _, inner_ident, inner_seq = struct.unpack('!BBHHH', inner)
+            if inner_type != ICMP_ECHO_REQUEST or (self.raw and inner_ident != self.ident):
+                return None
+            return {
+                'kind': 'unreachable' if icmp_type == ICMP_DEST_UNREACHABLE else 'ttl_exceeded',
+                'seq': inner_seq,
+                'source': address[0],
+                'ttl': ttl,
+                'size': 0,
+                'code': code,
+                'received_at': received_at,
+                'destination': socket.inet_ntoa(quoted[16:20])
+            }
+        return None
+
+class IcmpPinger:
+    """Pings one target on a fixed monotonic schedule.
+
+    interval is the time between probes (sub-second is fine), payload_size the echo data
+    length, count the number of probes (None = until stopped) and timeout how long a probe
+    may stay unanswered. Probes overlap when timeout > interval.
+    """
+    def __init__(self, target, interval=1.0, payload_size=56, count=None, timeout=2.0, ttl=None):
+        self.target = target
+        self.address = resolve_ipv4(target)
+        self.interval = max(0.001, interval)
+        self.payload = make_payload(payload_size)
+        self.count = count
+        self.timeout = timeout
+        self.socket = IcmpSocket(ttl=ttl)
+
+    @property
+    def mode(self):
+        return self.socket.mode
+
+    def close(self):
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _result(self, seq, status, rtt_ms=None, ttl=None, size=0, source=None, detail=None):
+        return {
+            'seq': seq,
+            'status': status,      # 'reply', 'timeout', 'unreachable' or 'ttl_exceeded'
+            'rtt_ms': rtt_ms,
+            'ttl': ttl,
+            'bytes': size,
+            'from': source or self.address,
+            'detail': detail,
+            'timestamp': time.time()
+        }
+
+    def run(self, on_result, should_stop=None):
+        """Send probes until count is reached or should_stop() returns True.
+        on_result(result) is called for every reply, error and timeout in arrival order."""
+        outstanding = {}  # seq -> send time
+        seq = 0
+        sent = 0
+        next_send = time.perf_counter()
+
+        while True:
+            now = time.perf_counter()
+            stopping = bool(should_stop and should_stop())
+            finished_sending = stopping or (self.count is not None and sent >= self.count)
+
+            if finished_sending and not outstanding:
+                break
+
+            # Send on schedule (the schedule advances by interval, so it does not drift)
+            if not finished_sending and now >= next_send:
+                try:
+                    outstanding[seq] = self.socket.send(self.address, seq, self.payload)
+                except OSError as e:
+                    on_result(self._result(seq, 'unreachable', detail=str(e)))
+                sent += 1
+                seq = (seq + 1) & 0xFFFF
+                next_send += self.interval
+                if next_send < now:
+                    next_send = now + self.interval  # We fell behind (e.g. suspended), do not burst
+                continue
+
+            # Expire probes that waited too long
+            for probe_seq, sent_at in list(outstanding.items()):
+                if now - sent_at >= self.timeout:
+                    del outstanding[probe_seq]
+                    on_result(self._result(probe_seq, 'timeout'))
+
+            # Sleep in the socket until the next send, the next expiry or a stop check
+            deadlines = [now + 0.1]
+            if not finished_sending:
+                deadlines.append(next_send)
+            if outstanding:
+                deadlines.append(min(outstanding.values()) + self.timeout)
+            wait = max(0.0, min(deadlines) - now)
+
+            readable, _, _ = select.select([self.socket], [], [], wait)
+            if not readable:
+                continue
+
+            while True:
+                try:
+                    packet = self.socket.receive()
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+                if not packet or packet['seq'] not in outstanding:
+                    continue
+                if packet['kind'] == 'reply' and packet['source'] != self.address:
+                    continue
+
+                sent_at = outstanding.pop(packet['seq'])
+                if packet['kind'] == 'reply':
+                    rtt = (packet['received_at'] - sent_at) * 1000
+                    on_result(self._result(packet['seq'], 'reply', rtt, packet['ttl'], packet['size'], packet['source']))
+                else:
+                    detail = UNREACHABLE_CODES.get(packet.get('code'), 'Unreachable') \
+                        if packet['kind'] == 'unreachable' else 'TTL expired in transit'
+                    on_result(self._result(packet['seq'], packet['kind'], source=packet['source'], detail=detail))
+
+    def ping(self):
+        """Send probes (count defaults to 4) and return the list of results"""
+        if self.count is None:
+            self.count = 4
+        results = []
+        self.run(results.append)
+        return results
+
+class IcmpMultiPinger:
+    """Pings many targets from one socket and one loop, each host on its own schedule.
+
+    Host schedules are staggered across the interval so probes go out evenly instead of in
+    bursts. Replies are matched by (address, seq), timeouts expire from a FIFO in send order,
+    so the per-packet cost stays constant with thousands of targets.
+    """
+    def __init__(self, targets, interval=1.0, payload_size=56, count=None, timeout=2.0, ttl=None,
+                 resolve_workers=32):
+        self.interval = max(0.001, interval)
+        self.payload = make_payload(payload_size)
+        self.count = count
+        self.timeout = timeout
+        self.targets = list(dict.fromkeys(targets))
+
+        # Resolve concurrently - sequential lookups would take minutes for big target lists
+        from concurrent.futures import ThreadPoolExecutor
+
+        def try_resolve(target):
+            try:
+                return resolve_ipv4(target)
+            except (OSError, UnicodeError):
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(resolve_workers, len(self.targets)))) as executor:
+            addresses = list(executor.map(try_resolve, self.targets))
+        self.addresses = {target: address for target, address in zip(self.targets, addresses) if address}
+        self.unresolved = [target for target, address in zip(self.targets, addresses) if not address]
+
+        self.socket = IcmpSocket(ttl=ttl)
+
+    @property
+    def mode(self):
+        return self.socket.mode
+
+    def close(self):
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def run(self, on_result, should_stop=None, on_tick=None, tick_interval=0.5):
+        """Probe every resolved target until count is reached or should_stop() returns True.
+        on_result(target, result) receives replies, errors and timeouts; on_tick() is called
+        every tick_interval seconds (e.g. to redraw a live table)."""
+        import heapq
+        from collections import deque
+
+        hosts = list(self.addresses.items())
+        if not hosts:
+            return
+
+        start = time.perf_counter()
+        schedule = [(start + i * self.interval / len(hosts), i) for i in range(len(hosts))]
+        heapq.heapify(schedule)
+        sent_counts = [0] * len(hosts)
+        outstanding = {}   # (address, seq) -> (host index, send time)
+        expiry = deque()   # (deadline, key) in send order
+        seq = 0
+        next_tick = start + tick_interval
+
+        while True:
+            now = time.perf_counter()
+            stopping = bool(should_stop and should_stop())
+            if stopping:
+                schedule = []
+            if not schedule and not outstanding:
+                break
+
+            # Send every probe that is due
+            while schedule and schedule[0][0] <= now:
+                due, index = heapq.heappop(schedule)
+                target, address = hosts[index]
+                key = (address, seq)
+                try:
+                    outstanding[key] = (index, self.socket.send(address, seq, self.payload))
+                    expiry.append((now + self.timeout, key))
+                except OSError as e:
+                    on_result(target, self._result(seq, address, 'unreachable', detail=str(e)))
+                seq = (seq + 1) & 0xFFFF
+                sent_counts[index] += 1
+
+                if self.count is None or sent_counts[index] < self.count:
+                    next_due = due + self.interval
+                    heapq.heappush(schedule, (next_due if next_due > now else now + self.interval, index))
+
+            # Expire unanswered probes (FIFO because every probe shares one timeout)
+            while expiry and expiry[0][0] <= now:
+                _, key = expiry.popleft()
+                entry = outstanding.pop(key, None)
+                if entry:
+                    target, address = hosts[entry[0]]
+                    on_result(target, self._result(key[1], address, 'timeout'))
+
+            if on_tick and now >= next_tick:
+                on_tick()
+                next_tick = now + tick_interval
+
+            deadlines = [next_tick if on_tick else now + 0.1, now + 0.1]
+            if schedule:
+                deadlines.append(schedule[0][0])
+            if expiry:
+                deadlines.append(expiry[0][0])
+            wait = max(0.0, min(deadlines) - now)
+
+            readable, _, _ = select.select([self.socket], [], [], wait)
+            if not readable:
+                continue
+
+            while True:
+                try:
+                    packet = self.socket.receive()
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+                if not packet:
+                    continue
+
+                address = packet['source'] if packet['kind'] == 'reply' else packet.get('destination')
+                entry = outstanding.pop((address, packet['seq']), None)
+                if not entry:
+                    continue
+
+                target = hosts[entry[0]][0]
+                if packet['kind'] == 'reply':
+                    rtt = (packet['received_at'] - entry[1]) * 1000
+                    on_result(target, self._result(packet['seq'], packet['source'], 'reply', rtt,
+                                                   packet['ttl'], packet['size']))
+                else:
+                    detail = UNREACHABLE_CODES.get(packet.get('code'), 'Unreachable') \
+                        if packet['kind'] == 'unreachable' else 'TTL expired in transit'
+                    on_result(target, self._result(packet['seq'], packet['source'], packet['kind'], detail=detail))
+
+        if on_tick:
+            on_tick()
+
+    def _result(self, seq, source, status, rtt_ms=None, ttl=None, size=0, detail=None):
+        return {
+            'seq': seq,
+            'status': status,
+            'rtt_ms': rtt_ms,
+            'ttl': ttl,
+            'bytes': size,
+            'from': source,
+            'detail': detail,
+            'timestamp': time.time()
+        }
+
+MAX_SWEEP_HOSTS = 65536  # One /16 - every address gets its own 16-bit sequence number
+
+def expand_networks(networks, max_hosts=MAX_SWEEP_HOSTS):
+    """Expand CIDR ranges / single addresses into a deduplicated list of host addresses.
+    Raises ValueError for malformed ranges or when more than max_hosts addresses result."""
+    import ipaddress
+    addresses = []
+    seen = set()
+    for network in networks:
+        parsed = ipaddress.ip_network(network.strip(), strict=False)
+        if parsed.version != 4:
+            raise ValueError(f"{network}: only IPv4 ranges are supported")
+        if parsed.num_addresses > max_hosts:
+            raise ValueError(f"{network}: at most {max_hosts} addresses (a /16) per sweep")
+        for address in (parsed.hosts() if parsed.prefixlen < 31 else parsed):
+            address = str(address)
+            if address not in seen:
+                seen.add(address)
+                addresses.append(address)
+                if len(addresses) > max_hosts:
+                    raise ValueError(f"At most {max_hosts} addresses (a /16) per sweep")
+    return addresses
+
+class IcmpSweeper:
+    """Host discovery: one echo request per address at a fixed packet rate from a single socket.
+
+    Address n is probed with sequence number n, so a reply is matched by identifier (the socket's)
+    plus sequence without any per-probe bookkeeping. Addresses that stay silent are re-probed
+    retries times before the sweep ends timeout seconds after the last send.
+    """
+    def __init__(self, networks, rate=500, timeout=1.5, retries=1, payload_size=16):
+        self.addresses = expand_networks(networks)
+        self.rate = max(1, rate)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.payload = make_payload(payload_size)
+        self.socket = IcmpSocket()
+        self.alive = {}  # address -> {'address', 'rtt_ms', 'ttl'}
+        self.sent = 0
+
+    @property
+    def mode(self):
+        return self.socket.mode
+
+    def close(self):
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def run(self, on_alive=None, should_stop=None, on_progress=None):
+        """Sweep every address; returns the live hosts sorted by address.
+        on_alive(host) fires for each new live host; on_progress(attempt, done, pending, alive) is
+        called about 4 times a second with the position in the current pass."""
+        total = len(self.addresses)
+        send_times = [None] * total
+        gap = 1.0 / self.rate
+        next_progress = 0.0
+
+        for attempt in range(self.retries + 1):
+            pending = [i for i in range(total) if self.addresses[i] not in self.alive]
+            if not pending or (should_stop and should_stop()):
+                break
+            position = 0
+            next_send = time.perf_counter()
+            drain_until = None
+
+            while True:
+                now = time.perf_counter()
+                if should_stop and should_stop():
+                    break
+
+                # Send everything that is due at the configured rate
+                while position < len(pending) and next_send <= now:
+                    index = pending[position]
+                    position += 1
+                    if self.addresses[index] in self.alive:
+                        continue
+                    try:
+                        send_times[index] = self.socket.send(self.addresses[index], index, self.payload)
+                        self.sent += 1
+                    except OSError:
+                        pass  # e.g. EACCES for broadcast addresses
+                    next_send += gap
+                if next_send < now - 0.05:
+                    next_send = now  # Fell behind, do not burst to catch up
+
+                if position >= len(pending):
+                    if drain_until is None:
+                        drain_until = now + self.timeout
+                    elif now >= drain_until:
+                        break
+
+                if on_progress and now >= next_progress:
+                    on_progress(attempt + 1, position, len(pending), len(self.alive))
+                    next_progress = now + 0.25
+
+                wait = (drain_until if position >= len(pending) else next_send) - now
+                readable, _, _ = select.select([self.socket], [], [], max(0.0, min(wait, 0.1)))
+                if readable:
+                    self._read_replies(send_times, on_alive)
+
+        return self.get_alive()
+
+    def _read_replies(self, send_times, on_alive):
+        while True:
+            try:
+                packet = self.socket.receive()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            if not packet or packet['kind'] != 'reply':
+                continue
+
+            index = packet['seq']
+            if index >= len(self.addresses) or self.addresses[index] != packet['source']:
+                continue  # Not one of our probes (or a reply from an unexpected address)
+            if packet['source'] in self.alive or send_times[index] is None:
+                continue
+
+            host = {
+                'address': packet['source'],
+                'rtt_ms': (packet['received_at'] - send_times[index]) * 1000,
+                'ttl': packet['ttl']
+            }
+            self.alive[packet['source']] = host
+            if on_alive:
+                on_alive(host)
+
+    def get_alive(self):
+        """Live hosts found so far, sorted by address"""
+        return sorted(self.alive.values(), key=lambda h: socket.inet_aton(h['address']))
+
+def icmp_available():
+    """True when this process can open an ICMP socket (datagram or raw)"""
+    try:
+        IcmpSocket().close()
+        return True
+    except OSError:
+        return False
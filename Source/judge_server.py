@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Pengu Proxy Judge Server - Lightweight HTTP judge for proxy anonymity testing
+Echoes the client IP and every request header (httpbin-compatible JSON), and ships
+local test proxies so the checkers can be benchmarked without network access
+"""
+
+import os
+import json
+import time
+import socket
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from contextlib import redirect_stdout
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+class JudgeRequestHandler(BaseHTTPRequestHandler):
+    """Answers every request with the client address and the full header set"""
+    server_version = "PenguJudge/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes on keep-alive connections
+
+    def _respond(self):
+        body = json.dumps({
+            'origin': self.client_address[0],
+            'method': self.command,
+            'path': self.path,
+            'headers': {name: value for name, value in self.headers.items()}
+        }).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_GET = _respond
+    do_HEAD = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        """Keep the console quiet - the judge may see thousands of requests"""
+        pass
+
+class JudgeHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with a listen backlog sized for mass proxy checks"""
+    daemon_threads = True
+    request_queue_size = 1024
+
+class JudgeServer:
+    """Threaded judge HTTP server running in the background"""
+    def __init__(self, host='127.0.0.1', port=0, public_url=None):
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """Start serving and return the judge URL"""
+        self.httpd = JudgeHTTPServer((self.host, self.port), JudgeRequestHandler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop the server"""
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def url(self):
+        """URL proxies should fetch (the public URL when the judge is port-forwarded)"""
+        if self.public_url:
+            return self.public_url
+        host = self.host
+        if host in ('0.0.0.0', ''):
+            host = get_local_ip()
+        return f"http://{host}:{self.port}/ip"
+
+def get_local_ip():
+    """Best-effort primary LAN address of this machine"""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(('192.0.2.1', 80))
+            return sock.getsockname()[0]
+    except OSError:
+        return '127.0.0.1'
+
+def detect_real_ip(judge_url, timeout=5):
+    """Ask the judge directly (no proxy) which address we appear from"""
+    try:
+        from urllib.request import ProxyHandler, build_opener
+        opener = build_opener(ProxyHandler({}))
+        with opener.open(judge_url, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8')).get('origin')
+    except Exception:
+        return None
+
+class LocalTestProxy:
+    """Minimal HTTP forward/CONNECT proxy for offline checker benchmarks.
+    mode controls which forwarding headers it adds: 'elite', 'anonymous' or 'transparent'."""
+    def __init__(self, mode='elite', host='127.0.0.1'):
+        self.mode = mode
+        self.host = host
+        self.port = None
+        self.loop = None
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """Start the proxy on its own event loop thread and return the port"""
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def setup():
+            self.server = await asyncio.start_server(self._handle, self.host, 0)
+            self.port = self.server.sockets[0].getsockname()[1]
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.loop.run_until_complete(setup())
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait(5)
+        return self.port
+
+    def stop(self):
+        """Stop the proxy loop, cancelling open connections first"""
+        if not self.loop:
+            return
+
+        async def shutdown():
+            self.server.close()
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=2)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2)
+        self.loop.close()
+        self.loop = None
+
+    def _extra_headers(self, client_ip):
+        if self.mode == 'transparent':
+            return f"Via: 1.1 pengu-test-proxy\r\nX-Forwarded-For: {client_ip}\r\n"
+        if self.mode == 'anonymous':
+            return "Via: 1.1 pengu-test-proxy\r\n"
+        return ""
+
+    async def _pipe(self, reader, writer):
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            head = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1')
+            request_line, _, rest = head.partition('\r\n')
+            method, target, version = request_line.split(' ', 2)
+
+            if method == 'CONNECT':
+                host, port = target.rsplit(':', 1)
+                upstream_reader, upstream_writer = await asyncio.open_connection(host, int(port))
+                writer.write(b'HTTP/1.1 200 Connection established\r\n\r\n')
+                await writer.drain()
+            else:
+                parsed = urlsplit(target)
+                upstream_reader, upstream_writer = await asyncio.open_connection(parsed.hostname, parsed.port or 80)
+                path = parsed.path or '/'
+                if parsed.query:
+                    path += '?' + parsed.query
+                # One request per connection: later requests on a kept-alive connection would be piped
+                # through without the mode's headers, so the upstream is told to close after this one
+                headers = ''.join(line + '\r\n' for line in rest.split('\r\n')
+                                  if line and not line.lower().startswith(('connection:', 'proxy-connection:')))
+                client_ip = writer.get_extra_info('peername')[0]
+                upstream_writer.write(f"{method} {path} {version}\r\n{self._extra_headers(client_ip)}{headers}"
+                                      f"Connection: close\r\n\r\n".encode('latin-1'))
+                await upstream_writer.drain()
+
+            await asyncio.gather(self._pipe(reader, upstream_writer), self._pipe(upstream_reader, writer))
+        except (ValueError, ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+
+def run_local_benchmark(proxy_count=200, dead_count=200, concurrency=200):
+    """Benchmark both checking engines against local test proxies - no network required"""
+    from proxy_checker import ProxyChecker
+
+    modes = ['elite', 'anonymous', 'transparent']
+    judge = JudgeServer()
+    judge_url = judge.start()
+    test_proxies = [LocalTestProxy(mode) for mode in modes]
+    ports = [proxy.start() for proxy in test_proxies]
+
+    # Closed high ports on localhost refuse immediately and act as dead entries
+    proxies = []
+    for i in range(proxy_count):
+        proxies.append({'ip': '127.0.0.1', 'port': ports[i % len(ports)], 'type': 'http',
+                        'username': None, 'password': None, 'original': f"local-{modes[i % len(modes)]}"})
+    for i in range(dead_count):
+        proxies.append({'ip': '127.0.0.1', 'port': 1 + i % 1000, 'type': 'http',
+                        'username': None, 'password': None, 'original': 'local-dead'})
+
+    results = []
+    try:
+        for engine in ['threaded', 'async']:
+            checker = ProxyChecker()
+            checker.use_judge(judge_url)
+            start = time.perf_counter()
+            with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+                if engine == 'async':
+                    checker.check_proxies_async(proxies, concurrency, timeout=5)
+                else:
+                    checker.check_proxies(proxies, min(concurrency, 200))
+            duration = time.perf_counter() - start
+
+            anonymity_counts = {}
+            for result in checker.working_proxies:
+                anonymity_counts[result['anonymity']] = anonymity_counts.get(result['anonymity'], 0) + 1
+
+            results.append({
+                'engine': engine,
+                'checked': checker.tested_count,
+                'working': len(checker.working_proxies),
+                'duration': duration,
+                'rate': checker.tested_count / duration if duration > 0 else 0,
+                'anonymity': anonymity_counts
+            })
+    finally:
+        for proxy in test_proxies:
+            proxy.stop()
+        judge.stop()
+
+    print(f"\n{Fore.CYAN}{'Engine':<10} {'Checked':>8} {'Working':>8} {'Seconds':>8} {'Proxies/s':>10}  Anonymity")
+    print(f"{Fore.CYAN}{'-' * 78}")
+    for r in results:
+        print(f"{Fore.WHITE}{r['engine']:<10} {r['checked']:>8} {r['working']:>8} {r['duration']:>8.2f} "
+              f"{r['rate']:>10.1f}  {r['anonymity']}")
+    return results
+
+def main():
+    """Run the judge server standalone or the offline checker benchmark"""
+    print(f"""
+{Fore.MAGENTA}╔════════════════════════════════════════════════╗
+{Fore.MAGENTA}║            {Fore.CYAN}Pengu Proxy Judge Server{Fore.MAGENTA}            ║
+{Fore.MAGENTA}╚════════════════════════════════════════════════╝
+
+{Fore.GREEN}1. {Fore.WHITE}Run judge server
+{Fore.GREEN}2. {Fore.WHITE}Offline checker benchmark (local judge + local test proxies)
+""")
+    choice = input(f"{Fore.YELLOW}Select option (1-2): ").strip()
+
+    if choice == '2':
+        run_local_benchmark()
+        return
+
+    host = input(f"{Fore.YELLOW}Bind address (default: 0.0.0.0): ").strip() or '0.0.0.0'
+    try:
+        port = int(input(f"{Fore.YELLOW}Port (default: 8899): ").strip() or 8899)
+    except ValueError:
+        port = 8899
+
+    server = JudgeServer(host, port)
+    try:
+        url = server.start()
+        print(f"{Fore.GREEN}Judge listening on {host}:{port} - judge URL: {url}")
+        print(f"{Fore.YELLOW}Proxies must be able to reach this URL (port-forward it for internet proxies)")
+        print(f"{Fore.GREEN}Press Ctrl+C to stop")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"{Fore.RED}Could not start judge: {e}")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
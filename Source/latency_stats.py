@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Pengu Latency Statistics Module - Bounded-memory streaming latency statistics
+Every sample is an O(1) update, so a ping can run for weeks without the stats growing
+"""
+
+import math
+
+# Histogram layout: log-spaced buckets from HISTOGRAM_MIN_MS to HISTOGRAM_MAX_MS.
+# A growth factor of 1.04 keeps percentile estimates within ~2% of the true value.
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_MAX_MS = 600000.0
+HISTOGRAM_GROWTH = 1.04
+
+class StreamingLatencyStats:
+    """Streaming latency/loss statistics.
+
+    - Welford's algorithm for mean and variance
+    - exact min/max
+    - fixed-size log-bucket histogram for percentiles (p50/p95/p99)
+    - RFC 3550 interarrival jitter over consecutive samples
+    - loss bursts (runs of consecutive losses)
+    """
+    def __init__(self, min_ms=HISTOGRAM_MIN_MS, max_ms=HISTOGRAM_MAX_MS, growth=HISTOGRAM_GROWTH):
+        self.min_ms = min_ms
+        self.log_growth = math.log(growth)
+        self.bucket_count = int(math.ceil(math.log(max_ms / min_ms) / self.log_growth)) + 2
+        self.reset()
+
+    def reset(self):
+        """Forget every sample"""
+        self.count = 0            # Samples (successful probes)
+        self.lost = 0             # Lost probes
+        self.mean = 0.0
+        self.m2 = 0.0             # Sum of squared differences from the mean (Welford)
+        self.min = None
+        self.max = None
+        self.jitter = 0.0
+        self.last = None
+        self.histogram = [0] * self.bucket_count
+        self.current_loss_burst = 0
+        self.max_loss_burst = 0
+        self.loss_bursts = 0
+
+    def _bucket(self, value):
+        if value <= self.min_ms:
+            return 0
+        index = int(math.log(value / self.min_ms) / self.log_growth) + 1
+        return min(index, self.bucket_count - 1)
+
+    def _bucket_value(self, index):
+        """Representative value of a bucket (geometric midpoint)"""
+        if index == 0:
+            return self.min_ms
+        return self.min_ms * math.exp((index - 0.5) * self.log_growth)
+
+    def add_sample(self, value_ms):
+        """Record a successful probe's latency in milliseconds"""
+        self.count += 1
+        delta = value_ms - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value_ms - self.mean)
+
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+        # RFC 3550 section 6.4.1: J += (|D| - J) / 16
+        if self.last is not None:
+            self.jitter += (abs(value_ms - self.last) - self.jitter) / 16.0
+        self.last = value_ms
+
+        self.histogram[self._bucket(value_ms)] += 1
+        self.current_loss_burst = 0
+
+    def add_loss(self):
+        """Record a lost probe (timeout, refused, error)"""
+        self.lost += 1
+        if self.current_loss_burst == 0:
+            self.loss_bursts += 1
+        self.current_loss_burst += 1
+        if self.current_loss_burst > self.max_loss_burst:
+            self.max_loss_burst = self.current_loss_burst
+
+    @property
+    def total(self):
+        return self.count + self.lost
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    def percentile(self, percent):
+        """Approximate percentile (0-100) from the histogram, clamped to the observed min/max"""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(math.ceil(percent / 100.0 * self.count)))
+        seen = 0
+        for index, bucket in enumerate(self.histogram):
+            seen += bucket
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other):
+        """Fold another StreamingLatencyStats (same histogram layout) into this one"""
+        if other.count:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.m2 += other.m2 + delta * delta * self.count * other.count / total
+            self.mean += delta * other.count / total
+            self.count = total
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+            self.jitter = max(self.jitter, other.jitter)
+            for index, bucket in enumerate(other.histogram):
+                self.histogram[index] += bucket
+        self.lost += other.lost
+        self.loss_bursts += other.loss_bursts
+        self.max_loss_burst = max(self.max_loss_burst, other.max_loss_burst)
+
+    def summary(self):
+        """Statistics snapshot as a dict (times in ms)"""
+        total = self.total
+        return {
+            'samples': self.count,
+            'lost': self.lost,
+            'total': total,
+            'loss_percent': (self.lost / total * 100) if total else 0.0,
+            'mean': self.mean if self.count else 0.0,
+            'stdev': self.stdev,
+            'min': self.min if self.min is not None else 0.0,
+            'max': self.max if self.max is not None else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'jitter': self.jitter,
+            'last': self.last,
+            'loss_bursts': self.loss_bursts,
+            'max_loss_burst': self.max_loss_burst
+        }
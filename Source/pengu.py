@@ -326,7 +326,19 @@ def icmp_ping():
     """ICMP ping implementation - deprecated, use enhanced_ping instead"""
     print(f"{Fore.YELLOW}Please use the 'ping' command for enhanced ICMP ping functionality")
 
-def export_tcp_ping_results(hostname, port, total_attempts, successful_connections, failed_connections, avg_time, min_time, max_time):
+def format_latency_report(latency_summary):
+    """Extra report lines for a StreamingLatencyStats summary"""
+    if not latency_summary:
+        return ""
+    return f"""Std Deviation:       {latency_summary['stdev']:.2f}ms
+50th Percentile:     {latency_summary['p50']:.2f}ms
+95th Percentile:     {latency_summary['p95']:.2f}ms
+99th Percentile:     {latency_summary['p99']:.2f}ms
+Jitter (RFC 3550):   {latency_summary['jitter']:.2f}ms
+Loss Bursts:         {latency_summary['loss_bursts']} (longest: {latency_summary['max_loss_burst']})
+"""
+
+def export_tcp_ping_results(hostname, port, total_attempts, successful_connections, failed_connections, avg_time, min_time, max_time, latency_summary=None):
     """Export TCP ping results to file"""
     try:
         from datetime import datetime
@@ -357,7 +369,7 @@ RESPONSE TIME STATISTICS
 Average:             {avg_time:.2f}ms
 Minimum:             {min_time:.2f}ms
 Maximum:             {max_time:.2f}ms
-
+{format_latency_report(latency_summary)}
 Report generated by Pengu v2.1
 """
         
@@ -373,7 +385,7 @@ Report generated by Pengu v2.1
         print(f"{Fore.RED}Error exporting TCP ping report: {e}")
         return None
 
-def export_http_ping_results(url, total_requests, successful_requests, failed_requests, avg_time, min_time, max_time, status_codes):
+def export_http_ping_results(url, total_requests, successful_requests, failed_requests, avg_time, min_time, max_time, status_codes, latency_summary=None, phase_summary=None):
     """Export HTTP ping results to file"""
     try:
         from datetime import datetime
@@ -404,7 +416,7 @@ RESPONSE TIME STATISTICS
 Average:             {avg_time:.2f}ms
 Minimum:             {min_time:.2f}ms
 Maximum:             {max_time:.2f}ms
-
+{format_latency_report(latency_summary)}
 STATUS CODES
 {'-' * 15}
 """
@@ -412,6 +424,15 @@ STATUS CODES
         for status_code, count in status_codes.items():
             report_content += f"{status_code}: {count}\n"
         
+        if phase_summary:
+            from http_probe import PHASES, PHASE_LABELS
+            report_content += f"\nREQUEST PHASES (mean / p50 / p95 / p99)\n{'-' * 30}\n"
+            for phase in PHASES:
+                summary = phase_summary[phase]
+                if summary['samples']:
+                    report_content += (f"{PHASE_LABELS[phase] + ':':<21}{summary['mean']:.2f} / {summary['p50']:.2f} / "
+                                       f"{summary['p95']:.2f} / {summary['p99']:.2f}ms\n")
+        
         report_content += "\nReport generated by Pengu v2.1\n"
         
         with open(filename, 'w') as f:
@@ -430,18 +451,39 @@ def tcp_ping():
     """TCP port connectivity test with stats and improved exit"""
     import socket
     import time
-    import statistics
+    from latency_stats import StreamingLatencyStats
     
     while True:  # Main loop to restart TCP ping
         try:
-            hostname = input(f"{Fore.YELLOW}Enter hostname/IP: ").strip()
+            hostname = input(f"{Fore.YELLOW}Enter hostname/IP (or host:port list / @file for multi-target): ").strip()
+            
+            # Several targets (or explicit host:port) use the concurrent multi-target engine
+            if ',' in hostname or hostname.startswith('@') or hostname.count(':') == 1:
+                from tcp_probe import parse_tcp_targets, multi_tcp_ping
+                default_port = None
+                if not all(':' in item for item in hostname.split(',')) or hostname.startswith('@'):
+                    default_port = input(f"{Fore.YELLOW}Port for targets without one (default: 80): ").strip() or '80'
+                try:
+                    targets = parse_tcp_targets(hostname, default_port)
+                    if not targets:
+                        print(f"{Fore.RED}No targets given")
+                        continue
+                    interval = float(input(f"{Fore.YELLOW}Interval in seconds (default: 1): ").strip() or 1)
+                except ValueError as e:
+                    print(f"{Fore.RED}Invalid input: {e}")
+                    continue
+                multi_tcp_ping(targets, interval)
+                if input(f"\n{Fore.YELLOW}Run another TCP ping? (y/N): ").strip().lower() == 'y':
+                    continue
+                return
+            
             port = int(input(f"{Fore.YELLOW}Enter port: "))
             
             print(f"{Fore.CYAN}Testing TCP connectivity to {hostname}:{port}")
             print(f"{Fore.GREEN}Press 'q' to stop")
             
-            # Statistics tracking
-            response_times = []
+            # Statistics tracking (streaming, bounded memory)
+            latency = StreamingLatencyStats()
             successful_connections = 0
             failed_connections = 0
             total_attempts = 0
@@ -493,23 +535,24 @@ def tcp_ping():
             
             try:
                 while not stop_tcp_ping:
-                    start_time = time.time()
+                    start_time = time.perf_counter()
                     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                     sock.settimeout(3)
                     result = sock.connect_ex((hostname, port))
-                    end_time = time.time()
+                    end_time = time.perf_counter()
                     sock.close()
                     
                     total_attempts += 1
                     
                     if result == 0:
                         response_time = (end_time - start_time) * 1000
-                        response_times.append(response_time)
+                        latency.add_sample(response_time)
                         successful_connections += 1
                         print(f"{Fore.GREEN}✓ Connection succeeded to {hostname}:{port} "
                               f"(Response Time: {response_time:.2f}ms)")
                     else:
                         failed_connections += 1
+                        latency.add_loss()
                         print(f"{Fore.RED}✗ Connection failed to {hostname}:{port}")
                     
                     # Short sleep but allow checking for 'q' key
@@ -525,12 +568,10 @@ def tcp_ping():
             stop_tcp_ping = True
             
             # Show statistics
-            if response_times:
-                avg_time = statistics.mean(response_times)
-                min_time = min(response_times)
-                max_time = max(response_times)
-            else:
-                avg_time = min_time = max_time = 0
+            latency_summary = latency.summary()
+            avg_time = latency_summary['mean']
+            min_time = latency_summary['min']
+            max_time = latency_summary['max']
                 
             print(f"""
 {Fore.CYAN}╔══════════════════════════════════════════════════════╗
@@ -545,9 +586,12 @@ def tcp_ping():
 {Fore.CYAN}  Success Rate:     {Fore.WHITE}{(successful_connections/total_attempts*100) if total_attempts > 0 else 0:.1f}%
 
 {Fore.GREEN}Response Times:
-{Fore.CYAN}  Average:          {Fore.WHITE}{avg_time:.2f}ms
+{Fore.CYAN}  Average:          {Fore.WHITE}{avg_time:.2f}ms {Fore.CYAN}(std dev {Fore.WHITE}{latency_summary['stdev']:.2f}ms{Fore.CYAN})
 {Fore.CYAN}  Minimum:          {Fore.WHITE}{min_time:.2f}ms
 {Fore.CYAN}  Maximum:          {Fore.WHITE}{max_time:.2f}ms
+{Fore.CYAN}  Percentiles:      {Fore.WHITE}p50 {latency_summary['p50']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p95 {latency_summary['p95']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p99 {latency_summary['p99']:.2f}ms
+{Fore.CYAN}  Jitter:           {Fore.WHITE}{latency_summary['jitter']:.2f}ms
+{Fore.CYAN}  Longest Outage:   {Fore.WHITE}{latency_summary['max_loss_burst']} consecutive failures
 """)
             
             # Exit options - use while loop instead of recursion
@@ -564,7 +608,7 @@ def tcp_ping():
                 if choice == '1':
                     break  # Break inner loop to restart TCP ping
                 elif choice == '2':
-                    export_tcp_ping_results(hostname, port, total_attempts, successful_connections, failed_connections, avg_time, min_time, max_time)
+                    export_tcp_ping_results(hostname, port, total_attempts, successful_connections, failed_connections, avg_time, min_time, max_time, latency_summary)
                     # Continue loop to show options again
                 elif choice == '3':
                     return  # Exit function completely
@@ -583,24 +627,57 @@ def http_ping():
     try:
         import requests
         import time
-        import statistics
+        from latency_stats import StreamingLatencyStats
         
         while True:  # Main loop to restart HTTP ping
             try:
-                url = input(f"{Fore.YELLOW}Enter URL (e.g., https://example.com): ").strip()
+                url = input(f"{Fore.YELLOW}Enter URL (e.g., https://example.com, or URL list / @file to monitor many): ").strip()
+                
+                # Several URLs are checked concurrently with a live dashboard
+                if ',' in url or url.startswith('@'):
+                    from http_monitor import parse_url_list, multi_url_monitor
+                    interval = float(input(f"{Fore.YELLOW}Default interval in seconds (default: 5): ").strip() or 5)
+                    targets = parse_url_list(url, interval)
+                    if not targets:
+                        print(f"{Fore.RED}No URLs given")
+                        continue
+                    multi_url_monitor(targets)
+                    if input(f"\n{Fore.YELLOW}Run another HTTP ping? (y/N): ").strip().lower() == 'y':
+                        continue
+                    return
+                
                 if not url.startswith(('http://', 'https://')):
                     url = 'https://' + url
+                
+                print(f"""
+{Fore.GREEN}1. {Fore.WHITE}Warm - reuse one keep-alive connection (server time: TTFB)
+{Fore.GREEN}2. {Fore.WHITE}Cold - new connection per request (adds DNS, connect and TLS)
+{Fore.GREEN}3. {Fore.WHITE}Load test - fixed request rate or fixed concurrency""")
+                timing_mode = input(f"{Fore.YELLOW}Connection mode (default: 1): ").strip() or '1'
+                keep_alive = timing_mode != '2'
+                
+                if timing_mode == '3':
+                    # Load tests go direct; proxies would measure the proxy instead of the target
+                    from http_load import run_load_test_interactive
+                    run_load_test_interactive(url)
+                    if input(f"\n{Fore.YELLOW}Run another HTTP test? (Y/n): ").strip().lower() == 'n':
+                        return
+                    continue
                     
-                print(f"{Fore.CYAN}Testing HTTP(S) connectivity to {url}")
+                print(f"{Fore.CYAN}Testing HTTP(S) connectivity to {url} ({'warm' if keep_alive else 'cold'} connections)")
                 print(f"{Fore.GREEN}Press 'q' to stop")
                 
-                # Statistics tracking
-                response_times = []
+                # Statistics tracking (streaming, bounded memory)
+                latency = StreamingLatencyStats()
                 successful_requests = 0
                 failed_requests = 0
                 total_requests = 0
                 status_codes = {}
                 
+                # Keep-alive session shared with the other HTTP tools
+                from http_session_pool import get_session_pool
+                session_pool = get_session_pool()
+                
                 # Check if proxy mode is enabled
                 proxies = None
                 try:
@@ -613,6 +690,14 @@ def http_ping():
                 except Exception:
                     pass  # No proxy configured
                 
+                # Direct requests are timed phase by phase; proxied ones go through the session pool
+                prober = None
+                phase_stats = None
+                if not proxies:
+                    from http_probe import HttpProber, PhaseStats, format_phases
+                    prober = HttpProber(url, keep_alive=keep_alive)
+                    phase_stats = PhaseStats()
+                
                 # Setup for non-blocking input
                 stop_http_ping = False
                 
@@ -660,14 +745,40 @@ def http_ping():
                 
                 try:
                     while not stop_http_ping:
-                        start_time = time.time()
+                        if prober:
+                            result = prober.probe()
+                            total_requests += 1
+                            if result['status'] == 'ok':
+                                response_time = result['timings']['total']
+                                latency.add_sample(response_time)
+                                phase_stats.add(result)
+                                status_code = result['status_code']
+                                status_codes[status_code] = status_codes.get(status_code, 0) + 1
+                                if status_code == 200:
+                                    successful_requests += 1
+                                    print(f"{Fore.GREEN}✓ {status_code} {response_time:.2f}ms {Fore.CYAN}({format_phases(result)})")
+                                else:
+                                    failed_requests += 1
+                                    print(f"{Fore.YELLOW}⚠ {status_code} {response_time:.2f}ms {Fore.CYAN}({format_phases(result)})")
+                            else:
+                                failed_requests += 1
+                                latency.add_loss()
+                                print(f"{Fore.RED}✗ Connection failed: {result['error']}")
+                            
+                            for _ in range(10):
+                                if stop_http_ping:
+                                    break
+                                time.sleep(0.1)
+                            continue
+                        
+                        start_time = time.perf_counter()
                         try:
-                            response = requests.get(url, timeout=5, proxies=proxies)
-                            end_time = time.time()
+                            response = session_pool.get(url, timeout=5, proxies=proxies)
+                            end_time = time.perf_counter()
                             
                             total_requests += 1
                             response_time = (end_time - start_time) * 1000
-                            response_times.append(response_time)
+                            latency.add_sample(response_time)
                             
                             # Track status codes
                             status_code = response.status_code
@@ -685,7 +796,10 @@ def http_ping():
                         except requests.RequestException as e:
                             total_requests += 1
                             failed_requests += 1
+                            latency.add_loss()
                             print(f"{Fore.RED}✗ Connection failed: {e}")
+                            # The pool has been told about the failure - draw again so a failing proxy rotates out
+                            proxies = get_proxy_for_requests() or proxies
                         
                         # Short sleep but allow checking for 'q' key
                         for _ in range(10):  # 1 second total, checked in 0.1s intervals
@@ -698,14 +812,14 @@ def http_ping():
                 
                 # Stop the key monitoring thread
                 stop_http_ping = True
+                if prober:
+                    prober.close()
                 
                 # Show statistics
-                if response_times:
-                    avg_time = statistics.mean(response_times)
-                    min_time = min(response_times)
-                    max_time = max(response_times)
-                else:
-                    avg_time = min_time = max_time = 0
+                latency_summary = latency.summary()
+                avg_time = latency_summary['mean']
+                min_time = latency_summary['min']
+                max_time = latency_summary['max']
                     
                 print(f"""
 {Fore.CYAN}╔══════════════════════════════════════════════════════╗
@@ -720,15 +834,34 @@ def http_ping():
 {Fore.CYAN}  Success Rate:     {Fore.WHITE}{(successful_requests/total_requests*100) if total_requests > 0 else 0:.1f}%
 
 {Fore.GREEN}Response Times:
-{Fore.CYAN}  Average:          {Fore.WHITE}{avg_time:.2f}ms
+{Fore.CYAN}  Average:          {Fore.WHITE}{avg_time:.2f}ms {Fore.CYAN}(std dev {Fore.WHITE}{latency_summary['stdev']:.2f}ms{Fore.CYAN})
 {Fore.CYAN}  Minimum:          {Fore.WHITE}{min_time:.2f}ms
 {Fore.CYAN}  Maximum:          {Fore.WHITE}{max_time:.2f}ms
+{Fore.CYAN}  Percentiles:      {Fore.WHITE}p50 {latency_summary['p50']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p95 {latency_summary['p95']:.2f}ms {Fore.CYAN}| {Fore.WHITE}p99 {latency_summary['p99']:.2f}ms
+{Fore.CYAN}  Jitter:           {Fore.WHITE}{latency_summary['jitter']:.2f}ms
+{Fore.CYAN}  Longest Outage:   {Fore.WHITE}{latency_summary['max_loss_burst']} consecutive failures
 
 {Fore.GREEN}Status Codes:""")
                 
                 for status_code, count in status_codes.items():
                     print(f"{Fore.CYAN}  {status_code}:              {Fore.WHITE}{count}")
                 
+                if phase_stats and (phase_stats.new_connections or phase_stats.reused_connections):
+                    from http_probe import PHASES, PHASE_LABELS
+                    phases = phase_stats.summary()
+                    print(f"""
+{Fore.GREEN}Request Phases ({phase_stats.new_connections} new / {phase_stats.reused_connections} reused connections):
+{Fore.CYAN}  {'Phase':<20} {'Mean':>10} {'p50':>10} {'p95':>10} {'p99':>10}""")
+                    for phase in PHASES:
+                        summary = phases[phase]
+                        if summary['samples']:
+                            print(f"{Fore.CYAN}  {PHASE_LABELS[phase]:<20}{Fore.WHITE} {summary['mean']:>8.2f}ms "
+                                  f"{summary['p50']:>8.2f}ms {summary['p95']:>8.2f}ms {summary['p99']:>8.2f}ms")
+                    if phases['connect']['samples'] and phases['ttfb']['samples']:
+                        server_ms = max(0.0, phases['ttfb']['p50'] - phases['connect']['p50'])
+                        print(f"{Fore.CYAN}  Network RTT ~ connect {Fore.WHITE}{phases['connect']['p50']:.2f}ms"
+                              f"{Fore.CYAN}, server time ~ TTFB - RTT {Fore.WHITE}{server_ms:.2f}ms")
+                
                 # Exit options - use while loop instead of recursion
                 while True:
                     print(f"""
@@ -743,7 +876,8 @@ def http_ping():
                     if choice == '1':
                         break  # Break inner loop to restart HTTP ping
                     elif choice == '2':
-                        export_http_ping_results(url, total_requests, successful_requests, failed_requests, avg_time, min_time, max_time, status_codes)
+                        export_http_ping_results(url, total_requests, successful_requests, failed_requests, avg_time, min_time, max_time, status_codes, latency_summary,
+                                                 phase_stats.summary() if phase_stats else None)
                         # Continue loop to show options again
                     elif choice == '3':
                         return  # Exit function completely
@@ -892,6 +1026,10 @@ def main():
     print(f"{Fore.YELLOW}For more information, please enter the 'tos' command.\n")
     
     user_inputs()
+    
+    # Background proxy validation would otherwise check the rest of its list before Pengu exits
+    if 'proxy_manager' in tools:
+        tools['proxy_manager'].stop_background_validation()
 
 if __name__ == "__main__":
     main()
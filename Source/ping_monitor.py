@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Pengu Ping Monitor Module - Continuous latency monitoring with time-series output
+Per-probe samples go to size-rotated CSV/JSONL files with per-minute and per-hour rollups
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from latency_stats import StreamingLatencyStats
+
+SAMPLE_FIELDS = ['timestamp', 'target', 'status', 'rtt_ms']
+ROLLUP_FIELDS = ['period_start', 'period', 'target', 'sent', 'received', 'loss_percent',
+                 'mean_ms', 'min_ms', 'max_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'jitter_ms', 'max_loss_burst']
+
+ROLLUP_PERIODS = {'minute': 60, 'hour': 3600}
+
+def default_monitor_dir():
+    """New session directory under pengu_output/monitor"""
+    session = datetime.now().strftime("%Y%m%d_%H%M%S")
+    try:
+        from pengu import get_output_path
+        return get_output_path("monitor", session)
+    except:
+        # Fallback if import fails
+        return os.path.join("pengu_output", "monitor", session)
+
+class RotatingSeriesWriter:
+    """Append-only CSV/JSONL writer that rotates by size and keeps a bounded number of files"""
+    def __init__(self, directory, name, fields, fmt='csv', max_bytes=10 * 1024 * 1024, keep_files=20,
+                 flush_interval=1.0):
+        if fmt not in ('csv', 'jsonl'):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.directory = directory
+        self.name = name
+        self.fields = fields
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.keep_files = keep_files
+        self.flush_interval = flush_interval
+        self.file = None
+        self.path = None
+        self.written = 0
+        self.rows = 0
+        self.files = []
+        self.last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._open()
+
+    def _open(self):
+        part = len(self.files) + 1
+        self.path = os.path.join(self.directory, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{part:04d}.{self.fmt}")
+        self.file = open(self.path, 'w', encoding='utf-8', newline='')
+        self.files.append(self.path)
+        self.written = 0
+        if self.fmt == 'csv':
+            self._write(','.join(self.fields) + '\n')
+
+        # Drop the oldest files beyond the retention limit
+        while len(self.files) > self.keep_files:
+            try:
+                os.remove(self.files.pop(0))
+            except OSError:
+                pass
+
+    def _write(self, text):
+        self.file.write(text)
+        self.written += len(text)
+
+    def write(self, row):
+        """Append one row (dict keyed by fields)"""
+        if self.fmt == 'csv':
+            self._write(','.join(self._csv_value(row.get(field)) for field in self.fields) + '\n')
+        else:
+            self._write(json.dumps({field: row.get(field) for field in self.fields}, separators=(',', ':')) + '\n')
+        self.rows += 1
+
+        if self.written >= self.max_bytes:
+            self.file.close()
+            self._open()
+        elif time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def _csv_value(self, value):
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        value = str(value)
+        if ',' in value or '"' in value or '\n' in value:
+            value = '"' + value.replace('"', '""') + '"'
+        return value
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+class RollupAggregator:
+    """Per-target statistics for the current period, written out when the period ends"""
+    def __init__(self, name, period, writer, on_rollup=None):
+        self.name = name
+        self.period = period
+        self.writer = writer
+        self.on_rollup = on_rollup
+        self.period_start = None
+        self.targets = {}  # target -> StreamingLatencyStats
+
+    def _period_of(self, timestamp):
+        return int(timestamp // self.period) * self.period
+
+    def add(self, target, stats, timestamp):
+        """Fold a finished sub-period (or one sample's stats) for a target into the current period"""
+        self.advance(timestamp)
+        current = self.targets.get(target)
+        if current is None:
+            current = self.targets[target] = StreamingLatencyStats()
+        current.merge(stats)
+
+    def record(self, target, rtt_ms, timestamp):
+        """Add one probe result (rtt_ms None = lost)"""
+        self.advance(timestamp)
+        stats = self.targets.get(target)
+        if stats is None:
+            stats = self.targets[target] = StreamingLatencyStats()
+        if rtt_ms is None:
+            stats.add_loss()
+        else:
+            stats.add_sample(rtt_ms)
+
+    def advance(self, timestamp):
+        """Close the current period once timestamp is past it"""
+        period_start = self._period_of(timestamp)
+        if self.period_start is None:
+            self.period_start = period_start
+        elif period_start > self.period_start:
+            self.close_period()
+            self.period_start = period_start
+
+    def close_period(self):
+        """Write rollup rows for the current period and start empty"""
+        if self.period_start is None or not self.targets:
+            return []
+        started = datetime.fromtimestamp(self.period_start).isoformat(timespec='seconds')
+        rows = []
+        for target, stats in self.targets.items():
+            summary = stats.summary()
+            row = {
+                'period_start': started,
+                'period': self.name,
+                'target': target,
+                'sent': summary['total'],
+                'received': summary['samples'],
+                'loss_percent': summary['loss_percent'],
+                'mean_ms': summary['mean'] if summary['samples'] else None,
+                'min_ms': summary['min'] if summary['samples'] else None,
+                'max_ms': summary['max'] if summary['samples'] else None,
+                'p50_ms': summary['p50'] if summary['samples'] else None,
+                'p95_ms': summary['p95'] if summary['samples'] else None,
+                'p99_ms': summary['p99'] if summary['samples'] else None,
+                'jitter_ms': summary['jitter'],
+                'max_loss_burst': summary['max_loss_burst']
+            }
+            self.writer.write(row)
+            rows.append((row, stats))
+        self.writer.flush()
+        self.targets = {}
+        if self.on_rollup:
+            self.on_rollup(rows)
+        return rows
+
+class PingMonitor:
+    """Records probe results as a time series with minute and hour rollups.
+
+    Memory use is bounded by the number of targets: samples are streamed to disk and
+    only the statistics of the open minute/hour are kept.
+    """
+    def __init__(self, directory=None, fmt='csv', max_bytes=10 * 1024 * 1024, keep_files=20, on_rollup=None):
+        self.directory = directory or default_monitor_dir()
+        self.fmt = fmt
+        self.samples = RotatingSeriesWriter(self.directory, 'samples', SAMPLE_FIELDS, fmt, max_bytes, keep_files)
+        self.hourly = RollupAggregator(
+            'hour', ROLLUP_PERIODS['hour'],
+            RotatingSeriesWriter(self.directory, 'rollup_hour', ROLLUP_FIELDS, fmt, max_bytes, keep_files),
+            self._notify)
+        self.minutely = RollupAggregator(
+            'minute', ROLLUP_PERIODS['minute'],
+            RotatingSeriesWriter(self.directory, 'rollup_minute', ROLLUP_FIELDS, fmt, max_bytes, keep_files),
+            self._minute_closed)
+        self.on_rollup = on_rollup
+        self.sample_count = 0
+
+    def _minute_closed(self, rows):
+        # Hour rollups are built from the finished minutes, not from every sample
+        for row, stats in rows:
+            self.hourly.add(row['target'], stats, self.minutely.period_start)
+        self._notify(rows)
+
+    def _notify(self, rows):
+        if self.on_rollup:
+            self.on_rollup(rows)
+
+    def record(self, target, rtt_ms, status='reply', timestamp=None):
+        """Record one probe result; rtt_ms is None for lost probes"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.samples.write({
+            'timestamp': round(timestamp, 3),
+            'target': target,
+            'status': status,
+            'rtt_ms': round(rtt_ms, 3) if rtt_ms is not None else None
+        })
+        self.minutely.record(target, rtt_ms, timestamp)
+        self.sample_count += 1
+
+    def tick(self, timestamp=None):
+        """Close finished periods even when no probes arrive (call periodically)"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        self.minutely.advance(timestamp)
+        self.hourly.advance(timestamp)
+        self.samples.flush()
+
+    def close(self):
+        """Write the partial minute/hour and close every file"""
+        self.minutely.close_period()
+        self.hourly.close_period()
+        for writer in (self.samples, self.minutely.writer, self.hourly.writer):
+            writer.close()
@@ -74,8 +74,12 @@ class PortScanStats:
         """Get scan summary"""
         scan_duration = (self.end_time - self.start_time).total_seconds() if self.end_time else 0
         
+        # Owning network from the offline ASN table (no lookup traffic)
+        from asn_lookup import describe_address
+        
         return {
             'target_ip': self.target_ip,
+            'network': describe_address(self.target_ip),
             'total_ports_scanned': self.total_ports,
             'open_ports_count': len(self.open_ports),
             'closed_ports_count': self.closed_ports,
@@ -101,8 +105,9 @@ def get_service_name(port):
     """Get common service name for port"""
     return COMMON_SERVICES.get(port, "Unknown")
 
-def scan_port(ip, port):
+def scan_port(ip, port, stats=None):
     """Scan a single port"""
+    stats = stats or scan_stats
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
         sock.settimeout(1)
         try:
@@ -110,19 +115,109 @@ def scan_port(ip, port):
             service_name = get_service_name(port)
             with print_lock:
                 print(f"{Fore.GREEN}Port {port} is open on {ip} ({service_name})")
-            scan_stats.add_open_port(port, service_name)
+            stats.add_open_port(port, service_name)
         except:
-            scan_stats.add_closed_port()
+            stats.add_closed_port()
 
-def worker(ip):
-    """Worker thread function"""
+def worker():
+    """Worker thread function - queue items are (ip, port, stats)"""
     while True:
-        port = queue.get()
-        if port is None:
+        item = queue.get()
+        if item is None:
             break
-        scan_port(ip, port)
+        scan_port(*item)
         queue.task_done()
 
+def load_targets(text):
+    """Parse scan targets: comma-separated IPs/hostnames, CIDR ranges and @file lists
+    (one target per line, e.g. the live-host list exported by the ping sweep)"""
+    import ipaddress
+    
+    items = []
+    for item in text.split(','):
+        item = item.strip()
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8', errors='ignore') as f:
+                items.extend(line.split('#', 1)[0].strip() for line in f)
+        else:
+            items.append(item)
+    
+    targets = []
+    for item in items:
+        if not item:
+            continue
+        if '/' in item:
+            network = ipaddress.ip_network(item, strict=False)
+            if network.num_addresses > 65536:
+                raise ValueError(f"{item}: ranges larger than a /16 are not supported")
+            targets.extend(str(address) for address in (network.hosts() if network.num_addresses > 2 else network))
+        else:
+            targets.append(item)
+    return list(dict.fromkeys(targets))
+
+def run_port_scan(targets, start_port, end_port, num_threads):
+    """Scan a port range on one or more targets with a shared worker pool.
+    Returns {target: PortScanStats} with every scan finished."""
+    global scan_stats, queue
+    
+    if isinstance(targets, str):
+        targets = [targets]
+    total_ports = end_port - start_port + 1
+    host_stats = {}
+    for target in targets:
+        stats = PortScanStats()
+        stats.start_scan(target, total_ports, num_threads)
+        host_stats[target] = stats
+    scan_stats = host_stats[targets[-1]]
+    # Bounded, so a /16 times a large port range is fed as the workers drain it instead of queued up front
+    queue = Queue(maxsize=num_threads * 4)
+    
+    # Start worker threads
+    threads = []
+    for _ in range(num_threads):
+        t = threading.Thread(target=worker)
+        t.daemon = True  # Allow main thread to exit
+        t.start()
+        threads.append(t)
+
+    # Put ports in queue
+    for target in targets:
+        for port in range(start_port, end_port + 1):
+            queue.put((target, port, host_stats[target]))
+
+    # Block until all tasks are done
+    queue.join()
+
+    # Stop workers
+    for _ in range(num_threads):
+        queue.put(None)
+    for t in threads:
+        t.join()
+    
+    for stats in host_stats.values():
+        stats.finish_scan()
+    return host_stats
+
+def show_multi_scan_summary(summaries):
+    """Compact per-host results of a multi-target scan"""
+    hosts_with_open = [s for s in summaries if s['open_ports']]
+    print(f"""
+{Fore.CYAN}╔══════════════════════════════════════════════════════╗
+{Fore.CYAN}║             {Fore.MAGENTA}Multi-Host Port Scan Summary{Fore.CYAN}             ║
+{Fore.CYAN}╚══════════════════════════════════════════════════════╝
+
+{Fore.CYAN}  Hosts Scanned:    {Fore.WHITE}{len(summaries)}
+{Fore.CYAN}  Hosts With Open:  {Fore.WHITE}{len(hosts_with_open)}
+{Fore.CYAN}  Ports Per Host:   {Fore.WHITE}{summaries[0]['total_ports_scanned'] if summaries else 0}
+{Fore.CYAN}  Scan Duration:    {Fore.WHITE}{max((s['scan_duration'] for s in summaries), default=0):.2f} seconds
+""")
+    for summary in hosts_with_open:
+        ports = ', '.join(f"{p['port']}/{p['service']}" for p in sorted(summary['open_ports'], key=lambda p: p['port']))
+        network = f" {Fore.CYAN}[{summary['network']}]" if summary.get('network') else ""
+        print(f"{Fore.GREEN}  {summary['target_ip']:<18}{Fore.WHITE}{ports}{network}")
+    if not hosts_with_open:
+        print(f"{Fore.YELLOW}  No open ports found")
+
 def show_scan_statistics(stats_summary):
     """Display scan statistics"""
     print(f"""
@@ -132,6 +227,7 @@ def show_scan_statistics(stats_summary):
 
 {Fore.GREEN}Scan Summary:
 {Fore.CYAN}  Target:           {Fore.WHITE}{stats_summary['target_ip']}
+{Fore.CYAN}  Network:          {Fore.WHITE}{stats_summary.get('network') or 'Unknown (no offline ASN data)'}
 {Fore.CYAN}  Ports Scanned:    {Fore.WHITE}{stats_summary['total_ports_scanned']}
 {Fore.CYAN}  Open Ports:       {Fore.WHITE}{stats_summary['open_ports_count']}
 {Fore.CYAN}  Closed Ports:     {Fore.WHITE}{stats_summary['closed_ports_count']}
@@ -172,6 +268,8 @@ def generate_txt_report(stats_summary, filename):
         f.write("PENGU PORT SCAN REPORT\n")
         f.write("=" * 50 + "\n\n")
         f.write(f"Target IP:           {stats_summary['target_ip']}\n")
+        if stats_summary.get('network'):
+            f.write(f"Network:             {stats_summary['network']}\n")
         f.write(f"Scan Date:           {stats_summary['start_time']}\n")
         f.write(f"Ports Scanned:       {stats_summary['total_ports_scanned']}\n")
         f.write(f"Open Ports Found:    {stats_summary['open_ports_count']}\n")
@@ -193,6 +291,8 @@ def generate_md_report(stats_summary, filename):
         f.write("# Pengu Port Scan Report\n\n")
         f.write("## Scan Summary\n\n")
         f.write(f"- **Target IP:** {stats_summary['target_ip']}\n")
+        if stats_summary.get('network'):
+            f.write(f"- **Network:** {stats_summary['network']}\n")
         f.write(f"- **Scan Date:** {stats_summary['start_time']}\n")
         f.write(f"- **Ports Scanned:** {stats_summary['total_ports_scanned']}\n")
         f.write(f"- **Open Ports Found:** {stats_summary['open_ports_count']}\n")
@@ -281,7 +381,8 @@ def generate_json_report(stats_summary, filename):
         json.dump(json_data, f, indent=2)
 
 def show_report_options(stats_summary):
-    """Show report generation options"""
+    """Show report generation options (a list of summaries gets one report per host)"""
+    summaries = stats_summary if isinstance(stats_summary, list) else [stats_summary]
     while True:
         print(f"""
 {Fore.YELLOW}Would you like to generate a report?
@@ -299,7 +400,13 @@ def show_report_options(stats_summary):
             format_type = format_map[choice]
             
             print(f"{Fore.CYAN}Generating {format_type.upper()} report...")
-            filename = generate_report(stats_summary, format_type)
+            if len(summaries) > 1:
+                for summary in summaries:
+                    filename = generate_report(summary, format_type)
+                    if filename:
+                        print(f"{Fore.GREEN}✓ Report saved as: {os.path.join(os.getcwd(), filename)}")
+                break
+            filename = generate_report(summaries[0], format_type)
             
             if filename:
                 current_dir = os.getcwd()
@@ -343,13 +450,20 @@ def show_scan_exit_options():
 def main():
     """Main port scanner function"""
     print_banner()
-    global scan_stats
     
     while True:
         try:
-            ip = input("Enter IP address (or 'exit' to quit): ").strip()
+            ip = input("Enter IP address, CIDR or @file (comma-separated, or 'exit' to quit): ").strip()
             if ip.lower() in ['exit', 'quit']:
                 break
+            try:
+                targets = load_targets(ip)
+            except (ValueError, OSError) as e:
+                print(f"{Fore.RED}Invalid target list: {e}")
+                continue
+            if not targets:
+                print(f"{Fore.RED}No targets given.")
+                continue
                 
             start_port = int(input("Enter start port: "))
             end_port = int(input("Enter end port: "))
@@ -382,43 +496,28 @@ def main():
                 
             num_threads = min(num_threads, 200)  # Hard limit for safety
             
-            # Initialize scan statistics
-            total_ports = end_port - start_port + 1
-            scan_stats = PortScanStats()
-            scan_stats.start_scan(ip, total_ports, num_threads)
+            target_text = targets[0] if len(targets) == 1 else f"{len(targets)} hosts"
+            print(f"{Fore.CYAN}Scanning {target_text} ports {start_port}-{end_port} with {num_threads} threads...")
             
-            print(f"{Fore.CYAN}Scanning {ip} ports {start_port}-{end_port} with {num_threads} threads...")
+            host_stats = run_port_scan(targets, start_port, end_port, num_threads)
             
-            # Start worker threads
-            threads = []
-            for _ in range(num_threads):
-                t = threading.Thread(target=worker, args=(ip,))
-                t.daemon = True  # Allow main thread to exit
-                t.start()
-                threads.append(t)
-
-            # Put ports in queue
-            for port in range(start_port, end_port + 1):
-                queue.put(port)
-
-            # Block until all tasks are done
-            queue.join()
-
-            # Stop workers
-            for _ in range(num_threads):
-                queue.put(None)
-            for t in threads:
-                t.join()
-            
-            # Finish scan and show statistics
-            scan_stats.finish_scan()
-            stats_summary = scan_stats.get_summary()
-            
-            print(f"{Fore.GREEN}Scan complete for {ip}!")
-            show_scan_statistics(stats_summary)
-            
-            # Report generation options
-            show_report_options(stats_summary)
+            if len(targets) == 1:
+                # Show statistics
+                stats_summary = scan_stats.get_summary()
+                print(f"{Fore.GREEN}Scan complete for {targets[0]}!")
+                show_scan_statistics(stats_summary)
+                
+                # Report generation options
+                show_report_options(stats_summary)
+            else:
+                summaries = [stats.get_summary() for stats in host_stats.values()]
+                print(f"{Fore.GREEN}Scan complete for {len(targets)} hosts!")
+                show_multi_scan_summary(summaries)
+                
+                # Reports for the hosts that have something to report
+                with_open = [summary for summary in summaries if summary['open_ports']]
+                if with_open:
+                    show_report_options(with_open)
             
             # Exit options
             result = show_scan_exit_options()
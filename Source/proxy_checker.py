@@ -9,7 +9,9 @@ import time
 import socket
 import threading
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from http_session_pool import get_session_pool
+from proxy_parser import parse_proxy_line, iter_proxy_file
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from colorama import init, Fore, Style
 
 # Initialize colorama
@@ -18,10 +20,61 @@ init(autoreset=True)
 # Thread-safe print lock
 print_lock = threading.Lock()
 
+# Default judge - httpbin only echoes the origin, the bundled judge_server echoes every header
+DEFAULT_JUDGE_URL = "http://httpbin.org/ip"
+
+# Failed results are not kept: they are tallied by reason and streamed to the store in batches
+MAX_FAILURE_REASONS = 50
+STORE_BATCH_SIZE = 500
+
+# Request headers that reveal a proxy in the path (lower-case)
+PROXY_HEADERS = [
+    'via', 'x-forwarded-for', 'forwarded', 'forwarded-for', 'x-forwarded', 'x-forwarded-host',
+    'x-forwarded-proto', 'x-real-ip', 'client-ip', 'x-client-ip', 'true-client-ip',
+    'x-originating-ip', 'x-remote-ip', 'x-remote-addr', 'x-proxy-id', 'proxy-connection',
+    'proxy-agent', 'x-bluecoat-via', 'cf-connecting-ip'
+]
+
+def classify_anonymity(proxy_info, response_data, real_ip=None):
+    """Classify proxy anonymity from the judge response, returns (anonymity, color)"""
+    proxy_ip = response_data.get('origin', '')
+    headers = {name.lower(): str(value) for name, value in (response_data.get('headers') or {}).items()}
+    
+    if real_ip is None and not headers:
+        # Legacy origin-only heuristic when we know neither our address nor the headers
+        if proxy_info['ip'] in proxy_ip:
+            return "Transparent", Fore.RED
+        elif ',' in proxy_ip:
+            return "Anonymous", Fore.YELLOW
+        else:
+            return "Elite", Fore.GREEN
+    
+    # Transparent: our real address leaks through the origin or a forwarding header.
+    # A proxy on our own host always shows our address as origin, so only headers count there.
+    if real_ip:
+        if real_ip in proxy_ip and real_ip != proxy_info['ip']:
+            return "Transparent", Fore.RED
+        if any(real_ip in headers.get(name, '') for name in PROXY_HEADERS):
+            return "Transparent", Fore.RED
+    
+    # Anonymous: address hidden, but the proxy announces itself
+    if ',' in proxy_ip or any(name in headers for name in PROXY_HEADERS):
+        return "Anonymous", Fore.YELLOW
+    
+    return "Elite", Fore.GREEN
+
 class ProxyChecker:
     def __init__(self):
         self.working_proxies = []
-        self.tested_proxies = []
+        self.tested_count = 0
+        self.failed_count = 0
+        self.failure_reasons = {}  # error -> count
+        self.store_buffer = []
+        self.funnel = None
+        self.test_url = DEFAULT_JUDGE_URL
+        self.real_ip = None
+        self.store = None
+        self.parse_reader = None
         
     def print_banner(self):
         """Print the proxy checker banner"""
@@ -32,30 +85,26 @@ class ProxyChecker:
 {Fore.MAGENTA}╚════════════════════════════════════════════════╝
 """)
     
+    def use_judge(self, test_url):
+        """Point checks at a judge URL and learn our real address from it for anonymity checks"""
+        from judge_server import detect_real_ip
+        
+        self.test_url = test_url
+        self.real_ip = detect_real_ip(test_url)
+        if self.real_ip:
+            print(f"{Fore.GREEN}Judge: {test_url} (real IP: {self.real_ip})")
+        else:
+            print(f"{Fore.YELLOW}Judge: {test_url} (could not detect real IP, using header-only anonymity checks)")
+    
+    def stream_proxy_file(self, file_path):
+        """Stream normalized, deduplicated proxies from a file without loading it into memory"""
+        self.parse_reader = iter_proxy_file(file_path)
+        return self.parse_reader
+    
     def parse_proxy_file(self, file_path):
         """Parse proxy file and return list of proxies"""
-        proxies = []
-        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # Support various formats:
-                    # IP:PORT
-                    # TYPE://IP:PORT
-                    # IP:PORT:USER:PASS
-                    # TYPE://USER:PASS@IP:PORT
-                    
-                    proxy_info = self.parse_proxy_line(line)
-                    if proxy_info:
-                        proxies.append(proxy_info)
-                    else:
-                        with print_lock:
-                            print(f"{Fore.YELLOW}Warning: Skipping invalid proxy at line {line_num}: {line}")
-                            
+            proxies = list(self.stream_proxy_file(file_path))
         except FileNotFoundError:
             print(f"{Fore.RED}Error: Proxy file '{file_path}' not found.")
             return []
@@ -63,63 +112,29 @@ class ProxyChecker:
             print(f"{Fore.RED}Error reading proxy file: {e}")
             return []
         
+        self.show_parse_stats()
         return proxies
     
+    def show_parse_stats(self):
+        """Summarize skipped lines of the last parsed file instead of warning per line"""
+        if not self.parse_reader:
+            return
+        
+        stats = self.parse_reader.stats
+        if stats['duplicates']:
+            print(f"{Fore.YELLOW}Skipped {stats['duplicates']} duplicate proxies")
+        if stats['invalid']:
+            print(f"{Fore.YELLOW}Skipped {stats['invalid']} invalid lines, e.g.:")
+            for line_num, line in stats['invalid_samples']:
+                print(f"{Fore.YELLOW}  line {line_num}: {line}")
+    
     def parse_proxy_line(self, line):
         """Parse a single proxy line and return proxy info"""
-        try:
-            # Handle different formats
-            if '://' in line:
-                # Format: type://[user:pass@]ip:port
-                parts = line.split('://', 1)
-                proxy_type = parts[0].lower()
-                rest = parts[1]
-                
-                if '@' in rest:
-                    auth_part, addr_part = rest.rsplit('@', 1)
-                    if ':' in auth_part:
-                        username, password = auth_part.split(':', 1)
-                    else:
-                        username, password = auth_part, ""
-                else:
-                    addr_part = rest
-                    username, password = None, None
-                
-                if ':' in addr_part:
-                    ip, port = addr_part.rsplit(':', 1)
-                    port = int(port)
-                else:
-                    return None
-                    
-            else:
-                # Format: ip:port[:user:pass]
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    ip = parts[0]
-                    port = int(parts[1])
-                    proxy_type = 'http'  # Default type
-                    
-                    if len(parts) >= 4:
-                        username, password = parts[2], parts[3]
-                    else:
-                        username, password = None, None
-                else:
-                    return None
-            
-            return {
-                'ip': ip,
-                'port': port,
-                'type': proxy_type,
-                'username': username,
-                'password': password,
-                'original': line
-            }
-            
-        except Exception:
-            return None
+        return parse_proxy_line(line)
     
-    def test_proxy(self, proxy_info, test_url="http://httpbin.org/ip", timeout=10):
+    def test_proxy(self, proxy_info, test_url=None, timeout=10):
         """Test a single proxy"""
+        test_url = test_url or self.test_url
         try:
             start_time = time.time()
             
@@ -134,8 +149,13 @@ class ProxyChecker:
                 'https': proxy_url
             }
             
-            # Test the proxy
-            response = requests.get(test_url, proxies=proxies, timeout=timeout)
+            # Test the proxy (a working proxy's session stays warm in the shared pool)
+            session_pool = get_session_pool()
+            try:
+                response = session_pool.get(test_url, proxies=proxies, timeout=timeout)
+            except Exception:
+                session_pool.discard(proxies)  # Dead proxies should not hold pool slots
+                raise
             end_time = time.time()
             
             if response.status_code == 200:
@@ -145,17 +165,7 @@ class ProxyChecker:
                 try:
                     response_data = response.json()
                     proxy_ip = response_data.get('origin', '')
-                    
-                    # Check if our real IP is hidden
-                    if proxy_info['ip'] in proxy_ip:
-                        anonymity = "Transparent"
-                        anonymity_color = Fore.RED
-                    elif ',' in proxy_ip:
-                        anonymity = "Anonymous"
-                        anonymity_color = Fore.YELLOW
-                    else:
-                        anonymity = "Elite"
-                        anonymity_color = Fore.GREEN
+                    anonymity, anonymity_color = classify_anonymity(proxy_info, response_data, self.real_ip)
                 except:
                     anonymity = "Unknown"
                     anonymity_color = Fore.WHITE
@@ -175,6 +185,7 @@ class ProxyChecker:
                 
                 return result
             else:
+                session_pool.discard(proxies)
                 result = {
                     'proxy': proxy_info,
                     'status': 'failed',
@@ -209,45 +220,165 @@ class ProxyChecker:
                 'anonymity': None
             }
     
-    def check_proxies(self, proxies, max_workers=50):
+    def run_prefilter(self, proxies, timeout=2.0, concurrency=2000):
+        """Stage 1: drop endpoints that do not accept a TCP connection (or SOCKS greeting)"""
+        from async_proxy_checker import prefilter_proxies
+        
+        count = f"{len(proxies)} " if hasattr(proxies, '__len__') else ""
+        print(f"{Fore.CYAN}Stage 1: TCP reachability prefilter on {count}proxies "
+              f"({concurrency} concurrent, {timeout:.1f}s timeout)...")
+        
+        start_time = time.time()
+        alive, dead = prefilter_proxies(proxies, timeout=timeout, concurrency=concurrency,
+                                        on_dead=self._count_result)
+        
+        self.funnel = {
+            'loaded': len(alive) + dead,
+            'reachable': len(alive),
+            'working': None
+        }
+        
+        print(f"{Fore.GREEN}Stage 1 complete in {time.time() - start_time:.1f}s: "
+              f"{len(alive)} reachable, {dead} dead")
+        return alive
+    
+    def show_funnel(self):
+        """Print the per-stage validation funnel"""
+        if not self.funnel:
+            return
+        
+        loaded = self.funnel['loaded']
+        reachable = self.funnel['reachable']
+        working = self.funnel['working'] or 0
+        
+        print(f"""
+{Fore.CYAN}Validation Funnel:
+{Fore.WHITE}  Loaded:            {loaded}
+{Fore.WHITE}  Stage 1 reachable: {reachable} ({(reachable/loaded*100 if loaded > 0 else 0):.1f}%)
+{Fore.WHITE}  Stage 2 working:   {working} ({(working/reachable*100 if reachable > 0 else 0):.1f}% of reachable)""")
+    
+    def _finish_funnel(self, working_before):
+        """Record the stage 2 result count once the full test has run"""
+        if self.funnel and self.funnel['working'] is None:
+            self.funnel['working'] = len(self.working_proxies) - working_before
+            self.show_funnel()
+    
+    def check_proxies(self, proxies, max_workers=50, prefilter=False):
         """Check multiple proxies concurrently"""
-        print(f"{Fore.CYAN}Testing {len(proxies)} proxies with {max_workers} threads...")
+        self.funnel = None
+        working_before = len(self.working_proxies)
+        if prefilter:
+            proxies = self.run_prefilter(proxies)
+            print(f"{Fore.CYAN}Stage 2: full HTTP/anonymity test on survivors")
+        
+        total = len(proxies) if hasattr(proxies, '__len__') else None
+        print(f"{Fore.CYAN}Testing {total if total is not None else 'streamed'} proxies with {max_workers} threads...")
         print(f"{Fore.YELLOW}Real-time results:")
         print(f"{Fore.CYAN}{'='*80}")
         
-        working_count = 0
-        failed_count = 0
+        counters = {'working': 0, 'failed': 0}
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all proxy tests
-            future_to_proxy = {
-                executor.submit(self.test_proxy, proxy): proxy 
-                for proxy in proxies
-            }
+            # Keep a bounded number of tests in flight so streamed lists never pile up in memory
+            in_flight = set()
+            for proxy in proxies:
+                in_flight.add(executor.submit(self.test_proxy, proxy))
+                if len(in_flight) >= max_workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record_result(future.result(), counters, total)
             
-            # Process results as they complete
-            for future in as_completed(future_to_proxy):
-                result = future.result()
-                self.tested_proxies.append(result)
-                
-                if result['status'] == 'working':
-                    self.working_proxies.append(result)
-                    working_count += 1
-                else:
-                    failed_count += 1
-                
-                # Show progress
-                total_tested = working_count + failed_count
-                progress = (total_tested / len(proxies)) * 100
-                
-                with print_lock:
-                    if result['status'] != 'working':  # Only show failed in quiet mode
-                        if failed_count % 10 == 0:  # Show every 10th failure
-                            print(f"{Fore.RED}[✗] Failed: {failed_count}, Working: {working_count} "
-                                  f"({progress:.1f}% complete)")
+            # Process the remaining results as they complete
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._record_result(future.result(), counters, total)
         
+        self._finish_funnel(working_before)
+        self._flush_store()
         return self.working_proxies
     
+    def check_proxies_async(self, proxies, concurrency=500, timeout=10, prefilter=False):
+        """Check proxies on a single asyncio event loop with native CONNECT/SOCKS handshakes"""
+        from async_proxy_checker import AsyncProxyChecker
+        
+        self.funnel = None
+        working_before = len(self.working_proxies)
+        if prefilter:
+            proxies = self.run_prefilter(proxies)
+            print(f"{Fore.CYAN}Stage 2: full HTTP/anonymity test on survivors")
+        
+        total = len(proxies) if hasattr(proxies, '__len__') else None
+        print(f"{Fore.CYAN}Testing {total if total is not None else 'streamed'} proxies with up to "
+              f"{concurrency} concurrent checks (async)...")
+        print(f"{Fore.YELLOW}Real-time results:")
+        print(f"{Fore.CYAN}{'='*80}")
+        
+        counters = {'working': 0, 'failed': 0}
+        async_checker = AsyncProxyChecker(self.test_url, timeout=timeout, concurrency=concurrency,
+                                          real_ip=self.real_ip)
+        async_checker.check_all(proxies, on_result=lambda result: self._record_result(result, counters, total))
+        
+        self._finish_funnel(working_before)
+        self._flush_store()
+        return self.working_proxies
+    
+    def _flush_store(self):
+        """Persist buffered results to the proxy store in one transaction"""
+        results, self.store_buffer = self.store_buffer, []
+        if not self.store or not results:
+            return
+        try:
+            self.store.record_results(results)
+        except Exception as e:
+            print(f"{Fore.YELLOW}Warning: Could not update proxy store: {e}")
+    
+    def load_from_store(self, limit=None):
+        """Serve ranked proxies from the store instantly, without re-testing"""
+        ranked = self.store.get_ranked_results(limit)
+        self.working_proxies = ranked
+        self.tested_count = len(ranked)
+        self.failed_count = 0
+        self.failure_reasons = {}
+        self.funnel = None
+        return ranked
+    
+    def _count_result(self, result):
+        """Keep a working result; a failed one only adds to the counters (memory stays bounded)"""
+        self.tested_count += 1
+        if result['status'] == 'working':
+            self.working_proxies.append(result)
+        else:
+            self.failed_count += 1
+            reason = str(result.get('error') or 'Unknown')[:80]
+            if reason not in self.failure_reasons and len(self.failure_reasons) >= MAX_FAILURE_REASONS:
+                reason = 'Other'
+            self.failure_reasons[reason] = self.failure_reasons.get(reason, 0) + 1
+        
+        if self.store:
+            self.store_buffer.append(result)
+            if len(self.store_buffer) >= STORE_BATCH_SIZE:
+                self._flush_store()
+    
+    def _record_result(self, result, counters, total):
+        """Count a test result and show progress"""
+        self._count_result(result)
+        
+        if result['status'] == 'working':
+            counters['working'] += 1
+        else:
+            counters['failed'] += 1
+        
+        # Show progress (streamed lists have no known total)
+        total_tested = counters['working'] + counters['failed']
+        progress = f"{(total_tested / total) * 100:.1f}% complete" if total else f"{total_tested} tested"
+        
+        with print_lock:
+            if result['status'] != 'working':  # Only show failed in quiet mode
+                if counters['failed'] % 10 == 0:  # Show every 10th failure
+                    print(f"{Fore.RED}[✗] Failed: {counters['failed']}, Working: {counters['working']} "
+                          f"({progress})")
+    
     def save_working_proxies(self, filename, proxy_type_filter=None, anonymity_filter=None):
         """Save working proxies to file with optional filters"""
         try:
@@ -282,9 +413,9 @@ class ProxyChecker:
             with open(filename, 'w') as f:
                 f.write("# Pengu Proxy Checker - Detailed Report\n")
                 f.write(f"# Generated: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"# Total Tested: {len(self.tested_proxies)}\n")
+                f.write(f"# Total Tested: {self.tested_count}\n")
                 f.write(f"# Working: {len(self.working_proxies)}\n")
-                f.write(f"# Failed: {len(self.tested_proxies) - len(self.working_proxies)}\n\n")
+                f.write(f"# Failed: {self.failed_count}\n\n")
                 
                 # Working proxies section
                 f.write("=== WORKING PROXIES ===\n")
@@ -298,16 +429,10 @@ class ProxyChecker:
                     f.write(f"Original Line: {proxy['original']}\n")
                     f.write("-" * 40 + "\n")
                 
-                # Failed proxies section
-                f.write("\n=== FAILED PROXIES ===\n")
-                failed_proxies = [p for p in self.tested_proxies if p['status'] == 'failed']
-                for result in failed_proxies:
-                    proxy = result['proxy']
-                    f.write(f"IP: {proxy['ip']}:{proxy['port']}\n")
-                    f.write(f"Type: {proxy['type'].upper()}\n")
-                    f.write(f"Error: {result['error']}\n")
-                    f.write(f"Original Line: {proxy['original']}\n")
-                    f.write("-" * 40 + "\n")
+                # Failed proxies are only counted - per-proxy history lives in the proxy store
+                f.write("\n=== FAILURE REASONS ===\n")
+                for reason, count in sorted(self.failure_reasons.items(), key=lambda item: -item[1]):
+                    f.write(f"{count:>8}  {reason}\n")
             
             print(f"{Fore.GREEN}Detailed report saved to {filename}")
             
@@ -316,9 +441,9 @@ class ProxyChecker:
     
     def show_summary(self):
         """Show summary of proxy check results"""
-        total = len(self.tested_proxies)
+        total = self.tested_count
         working = len(self.working_proxies)
-        failed = total - working
+        failed = self.failed_count
         
         print(f"""
 {Fore.GREEN}╔══════════════════════════════════════════════════╗
@@ -327,8 +452,11 @@ class ProxyChecker:
 
 {Fore.CYAN}Total Tested:    {Fore.WHITE}{total}
 {Fore.GREEN}Working:         {Fore.WHITE}{working} ({(working/total*100 if total > 0 else 0):.1f}%)
-{Fore.RED}Failed:          {Fore.WHITE}{failed} ({(failed/total*100 if total > 0 else 0):.1f}%)
-
+{Fore.RED}Failed:          {Fore.WHITE}{failed} ({(failed/total*100 if total > 0 else 0):.1f}%)""")
+        
+        self.show_funnel()
+        
+        print(f"""
 {Fore.YELLOW}╔══════════════════════════════════════════════════╗
 {Fore.YELLOW}║               {Fore.CYAN}WORKING PROXIES BY TYPE{Fore.YELLOW}            ║
 {Fore.YELLOW}╚══════════════════════════════════════════════════╝
@@ -358,13 +486,92 @@ class ProxyChecker:
         for anonymity, count in anonymity_counts.items():
             print(f"{Fore.CYAN}{anonymity}:         {Fore.WHITE}{count}")
 
+def results_menu(checker):
+    """Ask what to do with the results, returns False to leave the checker"""
+    # Ask user what to do with results
+    while True:
+        print(f"""
+{Fore.CYAN}What would you like to do with the results?
+{Fore.GREEN}1. {Fore.WHITE}Save working proxies to file
+{Fore.GREEN}2. {Fore.WHITE}Save filtered proxies (by type/anonymity)
+{Fore.GREEN}3. {Fore.WHITE}Generate detailed report
+{Fore.GREEN}4. {Fore.WHITE}Check more proxies
+{Fore.GREEN}5. {Fore.WHITE}Return to main menu
+""")
+        
+        choice = input(f"{Fore.YELLOW}Select option (1-5): ").strip()
+        
+        if choice == '1':
+            filename = input(f"{Fore.CYAN}Enter filename (default: working_proxies.txt): ").strip()
+            if not filename:
+                filename = "working_proxies.txt"
+            checker.save_working_proxies(filename)
+            
+        elif choice == '2':
+            filename = input(f"{Fore.CYAN}Enter filename (default: filtered_proxies.txt): ").strip()
+            if not filename:
+                filename = "filtered_proxies.txt"
+            
+            type_filter = input(f"{Fore.CYAN}Filter by type (http/https/socks4/socks5, or Enter for all): ").strip()
+            if not type_filter:
+                type_filter = None
+            
+            anonymity_filter = input(f"{Fore.CYAN}Filter by anonymity (elite/anonymous/transparent, or Enter for all): ").strip()
+            if not anonymity_filter:
+                anonymity_filter = None
+            
+            checker.save_working_proxies(filename, type_filter, anonymity_filter)
+            
+        elif choice == '3':
+            filename = input(f"{Fore.CYAN}Enter filename (default: proxy_report.txt): ").strip()
+            if not filename:
+                filename = "proxy_report.txt"
+            checker.generate_detailed_report(filename)
+            
+        elif choice == '4':
+            return True  # Go back to main loop
+            
+        elif choice == '5':
+            return False
+            
+        else:
+            print(f"{Fore.RED}Invalid option. Please select 1-5.")
+
 def main():
     """Main proxy checker function"""
     checker = ProxyChecker()
     checker.print_banner()
     
+    try:
+        from proxy_store import ProxyStore
+        checker.store = ProxyStore()
+    except Exception as e:
+        print(f"{Fore.YELLOW}Warning: Proxy store unavailable, results will not be remembered: {e}")
+    
     while True:
         try:
+            # Start from the proxy store when earlier sessions left history
+            store_stats = checker.store.get_stats() if checker.store else None
+            if store_stats and store_stats['total']:
+                print(f"""
+{Fore.CYAN}Proxy store: {store_stats['total']} known proxies, {store_stats['alive']} alive at last check
+{Fore.GREEN}1. {Fore.WHITE}Check a proxy file
+{Fore.GREEN}2. {Fore.WHITE}Use ranked proxies from the store now (no re-testing)
+{Fore.GREEN}3. {Fore.WHITE}Revalidate only stale/marginal stored proxies, then use ranked results
+""")
+                source_choice = input(f"{Fore.YELLOW}Select option (1-3, default 1): ").strip()
+                
+                if source_choice in ['2', '3']:
+                    if source_choice == '3':
+                        from proxy_store import RevalidationScheduler
+                        RevalidationScheduler(checker.store, checker).run_once()
+                    
+                    checker.load_from_store()
+                    checker.show_summary()
+                    if not results_menu(checker):
+                        return
+                    continue
+            
             # Get proxy file path
             default_file = "proxies.txt"
             file_path = input(f"{Fore.YELLOW}Enter proxy file path (default: {default_file}): ").strip()
@@ -376,81 +583,80 @@ def main():
                 print(f"{Fore.RED}File '{file_path}' not found.")
                 continue
             
-            # Parse proxies
-            print(f"{Fore.CYAN}Loading proxies from {file_path}...")
-            proxies = checker.parse_proxy_file(file_path)
+            # Proxies are streamed from the file while testing, so big lists start immediately
+            proxies = checker.stream_proxy_file(file_path)
+            print(f"{Fore.GREEN}Streaming proxies from {file_path} ({os.path.getsize(file_path) / 1024:.0f} KB)")
             
-            if not proxies:
-                print(f"{Fore.RED}No valid proxies found in file.")
-                continue
+            # Choose judge
+            print(f"""
+{Fore.CYAN}Judge (anonymity test endpoint):
+{Fore.GREEN}1. {Fore.WHITE}httpbin.org (origin only)
+{Fore.GREEN}2. {Fore.WHITE}Bundled local judge server (echoes all forwarding headers)
+{Fore.GREEN}3. {Fore.WHITE}Custom judge URL
+""")
+            judge_choice = input(f"{Fore.YELLOW}Select judge (1-3, default 1): ").strip()
+            judge = None
+            if judge_choice == '2':
+                from judge_server import JudgeServer
+                
+                public_url = input(f"{Fore.CYAN}Public judge URL if port-forwarded (Enter for LAN address): ").strip()
+                try:
+                    judge_port = int(input(f"{Fore.CYAN}Judge port (default: 8899): ").strip() or 8899)
+                except ValueError:
+                    judge_port = 8899
+                judge = JudgeServer('0.0.0.0', judge_port, public_url=public_url or None)
+                checker.use_judge(judge.start())
+            elif judge_choice == '3':
+                custom_url = input(f"{Fore.CYAN}Enter judge URL: ").strip()
+                checker.use_judge(custom_url or DEFAULT_JUDGE_URL)
             
-            print(f"{Fore.GREEN}Loaded {len(proxies)} proxies.")
+            # Choose checking engine
+            print(f"""
+{Fore.CYAN}Checking engine:
+{Fore.GREEN}1. {Fore.WHITE}Threaded (requests, one session per proxy)
+{Fore.GREEN}2. {Fore.WHITE}Async (native CONNECT/SOCKS, thousands of concurrent checks)
+""")
+            engine_choice = input(f"{Fore.YELLOW}Select engine (1-2, default 1): ").strip()
             
-            # Get thread count
-            try:
-                thread_input = input(f"{Fore.CYAN}Enter number of threads (default: 50): ").strip()
-                if thread_input:
-                    max_workers = int(thread_input)
-                else:
+            # Two-stage validation: cheap reachability check before the full test
+            prefilter_choice = input(f"{Fore.YELLOW}Run fast TCP reachability prefilter first? (Y/n): ").strip().lower()
+            use_prefilter = prefilter_choice not in ['n', 'no']
+            
+            if engine_choice == '2':
+                try:
+                    concurrency_input = input(f"{Fore.CYAN}Enter max concurrent checks (default: 500): ").strip()
+                    concurrency = int(concurrency_input) if concurrency_input else 500
+                except ValueError:
+                    concurrency = 500
+                    print(f"{Fore.YELLOW}Using default: 500 concurrent checks")
+                
+                working_proxies = checker.check_proxies_async(proxies, concurrency, prefilter=use_prefilter)
+            else:
+                # Get thread count
+                try:
+                    thread_input = input(f"{Fore.CYAN}Enter number of threads (default: 50): ").strip()
+                    if thread_input:
+                        max_workers = int(thread_input)
+                    else:
+                        max_workers = 50
+                except ValueError:
                     max_workers = 50
-            except ValueError:
-                max_workers = 50
-                print(f"{Fore.YELLOW}Using default: 50 threads")
+                    print(f"{Fore.YELLOW}Using default: 50 threads")
+                
+                # Check proxies
+                working_proxies = checker.check_proxies(proxies, max_workers, prefilter=use_prefilter)
+            
+            if judge:
+                judge.stop()
             
-            # Check proxies
-            working_proxies = checker.check_proxies(proxies, max_workers)
+            print(f"{Fore.CYAN}Read {checker.parse_reader.stats['valid']} unique proxies from {file_path}")
+            checker.show_parse_stats()
             
             # Show summary
             checker.show_summary()
             
-            # Ask user what to do with results
-            while True:
-                print(f"""
-{Fore.CYAN}What would you like to do with the results?
-{Fore.GREEN}1. {Fore.WHITE}Save working proxies to file
-{Fore.GREEN}2. {Fore.WHITE}Save filtered proxies (by type/anonymity)
-{Fore.GREEN}3. {Fore.WHITE}Generate detailed report
-{Fore.GREEN}4. {Fore.WHITE}Check more proxies
-{Fore.GREEN}5. {Fore.WHITE}Return to main menu
-""")
-                
-                choice = input(f"{Fore.YELLOW}Select option (1-5): ").strip()
-                
-                if choice == '1':
-                    filename = input(f"{Fore.CYAN}Enter filename (default: working_proxies.txt): ").strip()
-                    if not filename:
-                        filename = "working_proxies.txt"
-                    checker.save_working_proxies(filename)
-                    
-                elif choice == '2':
-                    filename = input(f"{Fore.CYAN}Enter filename (default: filtered_proxies.txt): ").strip()
-                    if not filename:
-                        filename = "filtered_proxies.txt"
-                    
-                    type_filter = input(f"{Fore.CYAN}Filter by type (http/https/socks4/socks5, or Enter for all): ").strip()
-                    if not type_filter:
-                        type_filter = None
-                    
-                    anonymity_filter = input(f"{Fore.CYAN}Filter by anonymity (elite/anonymous/transparent, or Enter for all): ").strip()
-                    if not anonymity_filter:
-                        anonymity_filter = None
-                    
-                    checker.save_working_proxies(filename, type_filter, anonymity_filter)
-                    
-                elif choice == '3':
-                    filename = input(f"{Fore.CYAN}Enter filename (default: proxy_report.txt): ").strip()
-                    if not filename:
-                        filename = "proxy_report.txt"
-                    checker.generate_detailed_report(filename)
-                    
-                elif choice == '4':
-                    break  # Go back to main loop
-                    
-                elif choice == '5':
-                    return
-                    
-                else:
-                    print(f"{Fore.RED}Invalid option. Please select 1-5.")
+            if not results_menu(checker):
+                return
             
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Proxy checking interrupted.")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pengu Proxy Parser Module - Shared streaming proxy list parser
+Normalizes and deduplicates proxy lines on the fly so huge lists never have to be held in memory
+"""
+
+import hashlib
+
+# Proxy types understood by the checkers (anything else is counted as invalid)
+PROXY_TYPES = {'http', 'https', 'socks4', 'socks4a', 'socks5', 'socks5h'}
+
+# Number of invalid lines kept as examples for the summary
+INVALID_SAMPLES = 5
+
+def parse_proxy_line(line, default_type='http'):
+    """Parse one proxy line into a normalized proxy_info dict, or None if it is invalid.
+
+    Supported formats:
+        IP:PORT
+        IP:PORT:USER:PASS
+        TYPE://IP:PORT
+        TYPE://USER:PASS@IP:PORT
+    Trailing comments ("IP:PORT # 120ms - Elite", as written by the checker) are ignored.
+    """
+    if ' #' in line:
+        line = line.split(' #', 1)[0]
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        if '://' in line:
+            proxy_type, rest = line.split('://', 1)
+            proxy_type = proxy_type.lower()
+
+            if '@' in rest:
+                auth_part, addr_part = rest.rsplit('@', 1)
+                if ':' in auth_part:
+                    username, password = auth_part.split(':', 1)
+                else:
+                    username, password = auth_part, ""
+            else:
+                addr_part = rest
+                username, password = None, None
+
+            if ':' not in addr_part:
+                return None
+            ip, port = addr_part.rsplit(':', 1)
+        else:
+            parts = line.split(':', 3)  # The password may contain ':' itself
+            if len(parts) == 2:
+                ip, port = parts
+                username, password = None, None
+            elif len(parts) == 4:
+                ip, port, username, password = parts
+            else:
+                return None
+            proxy_type = default_type
+
+        ip = ip.strip().strip('[]').lower()
+        port = int(port.strip().rstrip('/'))
+        if not ip or not 0 < port < 65536 or proxy_type not in PROXY_TYPES:
+            return None
+
+        return {
+            'ip': ip,
+            'port': port,
+            'type': proxy_type,
+            'username': username or None,
+            'password': password if username else None,
+            'original': line
+        }
+    except ValueError:
+        return None
+
+def proxy_fingerprint(proxy_info):
+    """Compact 64-bit identity of a proxy (type, address and credentials) for deduplication"""
+    identity = (f"{proxy_info['type']}|{proxy_info['ip']}|{proxy_info['port']}|"
+                f"{proxy_info['username'] or ''}|{proxy_info['password'] or ''}").encode('utf-8', 'surrogateescape')
+    return int.from_bytes(hashlib.blake2b(identity, digest_size=8).digest(), 'little')
+
+class ProxyListReader:
+    """Streams a proxy file as normalized, deduplicated proxy_info dicts.
+
+    Iterating reads the file lazily; counters are updated as lines are consumed,
+    so they are final once iteration finishes.
+    """
+    def __init__(self, file_path, default_type='http', dedupe=True):
+        self.file_path = file_path
+        self.default_type = default_type
+        self.dedupe = dedupe
+        self.seen = set()
+        self.stats = {
+            'lines': 0,
+            'valid': 0,
+            'invalid': 0,
+            'duplicates': 0,
+            'invalid_samples': []
+        }
+
+    def __iter__(self):
+        stats = self.stats
+        with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                stats['lines'] += 1
+                stripped = line.strip()
+                if not stripped or stripped.startswith('#'):
+                    continue
+
+                proxy_info = parse_proxy_line(stripped, self.default_type)
+                if proxy_info is None:
+                    stats['invalid'] += 1
+                    if len(stats['invalid_samples']) < INVALID_SAMPLES:
+                        stats['invalid_samples'].append((stats['lines'], stripped[:80]))
+                    continue
+
+                if self.dedupe:
+                    fingerprint = proxy_fingerprint(proxy_info)
+                    if fingerprint in self.seen:
+                        stats['duplicates'] += 1
+                        continue
+                    self.seen.add(fingerprint)
+
+                stats['valid'] += 1
+                yield proxy_info
+
+def iter_proxy_file(file_path, default_type='http', dedupe=True):
+    """Convenience wrapper returning a streaming ProxyListReader"""
+    return ProxyListReader(file_path, default_type, dedupe)
+
+def to_manager_proxy(proxy_info):
+    """Convert a proxy_info dict to the ProxyManager schema"""
+    return {
+        'protocol': proxy_info['type'],
+        'host': proxy_info['ip'],
+        'port': proxy_info['port'],
+        'username': proxy_info['username'],
+        'password': proxy_info['password'],
+        'raw': proxy_info['original']
+    }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Pengu Proxy Selector Module - Latency and health weighted proxy selection
+Power-of-two-choices over EWMA scores with circuit-breaker ejection and half-open retries
+"""
+
+import time
+import heapq
+import random
+import threading
+
+# Circuit breaker states
+CLOSED = 'closed'        # In rotation
+OPEN = 'open'            # Ejected until its cooldown expires
+HALF_OPEN = 'half_open'  # Cooldown expired, one trial request allowed
+
+DEFAULT_LATENCY = 1000.0  # Assumed latency (ms) for proxies without samples so they still get tried
+
+def default_proxy_key(proxy):
+    """Identity of a proxy dict (ProxyManager or ProxyChecker schema)"""
+    return (proxy.get('protocol') or proxy.get('type'), proxy.get('host') or proxy.get('ip'), proxy.get('port'))
+
+class ProxySelector:
+    """Thread-safe proxy picker; selection and health updates are O(1) (ejection uses a cooldown heap)"""
+    def __init__(self, alpha=0.3, failure_threshold=3, cooldown=30.0, max_cooldown=600.0,
+                 key_func=default_proxy_key, seed=None):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.key_func = key_func
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self, proxies=None):
+        """Replace the pool"""
+        with self.lock:
+            self.entries = {}     # key -> entry dict
+            self.active = []      # keys in rotation, entry['index'] is the position here
+            self.half_open = {}   # keys waiting for a trial request (insertion-ordered dict as a set)
+            self.trials = {}      # half-open keys with a trial in flight, oldest trial first
+            self.cooling = []     # heap of (reopen_at, key) for ejected proxies
+        for proxy in proxies or []:
+            self.add(proxy)
+
+    def add(self, proxy, latency_ms=None, success_rate=1.0):
+        """Add a proxy to the rotation (optionally seeded with known latency/success)"""
+        key = self.key_func(proxy)
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = {
+                'proxy': proxy,
+                'state': CLOSED,
+                'index': None,
+                'ewma_latency': latency_ms,
+                'ewma_success': success_rate,
+                'consecutive_failures': 0,
+                'cooldown': self.cooldown,
+                'reopen_at': 0.0,
+                'trial_started': None,
+                'successes': 0,
+                'failures': 0
+            }
+            self._activate(key)
+
+    def remove(self, proxy):
+        """Drop a proxy from the pool entirely"""
+        key = self.key_func(proxy)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                return
+            if entry['index'] is not None:
+                self._deactivate(key, entry)
+            elif entry['state'] == HALF_OPEN:
+                self._leave_half_open(key)
+            # Stale keys left in the cooling heap are skipped when popped
+
+    def _activate(self, key):
+        entry = self.entries[key]
+        entry['index'] = len(self.active)
+        self.active.append(key)
+
+    def _deactivate(self, key, entry):
+        """Swap-remove from the active list in O(1)"""
+        index = entry['index']
+        last_key = self.active.pop()
+        if last_key != key:
+            self.active[index] = last_key
+            self.entries[last_key]['index'] = index
+        entry['index'] = None
+
+    def _leave_half_open(self, key):
+        self.half_open.pop(key, None)
+        self.trials.pop(key, None)
+
+    def _score(self, entry):
+        """Expected cost of using a proxy - lower is better"""
+        latency = entry['ewma_latency'] if entry['ewma_latency'] is not None else DEFAULT_LATENCY
+        return latency / max(entry['ewma_success'], 0.05)
+
+    def _release_cooled(self, now):
+        """Move ejected proxies whose cooldown expired to half-open"""
+        while self.cooling and self.cooling[0][0] <= now:
+            reopen_at, key = heapq.heappop(self.cooling)
+            entry = self.entries.get(key)
+            if entry is None or entry['state'] != OPEN or entry['reopen_at'] != reopen_at:
+                continue  # Removed, closed early or re-ejected since this was queued
+            entry['state'] = HALF_OPEN
+            entry['trial_started'] = None
+            self.half_open[key] = None
+
+    def select(self):
+        """Pick a proxy, returns None when nothing is available"""
+        now = time.monotonic()
+        with self.lock:
+            self._release_cooled(now)
+
+            # Half-open proxies get a single trial request (retried if the trial never reports back)
+            key = next(iter(self.half_open), None)
+            if key is not None:
+                del self.half_open[key]
+            else:
+                key = next(iter(self.trials), None)  # Oldest trial in flight, the first to give up on
+                if key is not None and now - self.entries[key]['trial_started'] > self.entries[key]['cooldown']:
+                    del self.trials[key]
+                else:
+                    key = None
+            if key is not None:
+                entry = self.entries[key]
+                entry['trial_started'] = now
+                self.trials[key] = None
+                return entry['proxy']
+
+            count = len(self.active)
+            if count == 0:
+                return None
+            if count == 1:
+                return self.entries[self.active[0]]['proxy']
+
+            # Power of two choices: sample two, keep the cheaper one
+            first, second = self.random.sample(range(count), 2)
+            a = self.entries[self.active[first]]
+            b = self.entries[self.active[second]]
+            return (a if self._score(a) <= self._score(b) else b)['proxy']
+
+    def record_success(self, proxy, latency_ms=None):
+        """Report a successful request through a proxy"""
+        key = self.key_func(proxy)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['ewma_success'] = self.alpha + (1 - self.alpha) * entry['ewma_success']
+            if latency_ms is not None:
+                if entry['ewma_latency'] is None:
+                    entry['ewma_latency'] = latency_ms
+                else:
+                    entry['ewma_latency'] = self.alpha * latency_ms + (1 - self.alpha) * entry['ewma_latency']
+
+            if entry['state'] != CLOSED:
+                # Trial passed (or a late success while open) - close the breaker
+                if entry['state'] == HALF_OPEN:
+                    self._leave_half_open(key)
+                entry['state'] = CLOSED
+                entry['cooldown'] = self.cooldown
+                entry['trial_started'] = None
+                self._activate(key)
+
+    def record_failure(self, proxy):
+        """Report a failed request; ejects the proxy once it trips the breaker"""
+        key = self.key_func(proxy)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['ewma_success'] = (1 - self.alpha) * entry['ewma_success']
+
+            if entry['state'] == HALF_OPEN:
+                # Failed trial - back to open with exponential backoff
+                self._leave_half_open(key)
+                entry['cooldown'] = min(entry['cooldown'] * 2, self.max_cooldown)
+                self._open(key, entry)
+                return True
+
+            if entry['state'] == CLOSED and entry['consecutive_failures'] >= self.failure_threshold:
+                self._deactivate(key, entry)
+                self._open(key, entry)
+                return True
+            return False
+
+    def _open(self, key, entry):
+        entry['state'] = OPEN
+        entry['trial_started'] = None
+        entry['reopen_at'] = time.monotonic() + entry['cooldown']
+        heapq.heappush(self.cooling, (entry['reopen_at'], key))
+
+    def available_proxies(self):
+        """Proxies currently in rotation"""
+        with self.lock:
+            return [self.entries[key]['proxy'] for key in self.active]
+
+    def ejected_proxies(self):
+        """Proxies currently ejected or waiting for a trial"""
+        with self.lock:
+            return [entry['proxy'] for entry in self.entries.values() if entry['state'] != CLOSED]
+
+    def ranked(self, limit=None):
+        """Active proxies with their health, best first"""
+        with self.lock:
+            ranked = [dict(self.entries[key], score=self._score(self.entries[key])) for key in self.active]
+        ranked.sort(key=lambda e: e['score'])
+        return ranked[:limit] if limit else ranked
+
+    def get_stats(self):
+        """Pool counters"""
+        with self.lock:
+            return {
+                'total': len(self.entries),
+                'active': len(self.active),
+                'half_open': len(self.half_open) + len(self.trials),
+                'ejected': len(self.entries) - len(self.active) - len(self.half_open) - len(self.trials)
+            }
+
+    def __len__(self):
+        with self.lock:
+            return len(self.active)
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Pengu Proxy Store Module - Persistent proxy database with scoring and incremental revalidation
+Keeps per-proxy history in SQLite so sessions start from ranked results instead of re-testing everything
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.3
+
+# Revalidation policy defaults (seconds / ratios)
+STALE_AFTER = 6 * 3600        # Healthy proxies are rechecked after this long
+MARGINAL_AFTER = 30 * 60      # Marginal proxies are rechecked sooner
+MARGINAL_RATIO = 0.7          # Success ratio below this counts as marginal
+MAX_CONSECUTIVE_FAILURES = 5  # Proxies failing this often in a row are retired
+
+ANONYMITY_COLORS = {
+    'Elite': Fore.GREEN,
+    'Anonymous': Fore.YELLOW,
+    'Transparent': Fore.RED
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS proxies (
+    key TEXT PRIMARY KEY,
+    ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    username TEXT,
+    password TEXT,
+    original TEXT,
+    first_seen REAL NOT NULL,
+    last_checked REAL,
+    last_alive REAL,
+    checks INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+    ewma_latency REAL,
+    last_latency REAL,
+    anonymity TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_proxies_last_checked ON proxies(last_checked);
+"""
+
+def default_db_path():
+    """Database location inside pengu_output"""
+    try:
+        from pengu import get_output_path
+        return get_output_path("", "proxy_store.db")
+    except Exception:
+        return "proxy_store.db"
+
+def proxy_key(proxy_type, ip, port):
+    """Stable identity of a proxy endpoint"""
+    return f"{proxy_type.lower()}://{ip}:{port}"
+
+def score_entry(entry):
+    """Rank score: smoothed success ratio discounted by EWMA latency (higher is better)"""
+    # Laplace smoothing keeps a single lucky check from outranking a long good record
+    ratio = (entry['successes'] + 1) / (entry['checks'] + 2)
+    latency = entry['ewma_latency'] or 5000.0
+    return ratio / (1.0 + latency / 1000.0)
+
+class ProxyStore:
+    """SQLite-backed proxy history shared by the checker and the proxy manager"""
+    def __init__(self, db_path=None, alpha=EWMA_ALPHA):
+        self.db_path = db_path or default_db_path()
+        self.alpha = alpha
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection guarded by a lock - the checker and the revalidation thread share it
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+    def _update(self, now, ip, port, proxy_type, alive, latency_ms=None, anonymity=None, error=None,
+                username=None, password=None, original=None):
+        """Apply one check outcome (caller holds the lock and commits)"""
+        key = proxy_key(proxy_type, ip, port)
+        row = self.conn.execute("SELECT ewma_latency FROM proxies WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO proxies (key, ip, port, type, username, password, original, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, ip, int(port), proxy_type.lower(), username, password, original or key, now))
+            ewma = None
+        else:
+            ewma = row['ewma_latency']
+
+        if alive:
+            if latency_ms is not None:
+                ewma = latency_ms if ewma is None else self.alpha * latency_ms + (1 - self.alpha) * ewma
+            self.conn.execute(
+                "UPDATE proxies SET last_checked = ?, last_alive = ?, checks = checks + 1, "
+                "successes = successes + 1, consecutive_failures = 0, ewma_latency = ?, last_latency = ?, "
+                "anonymity = COALESCE(?, anonymity), last_error = NULL WHERE key = ?",
+                (now, now, ewma, latency_ms, anonymity, key))
+        else:
+            self.conn.execute(
+                "UPDATE proxies SET last_checked = ?, checks = checks + 1, "
+                "consecutive_failures = consecutive_failures + 1, last_error = ? WHERE key = ?",
+                (now, error, key))
+
+    def record_check(self, ip, port, proxy_type, alive, latency_ms=None, anonymity=None, error=None,
+                     username=None, password=None, original=None):
+        """Record a single check outcome"""
+        with self.lock:
+            self._update(time.time(), ip, port, proxy_type, alive, latency_ms, anonymity, error,
+                         username, password, original)
+            self.conn.commit()
+
+    def record_results(self, results):
+        """Record a batch of ProxyChecker result dicts in one transaction"""
+        now = time.time()
+        with self.lock:
+            for result in results:
+                proxy = result['proxy']
+                self._update(now, proxy['ip'], proxy['port'], proxy['type'], result['status'] == 'working',
+                             result.get('connection_time'), result.get('anonymity'), result.get('error'),
+                             proxy.get('username'), proxy.get('password'), proxy.get('original'))
+            self.conn.commit()
+
+    def get_entries(self, include_retired=False):
+        """All stored proxies as dicts"""
+        query = "SELECT * FROM proxies"
+        params = ()
+        if not include_retired:
+            query += " WHERE consecutive_failures < ?"
+            params = (MAX_CONSECUTIVE_FAILURES,)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def get_ranked(self, limit=None, alive_only=True, anonymity=None, proxy_type=None):
+        """Stored proxies ordered by score, best first"""
+        entries = self.get_entries()
+        if alive_only:
+            entries = [e for e in entries if e['last_alive'] and e['consecutive_failures'] == 0]
+        if anonymity:
+            entries = [e for e in entries if (e['anonymity'] or '').lower() == anonymity.lower()]
+        if proxy_type:
+            entries = [e for e in entries if e['type'] == proxy_type.lower()]
+
+        for entry in entries:
+            entry['score'] = score_entry(entry)
+            entry['success_ratio'] = entry['successes'] / entry['checks'] if entry['checks'] else 0.0
+        entries.sort(key=lambda e: e['score'], reverse=True)
+        return entries[:limit] if limit else entries
+
+    def get_ranked_results(self, limit=None, **filters):
+        """Ranked proxies in ProxyChecker result dict form, ready to use without re-testing"""
+        results = []
+        for entry in self.get_ranked(limit, **filters):
+            results.append({
+                'proxy': entry_to_proxy_info(entry),
+                'status': 'working',
+                'connection_time': entry['ewma_latency'] or 0.0,
+                'anonymity': entry['anonymity'] or 'Unknown',
+                'anonymity_color': ANONYMITY_COLORS.get(entry['anonymity'], Fore.WHITE),
+                'response_ip': 'N/A',
+                'score': entry['score'],
+                'success_ratio': entry['success_ratio'],
+                'last_alive': entry['last_alive']
+            })
+        return results
+
+    def get_due_for_revalidation(self, stale_after=STALE_AFTER, marginal_after=MARGINAL_AFTER,
+                                 marginal_ratio=MARGINAL_RATIO, now=None):
+        """Proxies worth re-checking: never checked, stale, or marginal - retired ones are skipped"""
+        now = now or time.time()
+        due = []
+        for entry in self.get_entries():
+            if not entry['last_checked']:
+                due.append(entry)
+                continue
+
+            age = now - entry['last_checked']
+            ratio = entry['successes'] / entry['checks'] if entry['checks'] else 0.0
+            marginal = ratio < marginal_ratio or entry['consecutive_failures'] > 0
+
+            if age >= stale_after or (marginal and age >= marginal_after):
+                due.append(entry)
+        return due
+
+    def prune(self, max_failures=MAX_CONSECUTIVE_FAILURES):
+        """Delete retired proxies, returns the number removed"""
+        with self.lock:
+            cursor = self.conn.execute("DELETE FROM proxies WHERE consecutive_failures >= ?", (max_failures,))
+            self.conn.commit()
+            return cursor.rowcount
+
+    def get_stats(self):
+        """Summary counters for the store"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) AS total, "
+                "SUM(CASE WHEN last_alive IS NOT NULL AND consecutive_failures = 0 THEN 1 ELSE 0 END) AS alive, "
+                "SUM(CASE WHEN consecutive_failures >= ? THEN 1 ELSE 0 END) AS retired "
+                "FROM proxies", (MAX_CONSECUTIVE_FAILURES,)).fetchone()
+        return {
+            'total': row['total'] or 0,
+            'alive': row['alive'] or 0,
+            'retired': row['retired'] or 0
+        }
+
+def entry_to_proxy_info(entry):
+    """Convert a store row to the ProxyChecker proxy_info dict"""
+    return {
+        'ip': entry['ip'],
+        'port': entry['port'],
+        'type': entry['type'],
+        'username': entry['username'],
+        'password': entry['password'],
+        'original': entry['original']
+    }
+
+class RevalidationScheduler:
+    """Re-checks only stale or marginal proxies, once or periodically in the background"""
+    def __init__(self, store, checker=None, interval=600, stale_after=STALE_AFTER,
+                 marginal_after=MARGINAL_AFTER, engine='async', concurrency=200):
+        self.store = store
+        self.checker = checker
+        self.interval = interval
+        self.stale_after = stale_after
+        self.marginal_after = marginal_after
+        self.engine = engine
+        self.concurrency = concurrency
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def run_once(self):
+        """Revalidate everything currently due, returns the number of proxies checked"""
+        from proxy_checker import ProxyChecker
+
+        due = self.store.get_due_for_revalidation(self.stale_after, self.marginal_after)
+        if not due:
+            return 0
+
+        checker = ProxyChecker()
+        if self.checker:
+            checker.test_url = self.checker.test_url
+            checker.real_ip = self.checker.real_ip
+        checker.store = self.store
+
+        proxies = [entry_to_proxy_info(entry) for entry in due]
+        if self.engine == 'async':
+            checker.check_proxies_async(proxies, self.concurrency)
+        else:
+            checker.check_proxies(proxies, min(self.concurrency, 100))
+        return len(proxies)
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"{Fore.RED}Proxy revalidation error: {e}")
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Start periodic background revalidation"""
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+
+def show_ranked(store, limit=20):
+    """Print the best stored proxies"""
+    ranked = store.get_ranked(limit)
+    stats = store.get_stats()
+
+    print(f"""
+{Fore.GREEN}╔══════════════════════════════════════════════════╗
+{Fore.GREEN}║                {Fore.CYAN}PROXY STORE RANKING{Fore.GREEN}               ║
+{Fore.GREEN}╚══════════════════════════════════════════════════╝
+
+{Fore.CYAN}Stored: {Fore.WHITE}{stats['total']}  {Fore.GREEN}Alive: {Fore.WHITE}{stats['alive']}  {Fore.RED}Retired: {Fore.WHITE}{stats['retired']}
+""")
+    print(f"{Fore.CYAN}{'#':>3}  {'Proxy':<32} {'EWMA ms':>8} {'Success':>8} {'Checks':>6}  Anonymity")
+    for i, entry in enumerate(ranked, 1):
+        color = ANONYMITY_COLORS.get(entry['anonymity'], Fore.WHITE)
+        print(f"{Fore.WHITE}{i:>3}  {entry['key']:<32} {entry['ewma_latency'] or 0:>8.0f} "
+              f"{entry['success_ratio'] * 100:>7.0f}% {entry['checks']:>6}  {color}{entry['anonymity'] or 'Unknown'}")
+
+def main():
+    """Inspect and maintain the proxy store"""
+    store = ProxyStore()
+    print(f"{Fore.CYAN}Proxy store: {store.db_path}")
+
+    while True:
+        print(f"""
+{Fore.GREEN}1. {Fore.WHITE}Show ranked proxies
+{Fore.GREEN}2. {Fore.WHITE}Revalidate stale/marginal proxies now
+{Fore.GREEN}3. {Fore.WHITE}Prune retired proxies
+{Fore.GREEN}4. {Fore.WHITE}Return
+""")
+        choice = input(f"{Fore.YELLOW}Select option (1-4): ").strip()
+
+        if choice == '1':
+            show_ranked(store)
+        elif choice == '2':
+            checked = RevalidationScheduler(store).run_once()
+            print(f"{Fore.GREEN}Revalidated {checked} proxies")
+        elif choice == '3':
+            print(f"{Fore.GREEN}Removed {store.prune()} retired proxies")
+        elif choice == '4':
+            break
+        else:
+            print(f"{Fore.RED}Invalid option. Please select 1-4.")
+
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Pengu Reverse DNS Module - Background PTR lookups with a persistent cache
+Lookups run on a thread pool with a short timeout, so callers never wait on a slow resolver,
+and names are kept on disk so repeated traces do not resolve the same routers again
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+CACHE_TTL = 7 * 24 * 3600      # Router names rarely change
+NEGATIVE_TTL = 6 * 3600        # Addresses without a PTR record are retried sooner
+MAX_ENTRIES = 50000
+
+def default_cache_path():
+    """Cache location inside pengu_output"""
+    try:
+        from pengu import get_output_path
+        return get_output_path("", "rdns_cache.json")
+    except Exception:
+        return "rdns_cache.json"
+
+class ReverseDnsCache:
+    """Thread-pool PTR resolver backed by a JSON file of {address: [hostname or null, resolved_at]}"""
+    def __init__(self, path=None, timeout=1.0, workers=16, ttl=CACHE_TTL, negative_ttl=NEGATIVE_TTL):
+        self.path = path or default_cache_path()
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.pending = {}   # address -> Future
+        self.dirty = False
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rdns')
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = {address: (entry[0], entry[1]) for address, entry in data.items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            self.entries = {}
+
+    def save(self):
+        """Write fresh entries back to disk (atomically) if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            now = time.time()
+            fresh = {address: entry for address, entry in self.entries.items() if self._is_fresh(entry, now)}
+            if len(fresh) > MAX_ENTRIES:
+                newest = sorted(fresh.items(), key=lambda item: item[1][1], reverse=True)[:MAX_ENTRIES]
+                fresh = dict(newest)
+            self.entries = fresh
+            self.dirty = False
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump({address: list(entry) for address, entry in fresh.items()}, f)
+            os.replace(temporary, self.path)
+        except OSError:
+            pass  # The cache is an optimisation - never fail a trace over it
+
+    def _is_fresh(self, entry, now):
+        hostname, resolved_at = entry
+        return now - resolved_at < (self.ttl if hostname else self.negative_ttl)
+
+    def get(self, address):
+        """Cached hostname, or None when unknown, expired or without a PTR record"""
+        with self.lock:
+            entry = self.entries.get(address)
+        if entry and self._is_fresh(entry, time.time()):
+            return entry[0]
+        return None
+
+    def is_cached(self, address):
+        with self.lock:
+            entry = self.entries.get(address)
+        return bool(entry) and self._is_fresh(entry, time.time())
+
+    def _query(self, address):
+        """One PTR lookup; dnspython gives it a real deadline, the system resolver does not"""
+        try:
+            import dns.resolver
+            import dns.reversename
+            answer = dns.resolver.resolve(dns.reversename.from_address(address), 'PTR', lifetime=self.timeout)
+            return str(answer[0]).rstrip('.')
+        except ImportError:
+            return socket.gethostbyaddr(address)[0]
+
+    def _resolve(self, address):
+        hostname = None
+        cache = True
+        try:
+            hostname = self._query(address)
+        except (socket.herror, socket.gaierror):
+            pass  # No PTR record
+        except Exception as e:
+            # NXDOMAIN / no answer are real negatives; timeouts and resolver failures are not cached
+            cache = e.__class__.__name__ in ('NXDOMAIN', 'NoAnswer')
+        with self.lock:
+            if cache:
+                self.entries[address] = (hostname, time.time())
+                self.dirty = True
+            self.pending.pop(address, None)
+        return hostname
+
+    def lookup(self, address, callback=None):
+        """Non-blocking lookup. Returns the cached hostname right away when there is one;
+        otherwise resolves in the background and calls callback(address, hostname) when done."""
+        if not address:
+            return None
+        with self.lock:
+            entry = self.entries.get(address)
+            if entry and self._is_fresh(entry, time.time()):
+                return entry[0]
+            future = self.pending.get(address)
+            if future is None:
+                future = self.pending[address] = self.executor.submit(self._resolve, address)
+        if callback:
+            future.add_done_callback(lambda f: callback(address, f.result() if not f.exception() else None))
+        return None
+
+    def resolve(self, address, timeout=None):
+        """Blocking lookup that gives up after timeout seconds"""
+        hostname = self.lookup(address)
+        if hostname or self.is_cached(address):
+            return hostname
+        with self.lock:
+            future = self.pending.get(address)
+        if future is None:
+            return self.get(address)
+        try:
+            return future.result(timeout=timeout if timeout is not None else self.timeout + 0.5)
+        except Exception:
+            return None
+
+    def close(self):
+        self.save()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# Global cache instance
+rdns_cache = None
+rdns_cache_lock = threading.Lock()
+
+def get_rdns_cache():
+    """Get or create the global reverse DNS cache"""
+    global rdns_cache
+    with rdns_cache_lock:
+        if rdns_cache is None:
+            rdns_cache = ReverseDnsCache()
+        return rdns_cache
@@ -11,10 +11,13 @@ init(autoreset=True)
 # Thread-safe print lock
 print_lock = threading.Lock()
 
-def check_subdomain(subdomain):
+def check_subdomain(subdomain, resolver=None):
     """Check if a subdomain exists and return result"""
     try:
-        answers = dns.resolver.resolve(subdomain, 'A')
+        if resolver is not None:
+            answers = resolver.resolve(subdomain, 'A')
+        else:
+            answers = dns.resolver.resolve(subdomain, 'A')
         ips = [str(answer) for answer in answers]
         return subdomain, ips
     except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.Timeout):
@@ -22,8 +25,8 @@ def check_subdomain(subdomain):
     except Exception:
         return None, None
 
-def find_subdomains_threaded(domain, wordlist, max_workers=50):
-    """Find subdomains using efficient threading"""
+def find_subdomains_threaded(domain, wordlist, max_workers=50, resolver=None):
+    """Find subdomains using efficient threading (optionally via a custom resolver)"""
     found_subdomains = []
     
     # Generate subdomain candidates more efficiently
@@ -56,7 +59,7 @@ def find_subdomains_threaded(domain, wordlist, max_workers=50):
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # Submit all tasks
         future_to_subdomain = {
-            executor.submit(check_subdomain, subdomain): subdomain 
+            executor.submit(check_subdomain, subdomain, resolver): subdomain 
             for subdomain in subdomain_candidates
         }
         
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Pengu Subdomain Benchmark - Offline throughput benchmark for subdomain enumeration engines
+Runs each engine against the in-process DNS stub server and reports qps, latency and memory
+"""
+
+import os
+import time
+import threading
+import tracemalloc
+from contextlib import redirect_stdout
+import dns.resolver
+from colorama import init, Fore, Style
+
+import subdomain
+from dns_stub_server import DNSStubServer, SyntheticZone
+
+# Initialize colorama
+init(autoreset=True)
+
+class TimedResolver(dns.resolver.Resolver):
+    """Resolver that records the client-observed latency of every query"""
+    def __init__(self, base):
+        super().__init__(configure=False)
+        self.nameservers = base.nameservers
+        self.port = base.port
+        self.timeout = base.timeout
+        self.lifetime = base.lifetime
+        self.cache = None
+        self.latencies = []
+        self.failures = 0
+        self.record_lock = threading.Lock()
+
+    def resolve(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().resolve(*args, **kwargs)
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            raise
+        except Exception:
+            with self.record_lock:
+                self.failures += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.record_lock:
+                self.latencies.append(elapsed)
+
+def run_threaded_engine(domain, wordlist, resolver, workers):
+    """Current ThreadPoolExecutor path from subdomain.py"""
+    return subdomain.find_subdomains_threaded(domain, wordlist, workers, resolver=resolver)
+
+# Engines to compare - add new enumeration engines here with the same signature
+ENGINES = {
+    'threaded': run_threaded_engine,
+}
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def benchmark_engine(name, engine, zone, wordlist, workers=50, latency_ms=0.0, jitter_ms=0.0,
+                     loss_rate=0.0, trace_memory=True, seed=1):
+    """Run one engine against a fresh stub server and return its metrics"""
+    with DNSStubServer(zone, latency_ms=latency_ms, jitter_ms=jitter_ms,
+                       loss_rate=loss_rate, seed=seed) as server:
+        resolver = TimedResolver(server.make_resolver(timeout=1.0, lifetime=3.0))
+
+        if trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, redirect_stdout(devnull):
+            found = engine(zone.origin.to_text(omit_final_dot=True), wordlist, resolver, workers)
+        duration = time.perf_counter() - start
+
+        peak_memory = 0
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        server_stats = server.get_stats()
+
+    latencies = sorted(resolver.latencies)
+    queries = len(latencies)
+
+    return {
+        'engine': name,
+        'queries': queries,
+        'found': len(found),
+        'failures': resolver.failures,
+        'duration': duration,
+        'qps': queries / duration if duration > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p99_ms': percentile(latencies, 99),
+        'peak_memory_kb': peak_memory / 1024,
+        'server': server_stats
+    }
+
+def run_benchmark(engine_names=None, word_count=500, hit_ratio=0.05, wildcard=False, workers=50,
+                  latency_ms=5.0, jitter_ms=0.0, loss_rate=0.0, trace_memory=True, seed=1):
+    """Benchmark the selected engines on an identical synthetic zone"""
+    wordlist_file = os.path.join(os.path.dirname(os.path.realpath(__file__)), "names.txt")
+    wordlist = sorted(subdomain.load_wordlist(wordlist_file))[:word_count]
+    if not wordlist:
+        print(f"{Fore.RED}No wordlist loaded. Cannot benchmark.")
+        return []
+
+    zone = SyntheticZone.from_wordlist("bench.test", wordlist, hit_ratio=hit_ratio,
+                                       wildcard=wildcard, seed=seed)
+
+    results = []
+    for name in engine_names or list(ENGINES.keys()):
+        if name not in ENGINES:
+            print(f"{Fore.RED}Unknown engine: {name}")
+            continue
+
+        print(f"{Fore.CYAN}Benchmarking engine '{name}'...")
+        result = benchmark_engine(name, ENGINES[name], zone, wordlist, workers=workers,
+                                  latency_ms=latency_ms, jitter_ms=jitter_ms, loss_rate=loss_rate,
+                                  trace_memory=trace_memory, seed=seed)
+        results.append(result)
+
+    return results
+
+def show_results(results):
+    """Print the benchmark comparison table"""
+    print(f"""
+{Fore.GREEN}╔══════════════════════════════════════════════════════════════════════╗
+{Fore.GREEN}║                {Fore.CYAN}Subdomain Engine Benchmark Results{Fore.GREEN}                   ║
+{Fore.GREEN}╚══════════════════════════════════════════════════════════════════════╝
+""")
+    print(f"{Fore.CYAN}{'Engine':<12} {'Queries':>8} {'Found':>6} {'Fail':>5} {'QPS':>9} "
+          f"{'p50 ms':>8} {'p99 ms':>8} {'Peak KB':>9}")
+    print(f"{Fore.CYAN}{'-' * 72}")
+    for r in results:
+        print(f"{Fore.WHITE}{r['engine']:<12} {r['queries']:>8} {r['found']:>6} {r['failures']:>5} "
+              f"{r['qps']:>9.1f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['peak_memory_kb']:>9.0f}")
+        server = r['server']
+        print(f"{Fore.YELLOW}  server: {server['queries']} queries, {server['answered']} answered, "
+              f"{server['dropped']} dropped, {server['nxdomain']} NXDOMAIN")
+
+def main():
+    """Interactive benchmark entry point"""
+    print(f"""
+{Fore.CYAN}╔════════════════════════════════════════════════╗
+{Fore.CYAN}║          {Fore.MAGENTA}Pengu Subdomain Benchmark{Fore.CYAN}             ║
+{Fore.CYAN}║      {Fore.GREEN}Offline - uses in-process DNS stub{Fore.CYAN}        ║
+{Fore.CYAN}╚════════════════════════════════════════════════╝
+""")
+    try:
+        word_count = int(input(f"{Fore.YELLOW}Words from names.txt (default: 500): ").strip() or 500)
+        workers = int(input(f"{Fore.YELLOW}Worker threads (default: 50): ").strip() or 50)
+        latency = float(input(f"{Fore.YELLOW}Stub latency in ms (default: 5): ").strip() or 5)
+        loss = float(input(f"{Fore.YELLOW}Stub packet loss % (default: 0): ").strip() or 0) / 100.0
+    except ValueError:
+        print(f"{Fore.RED}Invalid number entered")
+        return
+
+    wildcard = input(f"{Fore.YELLOW}Wildcard zone? (y/N): ").strip().lower() == 'y'
+    trace_memory = input(f"{Fore.YELLOW}Track peak memory (slower)? (Y/n): ").strip().lower() not in ['n', 'no']
+
+    print(f"{Fore.CYAN}Available engines: {', '.join(ENGINES.keys())}")
+    selected = input(f"{Fore.YELLOW}Engines to run (comma-separated, Enter for all): ").strip()
+    engine_names = [e.strip() for e in selected.split(',') if e.strip()] or None
+
+    results = run_benchmark(engine_names, word_count=word_count, wildcard=wildcard, workers=workers,
+                            latency_ms=latency, loss_rate=loss, trace_memory=trace_memory)
+    if results:
+        show_results(results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Pengu TCP Probe Module - Concurrent multi-target TCP ping on a single event loop
+Each host:port is probed on its own schedule and timed with a monotonic nanosecond clock
+"""
+
+import os
+import time
+import errno
+import socket
+import asyncio
+import threading
+from colorama import init, Fore, Style
+
+# Initialize colorama
+init(autoreset=True)
+
+def parse_tcp_targets(text, default_port=None):
+    """Parse 'host:port' entries (comma-separated, '@file' for one per line).
+    Entries without a port use default_port; raises ValueError when none is available."""
+    items = []
+    for item in text.split(','):
+        item = item.strip()
+        if item.startswith('@'):
+            with open(item[1:], 'r', encoding='utf-8', errors='ignore') as f:
+                items.extend(line.split('#', 1)[0].strip() for line in f)
+        else:
+            items.append(item)
+
+    targets = []
+    for item in items:
+        if not item:
+            continue
+        if item.startswith('['):  # [IPv6]:port
+            host, _, port = item[1:].partition(']')
+            port = port.lstrip(':')
+        elif item.count(':') == 1:
+            host, port = item.split(':')
+        else:
+            host, port = item, ''
+        if not port:
+            if default_port is None:
+                raise ValueError(f"{item}: no port given")
+            port = str(default_port)
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f"{item}: invalid port")
+        targets.append((host, int(port)))
+    return list(dict.fromkeys(targets))
+
+def target_label(host, port):
+    return f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+
+class TcpProber:
+    """Probes many host:port pairs concurrently, each on its own fixed schedule.
+
+    A probe is a non-blocking connect; its latency is the time from connect() to the
+    socket becoming writable (SYN sent -> connection established), measured with
+    perf_counter_ns. Probes for a target may overlap when timeout > interval.
+    """
+    def __init__(self, targets, interval=1.0, timeout=3.0, count=None):
+        self.targets = list(dict.fromkeys(targets))
+        self.interval = max(0.01, interval)
+        self.timeout = timeout
+        self.count = count
+        self.addresses = {}    # (host, port) -> sockaddr tuple for connect
+        self.families = {}
+        self.unresolved = {}   # (host, port) -> error
+        self.dns_ms = {}       # (host, port) -> resolution time
+
+    async def _resolve(self, loop, target):
+        host, port = target
+        started = time.perf_counter_ns()
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            family, _, _, _, sockaddr = infos[0]
+            self.addresses[target] = sockaddr
+            self.families[target] = family
+            self.dns_ms[target] = (time.perf_counter_ns() - started) / 1e6
+        except (OSError, UnicodeError) as e:
+            self.unresolved[target] = str(e)
+
+    async def probe(self, loop, target):
+        """One connect attempt, returns a result dict"""
+        sock = socket.socket(self.families[target], socket.SOCK_STREAM)
+        sock.setblocking(False)
+        started = time.perf_counter_ns()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, self.addresses[target]), self.timeout)
+            elapsed = (time.perf_counter_ns() - started) / 1e6
+            return {'status': 'open', 'connect_ms': elapsed, 'error': None}
+        except asyncio.TimeoutError:
+            return {'status': 'timeout', 'connect_ms': None, 'error': 'Timed out'}
+        except ConnectionRefusedError:
+            # The RST came back, so the host is up but nothing listens on the port
+            elapsed = (time.perf_counter_ns() - started) / 1e6
+            return {'status': 'refused', 'connect_ms': None, 'rst_ms': elapsed, 'error': 'Connection refused'}
+        except OSError as e:
+            return {'status': 'error', 'connect_ms': None,
+                    'error': os.strerror(e.errno) if e.errno in errno.errorcode else str(e)}
+        finally:
+            sock.close()
+
+    async def _schedule(self, loop, target, offset, on_result, stop_event):
+        """Probe one target every interval, starting at offset"""
+        start = loop.time() + offset
+        sent = 0
+        pending = set()
+        while not stop_event.is_set() and (self.count is None or sent < self.count):
+            due = start + sent * self.interval
+            delay = due - loop.time()
+            if delay < -self.interval:
+                start -= delay  # Fell behind (e.g. suspended) - resume the schedule instead of bursting
+                delay = 0
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(stop_event.wait(), delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
+            sent += 1
+
+            task = asyncio.ensure_future(self.probe(loop, target))
+            task.add_done_callback(lambda t: on_result(target, dict(t.result(), timestamp=time.time()))
+                                   if not t.cancelled() else None)
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.wait(pending)
+
+    async def run_async(self, on_result, should_stop=None, on_tick=None, tick_interval=0.5):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(self._resolve(loop, target) for target in self.targets))
+
+        resolved = [target for target in self.targets if target in self.addresses]
+        stop_event = asyncio.Event()
+        # Stagger the targets over one interval so probes do not go out in bursts
+        schedules = [asyncio.ensure_future(self._schedule(loop, target, i * self.interval / max(1, len(resolved)),
+                                                          on_result, stop_event))
+                     for i, target in enumerate(resolved)]
+
+        done = asyncio.ensure_future(asyncio.gather(*schedules))
+        while not done.done():
+            if should_stop and should_stop():
+                stop_event.set()
+            if on_tick:
+                on_tick()
+            await asyncio.wait([done], timeout=tick_interval if on_tick else 0.1)
+        if on_tick:
+            on_tick()
+
+    def run(self, on_result, should_stop=None, on_tick=None, tick_interval=0.5):
+        """Blocking entry point. on_result(target, result) gets every probe outcome;
+        should_stop() is polled to end the run, on_tick() is called periodically."""
+        try:
+            from async_proxy_checker import raise_fd_limit
+            raise_fd_limit(len(self.targets) * (int(self.timeout / self.interval) + 2) + 256)
+        except ImportError:
+            pass
+        asyncio.run(self.run_async(on_result, should_stop, on_tick, tick_interval))
+
+def show_tcp_probe_statistics(host_stats, failures, dns_ms):
+    """Per-target connect latency distribution"""
+    print(f"""
+{Fore.CYAN}╔══════════════════════════════════════════════════════╗
+{Fore.CYAN}║             {Fore.MAGENTA}Multi-Target TCP Ping Statistics{Fore.CYAN}         ║
+{Fore.CYAN}╚══════════════════════════════════════════════════════╝
+""")
+    print(f"{Fore.CYAN}{'Target':<28} {'Sent':>6} {'Open':>6} {'Refused':>8} {'Timeout':>8} "
+          f"{'p50':>9} {'p95':>9} {'p99':>9} {'Jitter':>9} {'DNS':>8}")
+    for label, stats in host_stats.items():
+        summary = stats.get_summary()
+        fail = failures.get(label, {})
+        if stats.packets_received:
+            timing = f"{summary['p50']:>7.2f}ms {summary['p95']:>7.2f}ms {summary['p99']:>7.2f}ms {summary['jitter']:>7.2f}ms"
+        else:
+            timing = f"{'-':>9} {'-':>9} {'-':>9} {'-':>9}"
+        dns = f"{dns_ms[label]:.1f}ms" if label in dns_ms else "-"
+        color = Fore.GREEN if stats.packets_received == stats.packets_sent and stats.packets_sent else \
+            (Fore.YELLOW if stats.packets_received else Fore.RED)
+        print(f"{color}{label[:28]:<28}{Fore.WHITE} {stats.packets_sent:>6} {stats.packets_received:>6} "
+              f"{fail.get('refused', 0):>8} {fail.get('timeout', 0):>8} {timing} {dns:>8}")
+
+def multi_tcp_ping(targets, interval=1.0, timeout=3.0):
+    """Interactive multi-target TCP ping with a live table; returns {label: PingStats}"""
+    import enhanced_ping
+    from enhanced_ping import PingStats, MassPingTable, check_for_q_key
+
+    labels = {target: target_label(*target) for target in targets}
+    host_stats = {label: PingStats() for label in labels.values()}
+    failures = {label: {} for label in labels.values()}
+    table = MassPingTable(host_stats)
+    prober = TcpProber(targets, interval, timeout)
+
+    def on_result(target, result):
+        label = labels[target]
+        if result['status'] == 'open':
+            table.update(label, result['connect_ms'])
+        else:
+            failures[label][result['status']] = failures[label].get(result['status'], 0) + 1
+            table.update(label, None, 'refused' if result['status'] == 'refused' else None)
+
+    print(f"{Fore.CYAN}TCP ping to {len(targets)} targets every {interval}s (timeout {timeout}s)")
+    print(f"{Fore.GREEN}Press 'q' to stop\n")
+
+    enhanced_ping.stop_ping = False
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+
+    footer = f"{Fore.YELLOW}Connect time = SYN sent to connection established - press Q to stop"
+    
+    def on_tick():
+        for target in prober.unresolved:
+            table.mark(labels[target], 'unresolved')
+        table.render(footer)
+    
+    try:
+        prober.run(on_result, should_stop=lambda: enhanced_ping.stop_ping, on_tick=on_tick)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        enhanced_ping.stop_ping = True  # Release the key monitoring thread
+
+    for target, error in prober.unresolved.items():
+        print(f"{Fore.RED}Could not resolve {labels[target]}: {error}")
+    dns_ms = {labels[target]: value for target, value in prober.dns_ms.items()}
+    show_tcp_probe_statistics(host_stats, failures, dns_ms)
+    return host_stats
@@ -4,8 +4,8 @@ Pengu Terms of Service and Legal Disclaimer
 """
 
 from colorama import init, Fore, Style
-import requests
 import socket
+import http_session_pool
 
 init(autoreset=True)
 
@@ -13,12 +13,12 @@ def get_user_location():
     """Get user's geolocation based on public IP (Issue 3)"""
     try:
         # Get public IP first
-        response = requests.get('https://api.ipify.org?format=json', timeout=5)
+        response = http_session_pool.get('https://api.ipify.org?format=json', timeout=5)
         if response.status_code == 200:
             public_ip = response.json().get('ip')
             
             # Get location info
-            location_response = requests.get(f'https://ipapi.co/{public_ip}/json/', timeout=5)
+            location_response = http_session_pool.get(f'https://ipapi.co/{public_ip}/json/', timeout=5)
             if location_response.status_code == 200:
                 location_data = location_response.json()
                 return {
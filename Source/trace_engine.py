@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Pengu Trace Engine - Parallel-TTL traceroute
+Every TTL probe goes out at once and replies are matched to hops by the quoted probe,
+so a whole trace takes about one timeout window instead of one per hop
+"""
+
+import os
+import sys
+import time
+import errno
+import random
+import select
+import socket
+import struct
+import threading
+from icmp_engine import (IcmpSocket, icmp_checksum, make_payload, resolve_ipv4, UNREACHABLE_CODES,
+                         ICMP_DEST_UNREACHABLE, ICMP_TIME_EXCEEDED, IP_TTL)
+from latency_stats import StreamingLatencyStats
+
+PROBE_TYPES = ['icmp', 'udp', 'tcp']
+DEFAULT_PORTS = {'udp': 33434, 'tcp': 80}
+
+IP_RECVERR = getattr(socket, 'IP_RECVERR', 11)       # Linux values, missing from some Python builds
+MSG_ERRQUEUE = getattr(socket, 'MSG_ERRQUEUE', 0x2000)
+SO_EE_ORIGIN_ICMP = 2
+
+TCP_SYN = 0x02
+TCP_RST = 0x04
+TCP_ACK = 0x10
+
+UDP_KEY_WINDOWS = 8  # UDP probe lengths rotate through this many non-overlapping ranges, one per run
+
+def source_address_for(address, port=9):
+    """Local address the kernel would use to reach address (no packet is sent)"""
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        probe.connect((address, port))
+        return probe.getsockname()[0]
+    finally:
+        probe.close()
+
+def build_tcp_syn(source, destination, source_port, port, seq):
+    """TCP SYN segment (with an MSS option) for a raw IPPROTO_TCP socket"""
+    options = b'\x02\x04\x05\xb4'
+    header = struct.pack('!HHIIBBHHH', source_port, port, seq, 0, (5 + len(options) // 4) << 4,
+                         TCP_SYN, 64240, 0, 0) + options
+    pseudo = socket.inet_aton(source) + socket.inet_aton(destination) + struct.pack('!BBH', 0, socket.IPPROTO_TCP, len(header))
+    checksum = icmp_checksum(pseudo + header)
+    return header[:16] + struct.pack('!H', checksum) + header[18:]
+
+def parse_icmp_error(data):
+    """Split a raw IPv4 ICMP error into (type, code, quoted protocol, quoted destination, first 8
+    quoted transport bytes) - or None for anything that is not a time exceeded/unreachable error"""
+    ihl = (data[0] & 0x0F) * 4
+    icmp = data[ihl:]
+    if len(icmp) < 36 or icmp[0] not in (ICMP_DEST_UNREACHABLE, ICMP_TIME_EXCEEDED):
+        return None
+    quoted = icmp[8:]
+    quoted_ihl = (quoted[0] & 0x0F) * 4
+    inner = quoted[quoted_ihl:quoted_ihl + 8]
+    if len(inner) < 8:
+        return None
+    return icmp[0], icmp[1], quoted[9], socket.inet_ntoa(quoted[16:20]), inner
+
+class ParallelTracer:
+    """Traceroute that probes every TTL in one batch, Paris-style.
+
+    Every probe of a trace belongs to the same flow (same addresses, protocol, ports and, for
+    ICMP, the same checksum), so per-flow load balancers send all of them down one path.
+    Probes are told apart by a field the balancers do not hash, which the ICMP error quotes back:
+
+    - icmp: echo sequence number, with two payload bytes compensating to keep the checksum fixed
+    - udp:  UDP length (payload of ttl bytes plus a per-run offset) from one fixed source/destination port pair
+    - tcp:  TCP sequence number of a SYN from one fixed source/destination port pair
+
+    The destination answers with an echo reply (icmp), port unreachable (udp) or SYN-ACK/RST (tcp).
+    The trace ends once every hop up to the destination answered or the timeout window passed.
+    """
+    def __init__(self, target, max_hops=30, timeout=2.0, payload_size=32, spacing=0.0, probe='icmp', port=None):
+        if probe not in PROBE_TYPES:
+            raise ValueError(f"Unknown probe type: {probe}")
+        self.target = target
+        self.address = resolve_ipv4(target)
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.spacing = spacing  # Optional gap between probes for routers that rate-limit ICMP errors
+        self.probe = probe
+        self.port = port or DEFAULT_PORTS.get(probe)
+        self.payload = make_payload(max(2, payload_size))
+        self.udp = None
+        self.tcp = None
+        self.probes_sent = 0
+        self.udp_offset = 0  # Consecutive runs use disjoint UDP lengths, so late errors match no new probe
+        # Time exceeded errors only reach raw sockets - raises PermissionError without admin rights
+        self.socket = IcmpSocket(prefer_raw=True)
+        try:
+            if probe == 'udp':
+                # Unconnected, so port unreachable errors do not fail the following sends
+                self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self.udp.bind(('0.0.0.0', 0))
+                self.source_port = self.udp.getsockname()[1]
+            elif probe == 'tcp':
+                self.tcp = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_TCP)
+                self.tcp.setblocking(False)
+                self.source = source_address_for(self.address, self.port)
+                self.source_port = random.randint(33000, 60999)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def mode(self):
+        return self.socket.mode
+
+    def close(self):
+        self.socket.close()
+        for sock in (self.udp, self.tcp):
+            if sock:
+                sock.close()
+        self.udp = self.tcp = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _hop(self, ttl, status, address=None, rtt_ms=None, detail=None):
+        return {
+            'ttl': ttl,
+            'status': status,      # 'ttl_exceeded', 'reply' (destination), 'unreachable' or 'timeout'
+            'address': address,
+            'rtt_ms': rtt_ms,
+            'detail': detail,
+            'timestamp': time.time()
+        }
+
+    def _send(self, base, ttl):
+        """Send the probe for one TTL, returns (probe key, send time)"""
+        if self.probe == 'icmp':
+            seq = (base + ttl) & 0xFFFF
+            # seq + (0xFFFF - seq) is the same for every probe, so the ICMP checksum never changes
+            payload = struct.pack('!H', 0xFFFF - seq) + self.payload[2:]
+            return seq, self.socket.send(self.address, seq, payload, ttl=ttl)
+        if self.probe == 'udp':
+            self.udp.setsockopt(socket.IPPROTO_IP, IP_TTL, ttl)
+            sent_at = time.perf_counter()
+            length = self.udp_offset + ttl
+            self.udp.sendto(self.payload[:1] * length, (self.address, self.port))
+            return 8 + length, sent_at
+        seq = (base * 65536 + ttl) & 0xFFFFFFFF
+        segment = build_tcp_syn(self.source, self.address, self.source_port, self.port, seq)
+        self.tcp.setsockopt(socket.IPPROTO_IP, IP_TTL, ttl)
+        sent_at = time.perf_counter()
+        self.tcp.sendto(segment, (self.address, 0))
+        return seq, sent_at
+
+    def _receive(self, sock):
+        """Read one packet, returns (kind, probe key, source, receive time, detail) or None.
+        Raises BlockingIOError when nothing is queued."""
+        if self.probe == 'icmp':
+            packet = self.socket.receive()
+            if not packet:
+                return None
+            # Errors must quote a probe sent to our target, replies must come from it
+            if packet['kind'] == 'reply':
+                if packet['source'] != self.address:
+                    return None
+                return 'reply', packet['seq'], packet['source'], packet['received_at'], 'Destination reached'
+            if packet.get('destination') != self.address:
+                return None
+            detail = UNREACHABLE_CODES.get(packet.get('code'), 'Unreachable') if packet['kind'] == 'unreachable' else None
+            return packet['kind'], packet['seq'], packet['source'], packet['received_at'], detail
+
+        data, address = (self.tcp if sock is self.tcp else self.socket.sock).recvfrom(65535)
+        received_at = time.perf_counter()
+
+        if sock is self.tcp:
+            # SYN-ACK or RST from the destination: its ACK number is our sequence number + 1
+            ihl = (data[0] & 0x0F) * 4
+            if socket.inet_ntoa(data[12:16]) != self.address or len(data) < ihl + 14:
+                return None
+            source_port, port, _, ack, _, flags = struct.unpack('!HHIIBB', data[ihl:ihl + 14])
+            if source_port != self.port or port != self.source_port or not flags & (TCP_RST | TCP_ACK):
+                return None
+            detail = 'Port closed (RST)' if flags & TCP_RST else 'Port open (SYN-ACK)'
+            return 'reply', (ack - 1) & 0xFFFFFFFF, self.address, received_at, detail
+
+        parsed = parse_icmp_error(data)
+        if not parsed:
+            return None
+        icmp_type, code, protocol, destination, inner = parsed
+        source_port, port = struct.unpack('!HH', inner[:4])
+        expected = socket.IPPROTO_UDP if self.probe == 'udp' else socket.IPPROTO_TCP
+        if protocol != expected or destination != self.address or (source_port, port) != (self.source_port, self.port):
+            return None
+        key = struct.unpack('!H', inner[4:6])[0] if self.probe == 'udp' else struct.unpack('!I', inner[4:8])[0]
+        if icmp_type == ICMP_TIME_EXCEEDED:
+            return 'ttl_exceeded', key, address[0], received_at, None
+        if self.probe == 'udp' and code == 3 and address[0] == self.address:
+            return 'reply', key, address[0], received_at, 'Destination reached (port unreachable)'
+        return 'unreachable', key, address[0], received_at, UNREACHABLE_CODES.get(code, 'Unreachable')
+
+    def run(self, on_hop=None, should_stop=None, first_ttl=1, max_ttl=None):
+        """Trace once; on_hop(hop) is called as each answer arrives (in arrival order).
+        Returns the hops from first_ttl up to the destination (or max_ttl/max_hops) in TTL order,
+        silent hops as timeouts."""
+        base = random.randint(0, 0xFFFF)
+        if self.udp:
+            self.udp_offset = (self.udp_offset + self.max_hops) % (self.max_hops * UDP_KEY_WINDOWS)
+        sent_at = {}
+        answers = {}
+        last_ttl = min(max_ttl or self.max_hops, self.max_hops)  # Lowest TTL known to end the path
+        sockets = [sock for sock in (self.socket, self.tcp) if sock]
+
+        for ttl in range(first_ttl, last_ttl + 1):
+            key, sent = self._send(base, ttl)
+            sent_at[key] = (ttl, sent)
+            self.probes_sent += 1
+            if self.spacing:
+                time.sleep(self.spacing)
+        deadline = time.perf_counter() + self.timeout
+
+        while not (should_stop and should_stop()):
+            if all(ttl in answers for ttl in range(first_ttl, last_ttl + 1)):
+                break  # Every hop up to the destination answered
+            wait = deadline - time.perf_counter()
+            if wait <= 0:
+                break
+            readable, _, _ = select.select(sockets, [], [], min(wait, 0.1))
+
+            for sock in readable:
+                while True:
+                    try:
+                        packet = self._receive(sock)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        break
+                    if not packet:
+                        continue
+                    kind, key, source, received_at, detail = packet
+                    probe = sent_at.get(key)
+                    if not probe or probe[0] in answers:
+                        continue
+
+                    ttl = probe[0]
+                    hop = self._hop(ttl, kind, source, (received_at - probe[1]) * 1000, detail)
+                    if kind != 'ttl_exceeded':
+                        last_ttl = min(last_ttl, ttl)  # Probes with a higher TTL reach the same end point
+                    answers[ttl] = hop
+                    if on_hop and ttl <= last_ttl:
+                        on_hop(hop)
+
+        return [answers.get(ttl) or self._hop(ttl, 'timeout') for ttl in range(first_ttl, last_ttl + 1)]
+
+class ErrqueueTcpTracer:
+    """Unprivileged TCP traceroute for Linux.
+
+    One non-blocking connect() per TTL; with IP_RECVERR the kernel hands the ICMP error a
+    router sent back to the socket's error queue (read with MSG_ERRQUEUE), including the
+    router's address. A completed or refused connect means the destination was reached.
+    Each connect uses its own source port, so unlike ParallelTracer the probes are not one flow.
+    """
+    def __init__(self, target, max_hops=30, timeout=2.0, port=80):
+        if not sys.platform.startswith('linux'):
+            raise OSError('IP_RECVERR error queues are only available on Linux')
+        self.target = target
+        self.address = resolve_ipv4(target)
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.port = port
+        self.probe = 'tcp'
+
+    @property
+    def mode(self):
+        return 'connect'
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    _hop = ParallelTracer._hop
+
+    def _read_error(self, sock):
+        """Hop address and ICMP type/code from the error queue, or None"""
+        try:
+            _, ancillary, _, _ = sock.recvmsg(512, socket.CMSG_SPACE(512), MSG_ERRQUEUE)
+        except (BlockingIOError, InterruptedError):
+            return None
+        for level, kind, value in ancillary:
+            if level == socket.IPPROTO_IP and kind == IP_RECVERR and len(value) >= 24:
+                # struct sock_extended_err followed by the offender's sockaddr_in
+                _, origin, icmp_type, code, _, _, _ = struct.unpack('=IBBBBII', value[:16])
+                if origin == SO_EE_ORIGIN_ICMP:
+                    return socket.inet_ntoa(value[20:24]), icmp_type, code
+        return None
+
+    def run(self, on_hop=None, should_stop=None):
+        """Same contract as ParallelTracer.run"""
+        probes = {}  # socket -> (ttl, send time)
+        answers = {}
+        last_ttl = self.max_hops
+        try:
+            for ttl in range(1, self.max_hops + 1):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                sock.setsockopt(socket.IPPROTO_IP, IP_TTL, ttl)
+                sock.setsockopt(socket.IPPROTO_IP, IP_RECVERR, 1)
+                sent = time.perf_counter()
+                result = sock.connect_ex((self.address, self.port))
+                probes[sock] = (ttl, sent)
+                if result not in (0, errno.EINPROGRESS):
+                    raise OSError(result, os.strerror(result))  # e.g. no route - every TTL would fail alike
+            deadline = time.perf_counter() + self.timeout
+
+            poller = select.poll()
+            by_fd = {sock.fileno(): sock for sock in probes}
+            for fd in by_fd:
+                poller.register(fd, select.POLLOUT | select.POLLERR)
+
+            while by_fd and not (should_stop and should_stop()):
+                if all(ttl in answers for ttl in range(1, last_ttl + 1)):
+                    break
+                wait = deadline - time.perf_counter()
+                if wait <= 0:
+                    break
+                for fd, _ in poller.poll(min(wait, 0.1) * 1000):
+                    sock = by_fd.pop(fd)
+                    poller.unregister(fd)
+                    ttl, sent = probes[sock]
+                    received_at = time.perf_counter()
+                    rtt = (received_at - sent) * 1000
+
+                    error = self._read_error(sock)
+                    if error:
+                        address, icmp_type, code = error
+                        if icmp_type == ICMP_TIME_EXCEEDED:
+                            hop = self._hop(ttl, 'ttl_exceeded', address, rtt)
+                        else:
+                            hop = self._hop(ttl, 'unreachable', address, rtt, UNREACHABLE_CODES.get(code, 'Unreachable'))
+                    else:
+                        status = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                        if status in (0, errno.ECONNREFUSED):
+                            detail = 'Port open (connected)' if status == 0 else 'Port closed (refused)'
+                            hop = self._hop(ttl, 'reply', self.address, rtt, detail)
+                        else:
+                            continue  # Local error without a hop address - leave it as a timeout
+                    if hop['status'] != 'ttl_exceeded':
+                        last_ttl = min(last_ttl, ttl)
+                    if ttl not in answers:
+                        answers[ttl] = hop
+                        if on_hop and ttl <= last_ttl:
+                            on_hop(hop)
+        finally:
+            for sock in probes:
+                sock.close()
+
+        return [answers.get(ttl) or self._hop(ttl, 'timeout') for ttl in range(1, last_ttl + 1)]
+
+MAX_ADDRESSES_PER_HOP = 8  # Load-balanced hops answer from several routers; keep the busiest few
+
+class PathMonitor:
+    """MTR-style continuous trace: probes every hop once per round and keeps per-hop statistics.
+
+    Memory is bounded by the path length - each hop keeps one StreamingLatencyStats and
+    a capped table of the addresses that answered for it.
+    """
+    def __init__(self, target, interval=1.0, max_hops=30, timeout=2.0, probe='icmp', port=None):
+        self.interval = max(0.1, interval)
+        self.tracer = ParallelTracer(target, max_hops, timeout, probe=probe, port=port)
+        self.target = target
+        self.address = self.tracer.address
+        self.hops = {}         # ttl -> {'stats', 'addresses', 'last'}
+        self.rounds = 0
+        self.path_length = 0   # Hops in the latest round (up to the destination)
+        self.destination_ttl = None  # Where the path ended last time; later rounds stop there
+
+    @property
+    def mode(self):
+        return self.tracer.mode
+
+    def close(self):
+        self.tracer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def record_round(self, hops):
+        """Fold one trace (list of hops in TTL order) into the per-hop statistics"""
+        self.rounds += 1
+        self.path_length = len(hops)
+        if hops:
+            last = hops[-1]
+            if last['status'] in ('reply', 'unreachable'):
+                self.destination_ttl = last['ttl']
+            elif last['status'] == 'ttl_exceeded':
+                self.destination_ttl = None  # A router answered at the old end - the path got longer
+            # A silent last hop is the destination dropping a probe: keep the cap, count it as loss
+        for hop in hops:
+            entry = self.hops.get(hop['ttl'])
+            if entry is None:
+                entry = self.hops[hop['ttl']] = {'stats': StreamingLatencyStats(), 'addresses': {}, 'last': None}
+            entry['last'] = hop
+            if hop['status'] == 'timeout':
+                entry['stats'].add_loss()
+                continue
+            entry['stats'].add_sample(hop['rtt_ms'])
+            addresses = entry['addresses']
+            if hop['address'] in addresses or len(addresses) < MAX_ADDRESSES_PER_HOP:
+                addresses[hop['address']] = addresses.get(hop['address'], 0) + 1
+
+    def get_hops(self):
+        """Per-hop snapshot for the current path, in TTL order"""
+        rows = []
+        for ttl in range(1, self.path_length + 1):
+            entry = self.hops.get(ttl)
+            if not entry:
+                continue
+            addresses = sorted(entry['addresses'].items(), key=lambda item: -item[1])
+            rows.append({
+                'ttl': ttl,
+                'address': addresses[0][0] if addresses else None,
+                'other_addresses': [address for address, _ in addresses[1:]],
+                'last': entry['last'],
+                'summary': entry['stats'].summary()
+            })
+        return rows
+
+    def run(self, on_round=None, should_stop=None, count=None):
+        """Trace every interval until count rounds are done or should_stop() returns True;
+        on_round(monitor) is called after each round."""
+        while not (should_stop and should_stop()) and (count is None or self.rounds < count):
+            started = time.perf_counter()
+            hops = self.tracer.run(should_stop=should_stop, max_ttl=self.destination_ttl)
+            if should_stop and should_stop():
+                break  # Partial round - its silent hops were never given the full timeout
+            self.record_round(hops)
+            if on_round:
+                on_round(self)
+            while time.perf_counter() - started < self.interval:
+                if should_stop and should_stop():
+                    return
+                time.sleep(min(0.1, self.interval - (time.perf_counter() - started)))
+
+DOUBLETREE_START_TTL = 6  # Forward probing starts here; the hops below are mostly the shared local tree
+BACKWARD_BATCH = 3        # TTLs probed at once while walking back towards the source
+
+class BatchTracer:
+    """Traces many targets concurrently and probes shared path prefixes only once (Doubletree).
+
+    Every target is probed forward from start_ttl to the destination in one batch, then backwards
+    a few TTLs at a time. Backward probing stops at the first (ttl, address) already seen on an
+    earlier path - the stop set - and the rest of the prefix is copied from that path. The first
+    target is traced on its own so the local tree is in the stop set before the others start.
+    """
+    def __init__(self, targets, max_hops=30, timeout=2.0, probe='icmp', port=None, workers=8,
+                 start_ttl=DOUBLETREE_START_TTL):
+        self.targets = list(dict.fromkeys(targets))
+        self.max_hops = max_hops
+        self.timeout = timeout
+        self.probe = probe
+        self.port = port
+        self.workers = max(1, workers)
+        self.start_ttl = max(1, min(start_ttl, max_hops))
+        self.lock = threading.Lock()
+        self.stop_set = {}   # (ttl, address) -> hops 1..ttl of the path it was seen on
+        self.results = {}    # target -> result dict
+        self.probes_sent = 0
+        self.hops_reused = 0
+
+    def trace(self, target, should_stop=None):
+        """Trace one target with Doubletree, returns its result dict"""
+        stopped = lambda: bool(should_stop and should_stop())
+        try:
+            tracer = ParallelTracer(target, self.max_hops, self.timeout, probe=self.probe, port=self.port)
+        except (OSError, UnicodeError) as e:
+            if isinstance(e, PermissionError):
+                raise
+            return {'target': target, 'address': None, 'hops': [], 'reached': False, 'probes': 0, 'reused': 0,
+                    'error': str(e)}
+
+        collected = {}
+        reused = 0
+        with tracer:
+            for hop in tracer.run(should_stop=should_stop, first_ttl=self.start_ttl):
+                collected[hop['ttl']] = hop
+
+            ttl = self.start_ttl - 1
+            while ttl >= 1 and not stopped():
+                low = max(1, ttl - BACKWARD_BATCH + 1)
+                chunk = tracer.run(should_stop=should_stop, first_ttl=low, max_ttl=ttl)
+                for hop in chunk:
+                    collected[hop['ttl']] = hop
+                if chunk and chunk[-1]['status'] in ('reply', 'unreachable'):
+                    # The path ends below start_ttl - everything probed above it was past the end
+                    collected = {t: hop for t, hop in collected.items() if t <= chunk[-1]['ttl']}
+
+                with self.lock:
+                    match = next((hop for hop in reversed(chunk)
+                                  if hop['address'] and (hop['ttl'], hop['address']) in self.stop_set), None)
+                    prefix = self.stop_set[(match['ttl'], match['address'])] if match else None
+                if match:
+                    for known in prefix[:low - 1]:
+                        collected[known['ttl']] = dict(known, reused=True)
+                        reused += 1
+                    break
+                ttl = low - 1
+
+        hops = [collected[t] for t in sorted(collected)]
+        end = next((hop['ttl'] for hop in hops if hop['status'] in ('reply', 'unreachable')), None)
+        if end is not None:
+            hops = hops[:end]
+        result = {
+            'target': target,
+            'address': tracer.address,
+            'hops': hops,
+            'reached': bool(hops) and hops[-1]['status'] == 'reply',
+            'probes': tracer.probes_sent,
+            'reused': reused,
+            'error': None
+        }
+        complete = all(hop['ttl'] == index + 1 for index, hop in enumerate(hops))
+        with self.lock:
+            for hop in hops if complete else []:
+                if hop['address'] and hop['status'] == 'ttl_exceeded':
+                    self.stop_set.setdefault((hop['ttl'], hop['address']), hops[:hop['ttl']])
+            self.probes_sent += tracer.probes_sent
+            self.hops_reused += reused
+            self.results[target] = result
+        return result
+
+    def run(self, on_result=None, should_stop=None):
+        """Trace every target; on_result(result) is called as each one finishes.
+        should_stop() ends the batch early, as does Ctrl+C (KeyboardInterrupt is re-raised once the
+        running traces have stopped). Raises PermissionError without admin rights."""
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        interrupted = threading.Event()
+        stopped = lambda: interrupted.is_set() or bool(should_stop and should_stop())
+
+        if not self.targets:
+            return self.results
+        first = self.trace(self.targets[0], stopped)
+        if on_result:
+            on_result(first)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [executor.submit(self.trace, target, stopped) for target in self.targets[1:]]
+            for future in as_completed(futures):
+                if on_result:
+                    on_result(future.result())
+                if stopped():
+                    break
+        finally:
+            # Queued targets are dropped; running traces end at their next should_stop check
+            interrupted.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        return self.results
+
+class TopologyGraph:
+    """Router-level graph of many traces: nodes are addresses, edges join consecutive answering hops"""
+    def __init__(self):
+        self.nodes = {'source': {'id': 'source', 'kind': 'source', 'ttl': 0, 'min_rtt_ms': 0.0, 'targets': set()}}
+        self.edges = {}
+
+    def add_path(self, target, hops):
+        previous, previous_rtt, gap = 'source', 0.0, 0
+        self.nodes['source']['targets'].add(target)
+        for hop in hops:
+            if not hop['address'] or hop['status'] == 'timeout':
+                gap += 1  # Silent hops become a gap count on the edge that spans them
+                continue
+            address = hop['address']
+            node = self.nodes.get(address)
+            if node is None:
+                node = self.nodes[address] = {'id': address, 'kind': 'router', 'ttl': hop['ttl'],
+                                              'min_rtt_ms': None, 'targets': set()}
+            if hop['status'] == 'reply':
+                node['kind'] = 'destination'
+            node['targets'].add(target)
+            node['ttl'] = min(node['ttl'], hop['ttl'])
+            rtt = hop['rtt_ms']
+            if rtt is not None and (node['min_rtt_ms'] is None or rtt < node['min_rtt_ms']):
+                node['min_rtt_ms'] = rtt
+
+            edge = self.edges.get((previous, address))
+            if edge is None:
+                edge = self.edges[(previous, address)] = {'source': previous, 'target': address, 'paths': 0,
+                                                          'gap': gap, 'min_delta_ms': None}
+            edge['paths'] += 1
+            edge['gap'] = min(edge['gap'], gap)
+            if rtt is not None:
+                delta = max(0.0, rtt - previous_rtt)
+                if edge['min_delta_ms'] is None or delta < edge['min_delta_ms']:
+                    edge['min_delta_ms'] = delta
+                previous_rtt = rtt
+            previous, gap = address, 0
+
+    def to_dict(self):
+        return {
+            'nodes': [dict(node, targets=sorted(node['targets'])) for node in self.nodes.values()],
+            'edges': list(self.edges.values())
+        }
+
+    def to_dot(self, names=None):
+        """Graphviz DOT text; names maps addresses to hostnames for the labels"""
+        names = names or {}
+        shapes = {'source': 'doublecircle', 'destination': 'box', 'router': 'ellipse'}
+        lines = ['digraph pengu_topology {', '  rankdir=LR;', '  node [fontname="Helvetica", fontsize=10];']
+        for node in self.nodes.values():
+            label = 'this host' if node['id'] == 'source' else node['id']
+            if names.get(node['id']):
+                label += '\\n' + names[node['id']]
+            if node['min_rtt_ms'] is not None and node['id'] != 'source':
+                label += f"\\n{node['min_rtt_ms']:.1f} ms"
+            lines.append(f'  "{node["id"]}" [label="{label}", shape={shapes[node["kind"]]}];')
+        for edge in self.edges.values():
+            label = f"+{edge['min_delta_ms']:.1f} ms" if edge['min_delta_ms'] is not None else ""
+            style = ', style=dashed' if edge['gap'] else ''
+            lines.append(f'  "{edge["source"]}" -> "{edge["target"]}" [label="{label}", penwidth={min(1 + edge["paths"] / 2, 6):.1f}{style}];')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
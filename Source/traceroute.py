@@ -8,6 +8,7 @@ import sys
 import time
 import socket
 import struct
+import threading
 from colorama import init, Fore, Style
 
 # Initialize colorama
@@ -40,57 +41,344 @@ def system_traceroute(target):
     except Exception as e:
         print(f"{Fore.RED}Error running system traceroute: {e}")
 
-def simple_traceroute(target, max_hops=30):
-    """Simple traceroute implementation using TCP connect"""
-    print(f"{Fore.CYAN}Simple traceroute to {target} (max {max_hops} hops)")
-    print(f"{Fore.YELLOW}Note: This shows connectivity, not actual routing path")
-    
+def simple_traceroute(target, max_hops=30, port=80):
+    """TCP traceroute without admin rights (Linux): hops come from each connect's socket error queue"""
     try:
-        # Resolve target IP
-        target_ip = socket.gethostbyname(target)
-        print(f"{Fore.GREEN}Target resolved to: {target_ip}")
+        from trace_engine import ErrqueueTcpTracer
         
-        # Test connectivity with common ports
-        test_ports = [80, 443, 22, 21, 25, 53, 3389, 23]
+        with ErrqueueTcpTracer(target, max_hops, port=port) as tracer:
+            print(f"{Fore.CYAN}TCP traceroute to {target} ({tracer.address}) port {port} (max {max_hops} hops)")
+            start_time = time.time()
+            parallel_traceroute(tracer)
+            print(f"{Fore.CYAN}Trace completed in {time.time() - start_time:.2f}s")
+    except socket.gaierror:
+        print(f"{Fore.RED}Could not resolve hostname: {target}")
+    except OSError as e:
+        print(f"{Fore.YELLOW}TCP traceroute unavailable ({e})")
+        print(f"{Fore.YELLOW}Falling back to system traceroute")
+        system_traceroute(target)
+
+def format_hop(hop, hostname=None):
+    """One traceroute hop line"""
+    ttl = hop['ttl']
+    if hop['status'] == 'timeout':
+        return f"{Fore.YELLOW}{ttl:2d}: {Fore.RED}* * * Request timed out"
+    from asn_lookup import describe_address
+    
+    name = f"{hop['address']} ({hostname})" if hostname else hop['address']
+    owner = describe_address(hop['address'])
+    if owner:
+        name += f" [{owner}]"
+    if hop['status'] == 'reply':
+        return f"{Fore.YELLOW}{ttl:2d}: {Fore.GREEN}{name} - {hop['rtt_ms']:.2f}ms ({hop['detail'] or 'Destination reached'})"
+    if hop['status'] == 'unreachable':
+        return f"{Fore.YELLOW}{ttl:2d}: {Fore.RED}{name} - {hop['rtt_ms']:.2f}ms ({hop['detail']})"
+    return f"{Fore.YELLOW}{ttl:2d}: {Fore.GREEN}{name} - {hop['rtt_ms']:.2f}ms"
+
+class HopPrinter:
+    """Prints hop lines immediately and rewrites them in place once their PTR names resolve"""
+    def __init__(self, rdns=None):
+        import queue
         
-        for hop in range(1, max_hops + 1):
-            print(f"{Fore.YELLOW}{hop:2d}: ", end="")
-            
-            connected = False
-            for port in test_ports:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(2)
-                    start_time = time.time()
-                    result = sock.connect_ex((target_ip, port))
-                    end_time = time.time()
-                    sock.close()
-                    
-                    if result == 0:
-                        response_time = (end_time - start_time) * 1000
-                        print(f"{Fore.GREEN}{target_ip} ({target}) port {port} "
-                              f"- {response_time:.2f}ms")
-                        connected = True
-                        break
-                        
-                except Exception:
-                    continue
-            
-            if connected:
-                print(f"{Fore.GREEN}Reached destination!")
+        self.rdns = rdns
+        self.lines = []            # Hops in printed order
+        self.waiting = set()       # Addresses with a lookup in flight
+        self.names = queue.Queue()
+    
+    def add(self, hop):
+        hostname = None
+        address = hop.get('address')
+        if self.rdns and address:
+            hostname = self.rdns.lookup(address, self._resolved)
+            if hostname is None and not self.rdns.is_cached(address):
+                self.waiting.add(address)
+        self.lines.append(hop)
+        print(format_hop(hop, hostname))
+    
+    def _resolved(self, address, hostname):
+        # Resolver thread - the main thread does all the printing
+        self.names.put((address, hostname))
+    
+    def apply_updates(self, timeout=0):
+        """Rewrite lines whose names arrived; waits up to timeout for the first one"""
+        import queue
+        
+        updated = False
+        while True:
+            try:
+                address, hostname = self.names.get(timeout=timeout) if timeout and not updated else self.names.get_nowait()
+            except queue.Empty:
                 break
-            else:
-                print(f"{Fore.RED}No response")
-                
-            time.sleep(0.5)
-            
+            self.waiting.discard(address)
+            if not hostname:
+                continue
+            for index, hop in enumerate(self.lines):
+                if hop.get('address') == address:
+                    up = len(self.lines) - index
+                    sys.stdout.write(f"\033[{up}A\r{format_hop(hop, hostname)}{Style.RESET_ALL}\033[K\033[{up}B\r")
+                    updated = True
+        if updated:
+            sys.stdout.flush()
+    
+    def finish(self, timeout):
+        """Give outstanding lookups up to timeout seconds to fill in their names"""
+        deadline = time.time() + timeout
+        while self.waiting and time.time() < deadline:
+            self.apply_updates(min(0.1, max(0.01, deadline - time.time())))
+
+def parallel_traceroute(tracer, rdns=None):
+    """Run a tracer in the background and print hops in TTL order as they arrive;
+    hop names are resolved in the background and filled into the printed lines"""
+    import queue
+    
+    if rdns is None:
+        from rdns_cache import get_rdns_cache
+        rdns = get_rdns_cache()
+    
+    arrived = queue.Queue()
+    outcome = {}
+    stop = threading.Event()
+    
+    def run():
+        try:
+            outcome['hops'] = tracer.run(arrived.put, should_stop=stop.is_set)
+        except Exception as e:
+            outcome['error'] = e
+    
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    
+    # Printing happens here, never in the receive loop, so it cannot skew the timings
+    printer = HopPrinter(rdns)
+    pending = {}
+    next_ttl = 1
+    finished = False
+    try:
+        while thread.is_alive() or not arrived.empty():
+            printer.apply_updates()
+            try:
+                hop = arrived.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            pending[hop['ttl']] = hop
+            while not finished and next_ttl in pending:
+                hop = pending.pop(next_ttl)
+                printer.add(hop)
+                next_ttl += 1
+                finished = hop['status'] != 'ttl_exceeded'
+    finally:
+        stop.set()
+        thread.join()
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    # Silent hops are only known once the timeout window has passed
+    if not finished:
+        for hop in outcome['hops'][next_ttl - 1:]:
+            printer.add(hop)
+    printer.finish(rdns.timeout + 0.5)
+    rdns.save()
+    return outcome['hops']
+
+def advanced_traceroute(target, max_hops=30, probe='icmp', port=None):
+    """Advanced traceroute using raw sockets (requires admin/root)"""
+    try:
+        from trace_engine import ParallelTracer
+        
+        with ParallelTracer(target, max_hops, probe=probe, port=port) as tracer:
+            using = probe.upper() + (f" port {tracer.port}" if tracer.port else "")
+            print(f"{Fore.CYAN}Parallel traceroute to {target} ({tracer.address}) using {using}, all {max_hops} TTLs at once")
+            start_time = time.time()
+            parallel_traceroute(tracer)
+            print(f"{Fore.CYAN}Trace completed in {time.time() - start_time:.2f}s")
     except socket.gaierror:
         print(f"{Fore.RED}Could not resolve hostname: {target}")
-    except Exception as e:
-        print(f"{Fore.RED}Error: {e}")
+    except PermissionError:
+        print(f"{Fore.YELLOW}Raw sockets require admin/root privileges")
+        if probe == 'tcp':
+            print(f"{Fore.YELLOW}Falling back to unprivileged TCP traceroute")
+            simple_traceroute(target, max_hops, port or 80)
+        else:
+            print(f"{Fore.YELLOW}Falling back to system traceroute")
+            system_traceroute(target)
+    except OSError as e:
+        # Raw ICMP sockets that cannot receive errors (some Windows setups) - use Scapy hop by hop
+        print(f"{Fore.YELLOW}Parallel traceroute unavailable ({e}), probing hop by hop")
+        sequential_traceroute(target, max_hops)
 
-def advanced_traceroute(target, max_hops=30):
-    """Advanced traceroute using raw sockets (requires admin/root)"""
+def render_mtr_table(monitor, drawn_lines=0, footer="", rdns=None):
+    """Redraw the per-hop MTR table over its previous frame, returns the number of lines drawn"""
+    lines = [
+        f"{Fore.CYAN}MTR to {Fore.WHITE}{monitor.target} ({monitor.address}){Fore.CYAN} - "
+        f"rounds: {Fore.WHITE}{monitor.rounds}{Fore.CYAN} - {time.strftime('%H:%M:%S')}",
+        f"{Fore.CYAN}{'Hop':>3}  {'Host':<32} {'Loss':>6} {'Sent':>5} {'Last':>8} {'Avg':>8} {'Best':>8} "
+        f"{'Worst':>8} {'p50':>8} {'p95':>8} {'StDev':>7} {'Jitter':>7}"
+    ]
+    for row in monitor.get_hops():
+        summary = row['summary']
+        loss = summary['loss_percent']
+        color = Fore.GREEN if loss == 0 else (Fore.YELLOW if loss < 100 else Fore.RED)
+        host = row['address'] or "???"
+        if rdns and row['address']:
+            host = rdns.lookup(row['address']) or host  # Shows the name from the next redraw on
+        if row['other_addresses']:
+            host += f" +{len(row['other_addresses'])}"
+        last = row['last']
+        last_text = f"{last['rtt_ms']:.1f}" if last and last['rtt_ms'] is not None else "*"
+        if summary['samples']:
+            timing = (f"{last_text:>8} {summary['mean']:>8.1f} {summary['min']:>8.1f} {summary['max']:>8.1f} "
+                      f"{summary['p50']:>8.1f} {summary['p95']:>8.1f} {summary['stdev']:>7.1f} {summary['jitter']:>7.1f}")
+        else:
+            timing = f"{last_text:>8} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>8} {'-':>7} {'-':>7}"
+        lines.append(f"{Fore.YELLOW}{row['ttl']:>3}. {color}{host[:32]:<32}{Fore.WHITE} {loss:>5.1f}% "
+                     f"{summary['total']:>5} {timing}")
+    lines.extend(footer.split("\n"))
+    
+    # Clear what is left of a longer previous frame (the path can get shorter)
+    lines.extend([""] * max(0, drawn_lines - len(lines)))
+    frame = f"\033[{drawn_lines}A" if drawn_lines else ""
+    frame += "".join(f"\r{line}{Style.RESET_ALL}\033[K\r\n" for line in lines)
+    sys.stdout.write(frame)
+    sys.stdout.flush()
+    return len(lines)
+
+def mtr_traceroute(target, interval=1.0, max_hops=30, probe='icmp', port=None):
+    """Continuous MTR-style trace with a live per-hop table (requires admin/root)"""
+    import enhanced_ping
+    from enhanced_ping import check_for_q_key
+    from trace_engine import PathMonitor
+    from rdns_cache import get_rdns_cache
+    
+    try:
+        monitor = PathMonitor(target, interval, max_hops, probe=probe, port=port)
+    except socket.gaierror:
+        print(f"{Fore.RED}Could not resolve hostname: {target}")
+        return None
+    except PermissionError:
+        print(f"{Fore.YELLOW}MTR mode needs raw sockets - run Pengu as admin/root")
+        return None
+    
+    print(f"{Fore.CYAN}Probing every hop to {target} every {interval}s")
+    print(f"{Fore.GREEN}Press 'q' to stop\n")
+    
+    enhanced_ping.stop_ping = False
+    key_thread = threading.Thread(target=check_for_q_key, daemon=True)
+    key_thread.start()
+    
+    footer = f"{Fore.YELLOW}Loss on a middle hop only matters if it carries on to the later hops - press Q to stop"
+    drawn = {'lines': 0}
+    rdns = get_rdns_cache()
+    
+    def on_round(monitor):
+        drawn['lines'] = render_mtr_table(monitor, drawn['lines'], footer, rdns)
+    
+    try:
+        with monitor:
+            monitor.run(on_round, should_stop=lambda: enhanced_ping.stop_ping)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        enhanced_ping.stop_ping = True  # Release the key monitoring thread
+        rdns.save()
+    return monitor.get_hops()
+
+def export_topology(batch, graph):
+    """Write the traced paths and topology graph as JSON and Graphviz DOT, returns both paths"""
+    import json
+    from datetime import datetime
+    from rdns_cache import get_rdns_cache
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    try:
+        from pengu import get_output_path
+        base = get_output_path("exports", f"topology_{timestamp}")
+    except:
+        # Fallback if import fails
+        base = f"topology_{timestamp}"
+    os.makedirs(os.path.dirname(base) or '.', exist_ok=True)
+    
+    from asn_lookup import lookup_asn
+    
+    rdns = get_rdns_cache()
+    names = {node_id: rdns.get(node_id) for node_id in graph.nodes if node_id != 'source'}
+    topology = graph.to_dict()
+    for node in topology['nodes']:
+        node['hostname'] = names.get(node['id'])
+        node['asn'] = lookup_asn(node['id']) if node['id'] != 'source' else None
+        if node['asn']:
+            # Label the DOT nodes with their owner too
+            owner = f"AS{node['asn']['asn']}"
+            names[node['id']] = f"{names[node['id']]}\\n{owner}" if names.get(node['id']) else owner
+    
+    with open(base + ".json", 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated': datetime.now().isoformat(),
+            'probe': batch.probe,
+            'port': batch.port,
+            'probes_sent': batch.probes_sent,
+            'hops_reused': batch.hops_reused,
+            'paths': batch.results,
+            'topology': topology
+        }, f, indent=2)
+    with open(base + ".dot", 'w', encoding='utf-8') as f:
+        f.write(graph.to_dot(names))
+    return base + ".json", base + ".dot"
+
+def batch_traceroute(targets, max_hops=30, probe='icmp', port=None, workers=8):
+    """Trace many targets concurrently, merge the paths into a topology graph and offer an export"""
+    from trace_engine import BatchTracer, TopologyGraph
+    from rdns_cache import get_rdns_cache
+    
+    batch = BatchTracer(targets, max_hops, probe=probe, port=port, workers=workers)
+    graph = TopologyGraph()
+    rdns = get_rdns_cache()
+    done = {'count': 0}
+    
+    def on_result(result):
+        done['count'] += 1
+        prefix = f"{Fore.CYAN}[{done['count']}/{len(batch.targets)}] {Fore.WHITE}{result['target']}"
+        if result['error']:
+            print(f"{prefix} {Fore.RED}{result['error']}")
+            return
+        graph.add_path(result['target'], result['hops'])
+        for hop in result['hops']:
+            rdns.lookup(hop['address'])  # Warm the cache for the DOT labels
+        status = f"{Fore.GREEN}reached" if result['reached'] else f"{Fore.YELLOW}not reached"
+        print(f"{prefix} ({result['address']}) {status}{Fore.WHITE} in {len(result['hops'])} hops - "
+              f"{result['probes']} probes, {result['reused']} hops reused")
+    
+    print(f"{Fore.CYAN}Tracing {len(batch.targets)} targets ({probe.upper()}, {workers} at a time, "
+          f"shared prefixes probed once)")
+    start_time = time.time()
+    try:
+        batch.run(on_result)
+    except PermissionError:
+        print(f"{Fore.YELLOW}Batch traceroute needs raw sockets - run Pengu as admin/root")
+        return None
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Batch traceroute interrupted")
+    
+    routers = sum(1 for node in graph.nodes.values() if node['kind'] == 'router')
+    print(f"""
+{Fore.GREEN}Topology:
+{Fore.CYAN}  Targets traced:   {Fore.WHITE}{len(batch.results)} in {time.time() - start_time:.1f}s
+{Fore.CYAN}  Routers:          {Fore.WHITE}{routers}
+{Fore.CYAN}  Links:            {Fore.WHITE}{len(graph.edges)}
+{Fore.CYAN}  Probes sent:      {Fore.WHITE}{batch.probes_sent} ({len(batch.targets) * max_hops} for full traces)
+{Fore.CYAN}  Hops reused:      {Fore.WHITE}{batch.hops_reused}""")
+    
+    if input(f"\n{Fore.YELLOW}Export topology (JSON + DOT)? (y/N): ").strip().lower() == 'y':
+        try:
+            json_path, dot_path = export_topology(batch, graph)
+            print(f"{Fore.GREEN}✓ Topology exported to: {json_path}")
+            print(f"{Fore.GREEN}✓ Graphviz file: {dot_path} (render with: dot -Tsvg {os.path.basename(dot_path)} -o topology.svg)")
+        except Exception as e:
+            print(f"{Fore.RED}Error exporting topology: {e}")
+    rdns.save()
+    return graph
+
+def sequential_traceroute(target, max_hops=30):
+    """Hop-by-hop traceroute with Scapy (requires admin/root)"""
     try:
         from scapy.all import IP, ICMP, sr1
         
@@ -111,10 +399,11 @@ def advanced_traceroute(target, max_hops=30):
                     break
                 else:
                     response_time = (end_time - start_time) * 1000
-                    try:
-                        hostname = socket.gethostbyaddr(reply.src)[0]
+                    from rdns_cache import get_rdns_cache
+                    hostname = get_rdns_cache().resolve(reply.src)
+                    if hostname:
                         print(f"{Fore.YELLOW}{ttl:2d}: {Fore.GREEN}{reply.src} ({hostname}) - {response_time:.2f}ms")
-                    except:
+                    else:
                         print(f"{Fore.YELLOW}{ttl:2d}: {Fore.GREEN}{reply.src} - {response_time:.2f}ms")
                         
             except Exception as e:
@@ -149,7 +438,7 @@ def traceroute():
     """Main traceroute function with multiple fallback options"""
     while True:
         try:
-            target = input(f"{Fore.MAGENTA}Enter target IP/hostname (or 'exit'): ").strip()
+            target = input(f"{Fore.MAGENTA}Enter target IP/hostname, list or @file (or 'exit'): ").strip()
             if target.lower() == 'exit':
                 break
                 
@@ -157,11 +446,47 @@ def traceroute():
                 print(f"{Fore.RED}Please enter a valid target")
                 continue
             
+            # Several targets are traced together into one topology graph
+            batch = ',' in target or target.startswith('@')
+            mode = '1'
+            if not batch:
+                mode = input(f"{Fore.YELLOW}Mode - 1. Single trace  2. Continuous MTR (default: 1): ").strip() or '1'
+            
+            # UDP/TCP probes follow the same load-balanced path as application traffic to that port
+            probe = {'2': 'udp', '3': 'tcp'}.get(
+                input(f"{Fore.YELLOW}Probe - 1. ICMP  2. UDP  3. TCP SYN (default: 1): ").strip(), 'icmp')
+            port = None
+            if probe != 'icmp':
+                default_port = 33434 if probe == 'udp' else 80
+                try:
+                    port = int(input(f"{Fore.YELLOW}Destination port (default: {default_port}): ").strip() or default_port)
+                except ValueError:
+                    port = default_port
+            
+            if batch:
+                from enhanced_ping import load_target_list
+                targets = load_target_list(target)
+                if not targets:
+                    print(f"{Fore.RED}No targets given")
+                    continue
+                batch_traceroute(targets, probe=probe, port=port)
+                print()
+                continue
+            
+            if mode == '2':
+                try:
+                    interval = float(input(f"{Fore.YELLOW}Seconds between rounds (default: 1): ").strip() or 1)
+                except ValueError:
+                    interval = 1.0
+                mtr_traceroute(target, interval, probe=probe, port=port)
+                print()
+                continue
+            
             print(f"\n{Fore.CYAN}Starting traceroute to {target}...")
             
             # Try advanced method first, then fallback
             try:
-                advanced_traceroute(target)
+                advanced_traceroute(target, probe=probe, port=port)
             except Exception as e:
                 print(f"{Fore.YELLOW}Advanced traceroute failed, trying alternatives...")
                 simple_traceroute(target)
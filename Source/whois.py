@@ -29,8 +29,9 @@ def print_banner():
 """
     print(message)
 
-def get_ssl_certificate_info(hostname, port=443):
-    """Get SSL certificate information with improved error handling (Issue 15)"""
+def get_ssl_certificate_info(hostname, port=443, verbose=True, deadline=None):
+    """Get SSL certificate information with improved error handling (Issue 15).
+    verbose=False keeps it quiet for background use; no attempt runs past the deadline timestamp."""
     import socket
     import ssl
     from urllib.parse import urlparse
@@ -44,7 +45,9 @@ def get_ssl_certificate_info(hostname, port=443):
     if ':' in hostname and not hostname.startswith('['):  # Not IPv6
         hostname = hostname.split(':')[0]
     
-    print(f"{Fore.CYAN}Attempting SSL connection to {hostname}:{port}...")
+    log = print if verbose else (lambda *args, **kwargs: None)
+    
+    log(f"{Fore.CYAN}Attempting SSL connection to {hostname}:{port}...")
     
     # Try multiple connection approaches (Issue 15)
     connection_attempts = [
@@ -54,8 +57,13 @@ def get_ssl_certificate_info(hostname, port=443):
     ]
     
     for attempt_num, attempt_config in enumerate(connection_attempts, 1):
+        timeout = attempt_config['timeout']
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+            if timeout <= 0:
+                break
         try:
-            print(f"{Fore.YELLOW}Connection attempt {attempt_num}/3 (timeout: {attempt_config['timeout']}s)...")
+            log(f"{Fore.YELLOW}Connection attempt {attempt_num}/3 (timeout: {timeout:.0f}s)...")
             
             # Create appropriate SSL context based on attempt type
             if attempt_config['context_type'] == 'default':
@@ -74,30 +82,30 @@ def get_ssl_certificate_info(hostname, port=443):
             
             # First, test basic connectivity to the port
             try:
-                test_sock = socket.create_connection((hostname, port), timeout=attempt_config['timeout'])
+                test_sock = socket.create_connection((hostname, port), timeout=timeout)
                 test_sock.close()
-                print(f"{Fore.GREEN}Port {port} is open on {hostname}")
+                log(f"{Fore.GREEN}Port {port} is open on {hostname}")
             except socket.timeout:
-                print(f"{Fore.RED}Connection timeout to {hostname}:{port}")
+                log(f"{Fore.RED}Connection timeout to {hostname}:{port}")
                 continue
             except ConnectionRefusedError:
-                print(f"{Fore.RED}Connection refused to {hostname}:{port}")
+                log(f"{Fore.RED}Connection refused to {hostname}:{port}")
                 continue
             except Exception as e:
-                print(f"{Fore.RED}Connection test failed: {e}")
+                log(f"{Fore.RED}Connection test failed: {e}")
                 continue
             
             # Now attempt SSL connection
-            with socket.create_connection((hostname, port), timeout=attempt_config['timeout']) as sock:
+            with socket.create_connection((hostname, port), timeout=timeout) as sock:
                 with context.wrap_socket(sock, server_hostname=hostname) as ssock:
                     cert = ssock.getpeercert(binary_form=False)
                     cert_der = ssock.getpeercert(binary_form=True)
                     cipher = ssock.cipher()
                     protocol = ssock.version()
                     
-                    print(f"{Fore.GREEN}SSL connection successful!")
-                    print(f"{Fore.CYAN}Protocol: {protocol}")
-                    print(f"{Fore.CYAN}Cipher: {cipher[0] if cipher else 'Unknown'}")
+                    log(f"{Fore.GREEN}SSL connection successful!")
+                    log(f"{Fore.CYAN}Protocol: {protocol}")
+                    log(f"{Fore.CYAN}Cipher: {cipher[0] if cipher else 'Unknown'}")
                     
                     if cert:
                         return analyze_certificate(cert, cert_der, cipher, protocol, hostname)
@@ -105,16 +113,16 @@ def get_ssl_certificate_info(hostname, port=443):
                         return None, "No certificate found in SSL handshake"
                         
         except socket.timeout:
-            print(f"{Fore.RED}Attempt {attempt_num}: Connection timeout after {attempt_config['timeout']}s")
+            log(f"{Fore.RED}Attempt {attempt_num}: Connection timeout after {timeout:.0f}s")
             continue
         except ssl.SSLError as e:
-            print(f"{Fore.RED}Attempt {attempt_num}: SSL error - {str(e)}")
+            log(f"{Fore.RED}Attempt {attempt_num}: SSL error - {str(e)}")
             continue
         except ConnectionRefusedError:
-            print(f"{Fore.RED}Attempt {attempt_num}: Connection refused")
+            log(f"{Fore.RED}Attempt {attempt_num}: Connection refused")
             continue
         except Exception as e:
-            print(f"{Fore.RED}Attempt {attempt_num}: Connection error - {str(e)}")
+            log(f"{Fore.RED}Attempt {attempt_num}: Connection error - {str(e)}")
             continue
     
     # All attempts failed
@@ -126,9 +134,9 @@ def get_ssl_certificate_info(hostname, port=443):
         "• Ensure no firewall is blocking the connection"
     ]
     
-    print(f"{Fore.RED}{error_msg}")
+    log(f"{Fore.RED}{error_msg}")
     for suggestion in suggestions:
-        print(f"{Fore.YELLOW}{suggestion}")
+        log(f"{Fore.YELLOW}{suggestion}")
     
     return None, error_msg
 
@@ -609,18 +617,19 @@ def perform_arp_scan(network_range):
             error_msg += ". Please install Npcap and run as Administrator"
         return None, error_msg
 
-def detect_os_fingerprint(ip_address):
-    """Basic OS fingerprinting using various techniques"""
+def detect_os_fingerprint(ip_address, check_admin=True):
+    """Basic OS fingerprinting using various techniques (check_admin=False when the caller already asked)"""
     # Check for admin privileges for advanced fingerprinting
-    try:
-        from admin_utils import check_admin_for_tool
-        admin_result = check_admin_for_tool('os_fingerprinting')
-        if admin_result is None:  # User chose to return to main menu
-            return None, "User cancelled - admin privileges recommended"
-        elif not admin_result:  # Continuing without admin
-            print(f"{Fore.YELLOW}Warning: OS fingerprinting may be limited without admin privileges")
-    except ImportError:
-        print(f"{Fore.YELLOW}Warning: Cannot check admin privileges")
+    if check_admin:
+        try:
+            from admin_utils import check_admin_for_tool
+            admin_result = check_admin_for_tool('os_fingerprinting')
+            if admin_result is None:  # User chose to return to main menu
+                return None, "User cancelled - admin privileges recommended"
+            elif not admin_result:  # Continuing without admin
+                print(f"{Fore.YELLOW}Warning: OS fingerprinting may be limited without admin privileges")
+        except ImportError:
+            print(f"{Fore.YELLOW}Warning: Cannot check admin privileges")
     
     try:
         fingerprint = {
@@ -865,7 +874,8 @@ def resolve_hostname(hostname):
 def get_geoip_info(ip):
     """Get GeoIP information with error handling and multiple sources"""
     try:
-        import requests
+        from http_session_pool import get_session_pool
+        pool = get_session_pool()
         
         # Check if proxy mode is enabled
         proxies = None
@@ -881,7 +891,7 @@ def get_geoip_info(ip):
         
         # Primary source: ipinfo.io
         try:
-            response = requests.get(f"https://ipinfo.io/{ip}/json", timeout=10, proxies=proxies)
+            response = pool.get(f"https://ipinfo.io/{ip}/json", timeout=10, proxies=proxies)
             if response.status_code == 200:
                 data = response.json()
                 if 'error' not in data:
@@ -891,7 +901,7 @@ def get_geoip_info(ip):
         
         # Fallback source: ipapi.co
         try:
-            response = requests.get(f"https://ipapi.co/{ip}/json/", timeout=10, proxies=proxies)
+            response = pool.get(f"https://ipapi.co/{ip}/json/", timeout=10, proxies=proxies)
             if response.status_code == 200:
                 data = response.json()
                 if 'error' not in data:
@@ -913,7 +923,7 @@ def get_geoip_info(ip):
             
         # Fallback source: ip-api.com
         try:
-            response = requests.get(f"http://ip-api.com/json/{ip}", timeout=10, proxies=proxies)
+            response = pool.get(f"http://ip-api.com/json/{ip}", timeout=10, proxies=proxies)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('status') == 'success':
@@ -942,7 +952,8 @@ def get_geoip_info(ip):
 def get_basic_whois_info(ip):
     """Get basic WHOIS information using simple socket connection"""
     try:
-        import requests
+        from http_session_pool import get_session_pool
+        pool = get_session_pool()
         
         # Check if proxy mode is enabled
         proxies = None
@@ -958,7 +969,7 @@ def get_basic_whois_info(ip):
         
         # Try ARIN REST API
         try:
-            response = requests.get(f"https://whois.arin.net/rest/ip/{ip}.json", timeout=10, proxies=proxies)
+            response = pool.get(f"https://whois.arin.net/rest/ip/{ip}.json", timeout=10, proxies=proxies)
             if response.status_code == 200:
                 return response.json(), "ARIN"
         except:
@@ -966,7 +977,7 @@ def get_basic_whois_info(ip):
             
         # Try alternative WHOIS service
         try:
-            response = requests.get(f"https://ipwhois.app/json/{ip}", timeout=10, proxies=proxies)
+            response = pool.get(f"https://ipwhois.app/json/{ip}", timeout=10, proxies=proxies)
             if response.status_code == 200:
                 data = response.json()
                 if data.get('success'):
@@ -981,6 +992,15 @@ def get_basic_whois_info(ip):
     except Exception as e:
         return None, f"Error: {str(e)}"
 
+def display_offline_asn(ip):
+    """Show the owning ASN/prefix from the offline table, returns the match or None"""
+    from asn_lookup import lookup_asn
+    
+    info = lookup_asn(ip)
+    if info:
+        print(f"{Fore.CYAN}{'Offline ASN':15}: {Fore.WHITE}AS{info['asn']}{' ' + info['org'] if info['org'] else ''} ({info['prefix']})")
+    return info
+
 def display_geoip_results(data, source):
     """Display GeoIP results in a formatted way"""
     print(f"{Fore.GREEN}╔══════════════════════════════════════╗")
@@ -1095,10 +1115,11 @@ def main():
 {Fore.GREEN}3. {Fore.WHITE}Comprehensive DNS Intelligence
 {Fore.GREEN}4. {Fore.WHITE}Network Discovery (ARP + OS + Services)
 {Fore.GREEN}5. {Fore.WHITE}Complete Intelligence Report (All Above)
-{Fore.GREEN}6. {Fore.WHITE}Exit to main menu
+{Fore.GREEN}6. {Fore.WHITE}Offline ASN Database (import / lookup)
+{Fore.GREEN}7. {Fore.WHITE}Exit to main menu
 """)
             
-            choice = input(f"{Fore.YELLOW}Select option (1-6): ").strip()
+            choice = input(f"{Fore.YELLOW}Select option (1-7): ").strip()
             
             if choice == '1':
                 target = input(f"{Fore.YELLOW}Enter IP address or hostname: ").strip()
@@ -1143,6 +1164,10 @@ def main():
                     perform_complete_intelligence(target)
             
             elif choice == '6':
+                import asn_lookup
+                asn_lookup.main()
+            
+            elif choice == '7':
                 # Log session summary
                 session_duration = time.time() - session_start
                 log_tool_usage("enhanced_tracker", {
@@ -1152,7 +1177,7 @@ def main():
                 break
             
             else:
-                print(f"{Fore.RED}Invalid option. Please select 1-6.")
+                print(f"{Fore.RED}Invalid option. Please select 1-7.")
                 
         except KeyboardInterrupt:
             print(f"\n{Fore.YELLOW}Analysis interrupted")
@@ -1178,6 +1203,9 @@ def perform_standard_lookup(target):
     
     print(f"{Fore.YELLOW}Gathering information for {ip_address}...")
     
+    # Offline ASN table first - it answers instantly, even when the web services are down
+    asn_info = display_offline_asn(ip_address)
+    
     # Get GeoIP information
     geoip_result, geoip_source = get_geoip_info(ip_address)
     if geoip_result:
@@ -1200,7 +1228,8 @@ def perform_standard_lookup(target):
         "resolved_ip": ip_address,
         "duration": round(duration, 2),
         "geoip_success": geoip_result is not None,
-        "whois_success": whois_result is not None
+        "whois_success": whois_result is not None,
+        "offline_asn": asn_info['asn'] if asn_info else None
     })
     
     print()
@@ -1377,12 +1406,27 @@ Report generated by Pengu v2.1
         print(f"{Fore.RED}Error exporting intelligence report: {e}")
         return None
 
+# Phase deadlines (seconds from fan-out) for the complete analysis
+INTELLIGENCE_DEADLINES = {
+    'geoip': 35,            # Three web sources, 10s each
+    'whois': 25,
+    'ssl': 30,
+    'dns_records': 30,
+    'zone_transfer': 45,
+    'cache_poisoning': 30,
+    'os_fingerprint': 20,
+    'services': 60          # Sequential banner grabs on 11 ports
+}
+
 def perform_complete_intelligence(target):
-    """Perform complete intelligence gathering"""
+    """Perform complete intelligence gathering.
+    The target is resolved first; every phase only needs the resolved address, so they then run
+    concurrently, each with its own deadline, and each module is shown as soon as its phases finish."""
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    
     start_time = time.time()
     
     print(f"{Fore.CYAN}Performing complete intelligence analysis for {target}...")
-    print(f"{Fore.YELLOW}This may take several minutes...")
     
     # Determine target type and resolve if needed
     if validate_ip(target):
@@ -1394,67 +1438,157 @@ def perform_complete_intelligence(target):
         if not ip_address:
             print(f"{Fore.RED}Could not resolve hostname: {target}")
             return
+    is_hostname = not validate_ip(target)
     
-    analysis_results = {}
-    
-    # 1. Standard lookup
-    print(f"\n{Fore.MAGENTA}[1/4] Standard GeoIP & WHOIS Lookup... {Fore.CYAN}[Starting]")
-    geoip_result, _ = get_geoip_info(ip_address)
-    whois_result, _ = get_basic_whois_info(ip_address)
+    # Ask about admin rights now - the phases run on worker threads and must not prompt
+    run_os_fingerprint = True
+    try:
+        from admin_utils import check_admin_for_tool
+        admin_result = check_admin_for_tool('os_fingerprinting')
+        if admin_result is None:  # User chose to return to main menu
+            run_os_fingerprint = False
+        elif not admin_result:  # Continuing without admin
+            print(f"{Fore.YELLOW}Warning: OS fingerprinting may be limited without admin privileges")
+    except ImportError:
+        print(f"{Fore.YELLOW}Warning: Cannot check admin privileges")
     
-    if geoip_result:
-        display_geoip_results(geoip_result, "Complete Analysis")
-        analysis_results['geoip'] = True
-    if whois_result:
-        display_whois_results(whois_result, "Complete Analysis")
-        analysis_results['whois'] = True
-    print(f"{Fore.GREEN}[1/4] Standard GeoIP & WHOIS Lookup... [Completed]")
-    
-    # 2. SSL Analysis (if hostname provided)
-    if not validate_ip(target):
-        print(f"\n{Fore.MAGENTA}[2/4] SSL/TLS Certificate Analysis... {Fore.CYAN}[Starting]")
-        ssl_analysis, ssl_status = get_ssl_certificate_info(hostname, 443)
-        if ssl_analysis:
-            display_ssl_analysis(ssl_analysis, hostname, 443)
-            analysis_results['ssl'] = True
-            print(f"{Fore.GREEN}[2/4] SSL/TLS Certificate Analysis... [Completed]")
-        else:
-            print(f"{Fore.YELLOW}[2/4] SSL/TLS Certificate Analysis... [Skipped: {ssl_status}]")
-            print(f"{Fore.YELLOW}Possible reasons: Port 443 not open, no SSL service, or connection timeout")
-    else:
-        print(f"\n{Fore.YELLOW}[2/4] SSL/TLS Certificate Analysis... [Skipped: Target is IP address only]")
-    
-    # 3. DNS Intelligence (if hostname provided)
-    if not validate_ip(target):
-        print(f"\n{Fore.MAGENTA}[3/4] Comprehensive DNS Intelligence... {Fore.CYAN}[Starting]")
-        dns_records, _ = get_comprehensive_dns_records(hostname)
-        zone_transfer, _ = attempt_dns_zone_transfer(hostname)
-        cache_poisoning, _ = detect_dns_cache_poisoning(hostname)
-        
-        if dns_records or zone_transfer or cache_poisoning:
-            display_dns_analysis(dns_records, zone_transfer, cache_poisoning, hostname)
-            analysis_results['dns'] = True
-            print(f"{Fore.GREEN}[3/4] Comprehensive DNS Intelligence... [Completed]")
+    analysis_results = {}
+    phase_times = {}
+    fan_out = time.time()
+    
+    # Phase name -> (function, args); all of them only depend on the resolution above
+    phases = {
+        'geoip': (get_geoip_info, (ip_address,)),
+        'whois': (get_basic_whois_info, (ip_address,)),
+        'services': (detect_service_versions, (ip_address,))
+    }
+    if run_os_fingerprint:
+        phases['os_fingerprint'] = (lambda ip: detect_os_fingerprint(ip, check_admin=False), (ip_address,))
+    if is_hostname:
+        phases['ssl'] = (lambda host: get_ssl_certificate_info(host, 443, verbose=False,
+                                                               deadline=fan_out + INTELLIGENCE_DEADLINES['ssl']), (hostname,))
+        phases['dns_records'] = (get_comprehensive_dns_records, (hostname,))
+        phases['zone_transfer'] = (attempt_dns_zone_transfer, (hostname,))
+        phases['cache_poisoning'] = (detect_dns_cache_poisoning, (hostname,))
+    
+    # Modules in report order: (result key, title, phases it is built from)
+    modules = [
+        ('geoip', "Standard GeoIP & WHOIS Lookup", ['geoip', 'whois']),
+        ('ssl', "SSL/TLS Certificate Analysis", ['ssl']),
+        ('dns', "Comprehensive DNS Intelligence", ['dns_records', 'zone_transfer', 'cache_poisoning']),
+        ('network_discovery', "Network Discovery", ['os_fingerprint', 'services'])
+    ]
+    completed_modules = set()
+    
+    def show_module(index, key, title, results):
+        """Display one module once all of its phases are in"""
+        label = f"[{index}/4] {title}..."
+        took = max((phase_times.get(name, 0) for name in module_phases[key]), default=0)
+        
+        if key == 'geoip':
+            print(f"\n{Fore.MAGENTA}{label} {Fore.CYAN}[Results]")
+            display_offline_asn(ip_address)
+            geoip_result, geoip_status = results['geoip']
+            whois_result, whois_status = results['whois']
+            if geoip_result:
+                display_geoip_results(geoip_result, "Complete Analysis")
+                analysis_results['geoip'] = True
+            else:
+                print(f"{Fore.RED}GeoIP lookup failed: {geoip_status}")
+            if whois_result:
+                display_whois_results(whois_result, "Complete Analysis")
+                analysis_results['whois'] = True
+            else:
+                print(f"{Fore.RED}WHOIS lookup failed: {whois_status}")
+            if geoip_result or whois_result:
+                completed_modules.add(key)
+                print(f"{Fore.GREEN}{label} [Completed in {took:.1f}s]")
+            else:
+                print(f"{Fore.YELLOW}{label} [Failed]")
+        
+        elif key == 'ssl':
+            ssl_analysis, ssl_status = results['ssl']
+            if ssl_analysis:
+                print(f"\n{Fore.MAGENTA}{label} {Fore.CYAN}[Results]")
+                display_ssl_analysis(ssl_analysis, hostname, 443)
+                analysis_results['ssl'] = True
+                completed_modules.add(key)
+                print(f"{Fore.GREEN}{label} [Completed in {took:.1f}s]")
+            else:
+                print(f"\n{Fore.YELLOW}{label} [Skipped: {ssl_status}]")
+                print(f"{Fore.YELLOW}Possible reasons: Port 443 not open, no SSL service, or connection timeout")
+        
+        elif key == 'dns':
+            dns_records, _ = results['dns_records']
+            zone_transfer, _ = results['zone_transfer']
+            cache_poisoning, _ = results['cache_poisoning']
+            if dns_records or zone_transfer or cache_poisoning:
+                print(f"\n{Fore.MAGENTA}{label} {Fore.CYAN}[Results]")
+                display_dns_analysis(dns_records, zone_transfer, cache_poisoning, hostname)
+                analysis_results['dns'] = True
+                completed_modules.add(key)
+                print(f"{Fore.GREEN}{label} [Completed in {took:.1f}s]")
+            else:
+                print(f"\n{Fore.YELLOW}{label} [Failed: No DNS data available]")
+        
         else:
-            print(f"{Fore.YELLOW}[3/4] Comprehensive DNS Intelligence... [Failed: No DNS data available]")
-    else:
-        print(f"\n{Fore.YELLOW}[3/4] Comprehensive DNS Intelligence... [Skipped: Target is IP address only]")
-    
-    # 4. Network Discovery
-    print(f"\n{Fore.MAGENTA}[4/4] Network Discovery... {Fore.CYAN}[Starting]")
-    os_fingerprint, _ = detect_os_fingerprint(ip_address)
-    services, _ = detect_service_versions(ip_address)
-    
-    if os_fingerprint or services:
-        display_network_discovery(None, os_fingerprint, services, ip_address)
-        analysis_results['network_discovery'] = True
-        print(f"{Fore.GREEN}[4/4] Network Discovery... [Completed]")
-    else:
-        print(f"{Fore.YELLOW}[4/4] Network Discovery... [Limited: Partial data available]")
+            os_fingerprint, _ = results.get('os_fingerprint', (None, "Skipped"))
+            services, _ = results['services']
+            if os_fingerprint or services:
+                print(f"\n{Fore.MAGENTA}{label} {Fore.CYAN}[Results]")
+                display_network_discovery(None, os_fingerprint, services, ip_address)
+                analysis_results['network_discovery'] = True
+                completed_modules.add(key)
+                print(f"{Fore.GREEN}{label} [Completed in {took:.1f}s]")
+            else:
+                print(f"\n{Fore.YELLOW}{label} [Limited: Partial data available]")
+    
+    module_phases = {key: [name for name in names if name in phases] for key, _, names in modules}
+    shown = set()
+    for index, (key, title, _) in enumerate(modules, 1):
+        if not module_phases[key]:
+            print(f"\n{Fore.YELLOW}[{index}/4] {title}... [Skipped: Target is IP address only]")
+            shown.add(key)
+    
+    print(f"\n{Fore.CYAN}Running {len(phases)} phases concurrently - modules are shown as they finish...")
+    executor = ThreadPoolExecutor(max_workers=len(phases), thread_name_prefix='intel')
+    futures = {executor.submit(function, *args): name for name, (function, args) in phases.items()}
+    deadlines = {name: fan_out + INTELLIGENCE_DEADLINES[name] for name in phases}
+    results = {}
+    pending = set(futures)
+    try:
+        while True:
+            # Phases past their deadline are given up on; their threads finish in the background
+            now = time.time()
+            for future in [f for f in pending if now >= deadlines[futures[f]]]:
+                pending.discard(future)
+                name = futures[future]
+                results[name] = (None, f"Timed out after {INTELLIGENCE_DEADLINES[name]}s")
+                phase_times[name] = now - fan_out
+            
+            for index, (key, title, _) in enumerate(modules, 1):
+                if key not in shown and all(name in results for name in module_phases[key]):
+                    show_module(index, key, title, results)
+                    shown.add(key)
+            
+            if not pending:
+                break
+            next_deadline = min(deadlines[futures[f]] for f in pending)
+            done, _ = wait(pending, timeout=max(0, next_deadline - time.time()), return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = (None, f"Error: {str(e)}")
+                phase_times[name] = time.time() - fan_out
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
     # Summary
     duration = time.time() - start_time
-    completed = len(analysis_results)
+    completed = len(completed_modules)
     
     print(f"\n{Fore.GREEN}╔═══════════════════════════════════════════════════════════╗")
     print(f"{Fore.GREEN}║ {Fore.CYAN}Complete Intelligence Analysis Summary{Fore.GREEN}")
@@ -1462,6 +1596,8 @@ def perform_complete_intelligence(target):
     print(f"{Fore.CYAN}Target:           {Fore.WHITE}{target}")
     print(f"{Fore.CYAN}Analysis Time:    {Fore.WHITE}{duration:.2f} seconds")
     print(f"{Fore.CYAN}Modules Completed: {Fore.WHITE}{completed}/4")
+    print(f"{Fore.CYAN}Slowest Phases:   {Fore.WHITE}" + ", ".join(
+        f"{name} {took:.1f}s" for name, took in sorted(phase_times.items(), key=lambda item: -item[1])[:3]))
     
     # Ask user if they want to export the summary
     while True:
@@ -1481,7 +1617,8 @@ def perform_complete_intelligence(target):
         "resolved_ip": ip_address if not validate_ip(target) else None,
         "duration": round(duration, 2),
         "modules_completed": completed,
-        "analysis_results": analysis_results
+        "analysis_results": analysis_results,
+        "phase_times": {name: round(took, 2) for name, took in phase_times.items()}
     })
 
 if __name__ == "__main__":